@@ -0,0 +1,133 @@
+"""상세 페이지 보강 결과 저장소 (SQLite).
+
+리뷰 기간(review_deadline_days)은 캠페인이 게시된 뒤에는 바뀌지 않으므로,
+한 번 상세 페이지에서 추출한 값을 (site_name, source_id) 키로 저장해 두고 다음 실행부터 재사용한다.
+(상세 페이지의 카테고리는 보강에 쓰지 않으므로 저장하지 않는다. 이전 버전이 만든 파일의 category 컬럼은 비워 둔다)
+
+- 파이프라인 시작 시 `load()`로 전체 항목을 한 번에 메모리로 읽는다.
+- 값이 있는 항목은 FOUND_TTL 동안, 값을 못 찾은 항목은 MISSING_TTL 동안만 유효하다
+  (상세 페이지가 나중에 보완되는 경우 다시 시도하기 위함).
+- 요청 자체가 실패한 경우는 저장하지 않으므로 다음 실행에서 다시 시도한다.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from crawler.utils import cache_dir, logger
+
+STORE_PATH = os.path.join(cache_dir, "enrichment.sqlite3")
+
+# 항목 유효 기간 (초)
+FOUND_TTL = 30 * 24 * 3600
+MISSING_TTL = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment (
+    site_name TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    review_deadline_days INTEGER,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (site_name, source_id)
+);
+"""
+
+
+@dataclass
+class DetailRecord:
+    """상세 페이지에서 추출한 값 한 건."""
+
+    review_deadline_days: Optional[int]
+    fetched_at: float
+
+    @property
+    def found(self) -> bool:
+        return self.review_deadline_days is not None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        age = (now or time.time()) - self.fetched_at
+        return age < (FOUND_TTL if self.found else MISSING_TTL)
+
+    def as_info(self) -> Dict[str, Any]:
+        """enrich_campaign이 쓰는 extract_detail_info 결과 형태의 dict (리뷰 기간만)."""
+        return {"review_deadline_days": self.review_deadline_days}
+
+
+class EnrichmentStore:
+    """(site_name, source_id) → DetailRecord 저장소.
+
+    읽기는 load()로 미리 올려 둔 메모리 사본에서 하고, 쓰기는 메모리와 SQLite에 함께 반영한다.
+    """
+
+    def __init__(self, path: str = STORE_PATH) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._records: Dict[Tuple[str, str], DetailRecord] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self) -> int:
+        """저장된 항목을 한 번에 읽어 온다. 유효 기간이 한참 지난 항목은 정리한다."""
+        start = time.monotonic()
+        cutoff = time.time() - 2 * FOUND_TTL
+        with self._lock:
+            self._conn.execute("DELETE FROM enrichment WHERE fetched_at < ?", (cutoff,))
+            rows = self._conn.execute(
+                "SELECT site_name, source_id, review_deadline_days, fetched_at FROM enrichment"
+            ).fetchall()
+            self._records = {(site, sid): DetailRecord(days, ts) for site, sid, days, ts in rows}
+        logger.info("상세 보강 캐시 로드: %d개 항목 (%.2f초)", len(rows), time.monotonic() - start)
+        return len(rows)
+
+    def get(self, site_name: str, source_id: str) -> Optional[DetailRecord]:
+        """유효한 항목이 있으면 반환, 없거나 만료되었으면 None."""
+        with self._lock:
+            record = self._records.get((site_name, source_id))
+            if record is None:
+                self.misses += 1
+                return None
+            if not record.is_fresh():
+                self.stale += 1
+                return None
+            self.hits += 1
+            return record
+
+    def put(self, site_name: str, source_id: str, info: Dict[str, Any]) -> None:
+        record = DetailRecord(info.get("review_deadline_days"), time.time())
+        with self._lock:
+            self._records[(site_name, source_id)] = record
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enrichment "
+                "(site_name, source_id, review_deadline_days, fetched_at) VALUES (?, ?, ?, ?)",
+                (site_name, source_id, record.review_deadline_days, record.fetched_at),
+            )
+
+    def log_stats(self) -> None:
+        logger.info("상세 보강 캐시: hit %d / 만료 %d / miss %d", self.hits, self.stale, self.misses)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_store() -> Optional[EnrichmentStore]:
+    """저장소를 열고 전체 항목을 읽는다. 열 수 없으면 None (캐시 없이 진행)."""
+    if os.environ.get("CRAWLER_ENRICHMENT_CACHE", "1") == "0":
+        return None
+    try:
+        store = EnrichmentStore()
+        store.load()
+        return store
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("상세 보강 캐시를 열 수 없어 캐시 없이 진행: %s", e)
+        return None
@@ -0,0 +1,266 @@
+"""사이트 크롤러 동시 실행기.
+
+`SITES`의 각 사이트 크롤러를 별도 스레드에서 병렬로 실행하고,
+사이트별 실행 시간 예산(wall-clock budget)을 관리한다.
+
+- 각 크롤러는 `budget_exceeded(site_name)`로 예산 초과 여부를 확인하고
+  페이지 루프를 스스로 중단한다 (협조적 취소).
+- 크롤러가 `track(site_name, campaigns)`로 수집 중인 리스트를 등록해 두면,
+  예산 + 유예 시간이 지나도 끝나지 않은 사이트의 부분 결과를 회수할 수 있다.
+- 결과는 완료 순서와 무관하게 입력된 사이트 순서대로 반환한다 (결정적 병합).
+- 사이트는 데몬 스레드에서 실행한다. 유예 시간이 지나도 끝나지 않은 사이트는 기다리지 않고 포기하며,
+  프로세스 종료도 막지 않는다. 공유 자원(HTTP 클라이언트, 캐시 등)을 닫기 전에는
+  `join_abandoned()`로 포기한 사이트가 끝나기를 제한 시간만큼 기다린다.
+- 크롤러(페이지 수집 엔진)는 목록을 끝까지 보지 못했을 때 `mark_incomplete(site_name, reason)`로 알린다.
+  목록 전체를 본 사이트(SiteResult.complete)만 "목록에서 사라진 캠페인" 정리 대상이 된다.
+- incremental 모드에서는 이미 저장된 (source, source_id) 집합을 `known_source_ids(site_name)`로
+  크롤러(페이지 수집 엔진)에 넘겨, 이미 아는 캠페인만 나오는 페이지에서 일찍 멈출 수 있게 한다.
+  full_listing으로 지정한 사이트(sweep 대상)는 목록 전체를 봐야 하므로 넘기지 않는다.
+"""
+
+import importlib
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Container, Dict, List, Optional, Sequence, Set, Tuple
+
+from crawler.models import Campaign
+from crawler.utils import logger
+
+# 사이트별 기본 실행 시간 예산 (초)
+# GitHub Actions 워크플로우 timeout-minutes(30분) 안에 저장까지 끝나도록 여유를 둔다.
+DEFAULT_SITE_BUDGET_SECONDS = float(os.environ.get("CRAWLER_SITE_BUDGET", "480"))
+
+# 예산 초과 후 진행 중인 요청(최대 timeout 45초)이 끝나기를 기다리는 유예 시간 (초)
+GRACE_SECONDS = 60.0
+
+# 종료 전 포기한 사이트 스레드가 끝나기를 기다리는 최대 시간 (초, 진행 중인 요청 timeout 정도)
+ABANDON_JOIN_SECONDS = float(os.environ.get("CRAWLER_ABANDON_JOIN", "45"))
+
+# 사이트 실행 상태
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+_lock = threading.Lock()
+_deadlines: Dict[str, float] = {}
+_tracked: Dict[str, List[Campaign]] = {}
+_incomplete: Dict[str, str] = {}
+_abandoned: Set[str] = set()  # 유예 시간이 지나 결과를 포기했지만 스레드는 아직 도는 사이트
+_abandoned_threads: Dict[str, threading.Thread] = {}
+_known_ids: Optional[Container[Tuple[str, str]]] = None
+_full_listing: Container[str] = ()  # known_source_ids()를 받지 않고 목록을 끝까지 읽을 사이트
+
+
+@dataclass
+class SiteResult:
+    """사이트 하나의 크롤링 결과."""
+
+    site_name: str
+    campaigns: List[Campaign] = field(default_factory=list)
+    status: str = STATUS_OK
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    complete: bool = True  # 목록을 끝까지 수집했는지 (조기 종료, 페이지 실패, 시간 초과 등이면 False)
+    incomplete_reason: Optional[str] = None
+
+
+def budget_exceeded(site_name: str) -> bool:
+    """사이트의 실행 시간 예산이 초과되었는지 확인.
+
+    실행기 밖에서(스크립트 등) 단독으로 호출된 크롤러는 예산이 없으므로 항상 False.
+    실행기가 결과를 포기한 사이트는 스레드가 끝날 때까지 항상 True (남은 페이지를 더 받지 않게).
+    """
+    with _lock:
+        if site_name in _abandoned:
+            return True
+        deadline = _deadlines.get(site_name)
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def track(site_name: str, campaigns: List[Campaign]) -> None:
+    """수집 중인 캠페인 리스트를 등록 (타임아웃 시 부분 결과 회수용)."""
+    with _lock:
+        if site_name in _deadlines:
+            _tracked[site_name] = campaigns
+
+
+def mark_incomplete(site_name: str, reason: str) -> None:
+    """사이트 목록을 끝까지 수집하지 못했음을 기록 (최대 페이지 도달, 조기 종료, 페이지 요청 실패 등)."""
+    with _lock:
+        if site_name in _deadlines:
+            _incomplete.setdefault(site_name, reason)
+
+
+def known_source_ids(site_name: Optional[str] = None) -> Optional[Container[Tuple[str, str]]]:
+    """이미 저장된 (source, source_id) 집합.
+
+    full 모드이거나 실행기 밖에서 호출되면, 또는 목록을 끝까지 읽어야 하는 사이트(full_listing)면 None.
+    """
+    with _lock:
+        if site_name is not None and site_name in _full_listing:
+            return None
+        return _known_ids
+
+
+def join_abandoned(timeout: float = ABANDON_JOIN_SECONDS) -> List[str]:
+    """포기한 사이트 스레드가 끝나기를 최대 timeout초 기다린다. 그래도 끝나지 않은 사이트 이름을 반환.
+
+    HTTP 클라이언트, 세션, 캐시 등 크롤러가 쓰는 공유 자원을 닫기 전에 호출한다.
+    """
+    deadline = time.monotonic() + timeout
+    with _lock:
+        pending = dict(_abandoned_threads)
+    for site_name, thread in pending.items():
+        thread.join(max(0.0, deadline - time.monotonic()))
+    return [site_name for site_name, thread in pending.items() if thread.is_alive()]
+
+
+def _snapshot(site_name: str) -> List[Campaign]:
+    with _lock:
+        return list(_tracked.get(site_name, []))
+
+
+def _run_site(site_name: str) -> List[Campaign]:
+    """사이트 모듈을 로드하여 crawl()을 실행. 예외는 호출 측으로 전파한다."""
+    module = importlib.import_module(f"crawler.sites.{site_name}")
+    if not hasattr(module, "crawl"):
+        raise AttributeError(f"crawler.sites.{site_name}에 crawl 함수가 없습니다.")
+    return module.crawl()
+
+
+def run_sites(
+    sites: Sequence[str],
+    budget_seconds: float = DEFAULT_SITE_BUDGET_SECONDS,
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[SiteResult], None]] = None,
+    known_ids: Optional[Container[Tuple[str, str]]] = None,
+    full_listing: Container[str] = (),
+) -> List[SiteResult]:
+    """여러 사이트 크롤러를 병렬 실행하고 사이트 순서대로 결과를 반환.
+
+    Args:
+        sites: 크롤링할 사이트 모듈 이름 목록
+        budget_seconds: 사이트별 실행 시간 예산 (초)
+        max_workers: 동시에 실행할 최대 사이트 수 (기본값: 사이트 수)
+        on_result: 사이트 하나가 끝날 때마다 (완료 순서대로) 호출되는 콜백.
+            다음 단계(정규화/저장)를 사이트 완료 즉시 시작할 때 사용한다.
+        known_ids: incremental 모드에서 이미 저장된 (source, source_id) 집합 (known_source_ids()로 노출)
+        full_listing: known_ids가 있어도 조기 종료하지 않고 목록을 끝까지 읽을 사이트 (sweep 대상)
+
+    Returns:
+        입력된 사이트 순서와 동일한 순서의 SiteResult 리스트
+    """
+    if not sites:
+        return []
+
+    global _known_ids, _full_listing
+    results: Dict[str, SiteResult] = {}
+    started: Dict[str, float] = {}
+    finished: Set[str] = set()
+    with _lock:
+        _known_ids = known_ids
+        _full_listing = full_listing
+
+    def worker(site_name: str) -> SiteResult:
+        start = time.monotonic()
+        with _lock:
+            started[site_name] = start
+            _deadlines[site_name] = start + budget_seconds
+        logger.info("[%s] 크롤링 시작 (예산 %.0f초)", site_name, budget_seconds)
+        try:
+            campaigns = _run_site(site_name)
+            status = STATUS_TIMEOUT if budget_exceeded(site_name) else STATUS_OK
+            result = SiteResult(site_name, list(campaigns), status, time.monotonic() - start)
+        except Exception as e:
+            logger.error("[%s] 크롤링 중 오류 발생: %s", site_name, e)
+            result = SiteResult(site_name, _snapshot(site_name), STATUS_ERROR, time.monotonic() - start, str(e))
+        with _lock:
+            reason = _incomplete.get(site_name)
+        if result.status != STATUS_OK:
+            reason = reason or result.status
+        result.complete = reason is None
+        result.incomplete_reason = reason
+        with _lock:
+            finished.add(site_name)
+            _abandoned.discard(site_name)
+            _abandoned_threads.pop(site_name, None)
+        return result
+
+    slots = threading.Semaphore(max_workers or len(sites))
+    done_q: "queue.Queue[SiteResult]" = queue.Queue()
+    threads: Dict[str, threading.Thread] = {}
+
+    def run(site_name: str) -> None:
+        with slots:
+            with _lock:
+                if site_name in _abandoned:  # 차례를 기다리는 동안 포기됨: 시작하지 않는다
+                    _abandoned.discard(site_name)
+                    _abandoned_threads.pop(site_name, None)
+                    return
+            done_q.put(worker(site_name))
+
+    # 데몬 스레드: 포기한 사이트가 응답 없는 요청에 묶여 있어도 프로세스 종료를 막지 않는다
+    for site in sites:
+        threads[site] = threading.Thread(target=run, args=(site,), name=f"site-{site}", daemon=True)
+        threads[site].start()
+
+    # 모든 사이트가 시작된 시점부터 예산 + 유예 시간까지 대기
+    hard_limit = time.monotonic() + budget_seconds + GRACE_SECONDS
+    while len(results) < len(sites):
+        remaining = hard_limit - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            result = done_q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        results[result.site_name] = result
+        if on_result is not None:
+            on_result(result)
+
+    # 유예 시간 안에 끝나지 않은 사이트는 부분 결과만 회수하고 포기
+    for site_name in sites:
+        if site_name in results:
+            continue
+        with _lock:
+            start = started.get(site_name, hard_limit)
+            if site_name not in finished:
+                _abandoned.add(site_name)
+                _abandoned_threads[site_name] = threads[site_name]
+        partial = _snapshot(site_name)
+        logger.warning(
+            "[%s] 실행 시간 예산 초과로 중단 - 부분 결과 %d개 사용",
+            site_name, len(partial),
+        )
+        results[site_name] = SiteResult(
+            site_name, partial, STATUS_TIMEOUT, time.monotonic() - start,
+            complete=False, incomplete_reason=STATUS_TIMEOUT,
+        )
+        if on_result is not None:
+            on_result(results[site_name])
+
+    # 응답 없는 스레드를 기다리지 않고 반환. 포기한 사이트는 budget_exceeded()가 계속 True라서
+    # 진행 중인 요청(timeout)이 끝나면 페이지 루프를 멈추고, 스레드가 끝나면 표시도 지운다.
+    # 공유 자원을 닫기 전에는 join_abandoned()로 기다린다.
+
+    with _lock:
+        _known_ids = None
+        _full_listing = ()
+        for site_name in sites:
+            _deadlines.pop(site_name, None)
+            _tracked.pop(site_name, None)
+            _incomplete.pop(site_name, None)
+
+    ordered = [results[site] for site in sites]
+    for r in ordered:
+        logger.info(
+            "[%s] 크롤링 %s - %d개 수집 (%.1f초)",
+            r.site_name,
+            {"ok": "완료", "timeout": "시간 초과(부분 결과)", "error": "실패"}[r.status],
+            len(r.campaigns),
+            r.elapsed,
+        )
+    return ordered
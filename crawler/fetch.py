@@ -0,0 +1,305 @@
+"""asyncio 기반 공통 페치 엔진.
+
+목록 페이지 수집은 대부분 네트워크 대기 시간이므로, 여러 페이지를 동시에 요청한다.
+
+- 호스트별 동시 요청 수와 속도는 crawler.ratelimit이 조절 (스레드 쪽 sessions.get과 공유)
+- 요청별 타임아웃과 재시도 (429/5xx, 네트워크 오류는 지수 백오프 후 재시도. 429 Retry-After는 제한기 쿨다운에도 반영)
+- 결과는 요청 순서대로 반환하며, 개별 실패는 예외 대신 FetchResult.error에 담긴다
+- cache_ttl을 지정하면 crawler.http_cache의 디스크 캐시를 사용 (ETag / Last-Modified 재검증).
+  SQLite 조회·저장은 이벤트 루프를 막지 않도록 별도 스레드에서 수행한다
+- `fetch_all` / `fetch_one` / `run_sync`는 동기 코드(기존 crawl() 함수)에서 바로 쓸 수 있는 어댑터.
+  스레드마다 이벤트 루프와 httpx.AsyncClient(커넥션 풀)를 하나씩 두고 계속 재사용하므로
+  호출할 때마다 연결(TLS handshake)을 새로 맺지 않는다. 실행 종료 시 `close_clients()`로 닫는다
+- 목록 페이지 병렬 수집은 crawler.pagination 참고
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from crawler import ratelimit
+from crawler.http_cache import cache_key, get_cache
+from crawler.sessions import DEFAULT_HEADERS, POOL_SIZE
+from crawler.utils import logger
+
+# 기본 요청 타임아웃 (초)
+DEFAULT_TIMEOUT = 10.0
+
+# 기본 재시도 횟수 (첫 요청 제외)
+DEFAULT_RETRIES = 2
+
+# 목록 페이지를 한 번에 몇 페이지씩 동시에 가져올지
+PAGE_WINDOW = 4
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 재시도 전 대기 (초): BASE_BACKOFF * 2^시도 (최대 MAX_BACKOFF), 0.5~1배 지터
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 8.0
+
+T = TypeVar("T")
+
+# httpx는 요청마다 INFO 로그를 남기므로 크롤러 로그가 묻히지 않도록 낮춘다
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def _backoff(attempt: int) -> float:
+    return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+def _new_client(timeout: float = DEFAULT_TIMEOUT) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+    )
+
+
+# 동기 어댑터용 스레드별 (이벤트 루프, 클라이언트). 닫을 때 쓰도록 전부 기록해 둔다
+_local = threading.local()
+_clients_lock = threading.Lock()
+_clients: List[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = []
+
+
+def _thread_loop() -> Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]:
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _local.loop, _local.client = loop, _new_client()
+        with _clients_lock:
+            _clients.append((loop, _local.client))
+    return loop, _local.client
+
+
+def _shared_client() -> Optional[httpx.AsyncClient]:
+    """지금 실행 중인 루프가 run_sync의 스레드 루프면 그 스레드의 공유 클라이언트."""
+    loop = getattr(_local, "loop", None)
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return _local.client if running is loop else None
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """동기 코드에서 코루틴을 실행 (asyncio.run 대신).
+
+    스레드마다 이벤트 루프를 하나 두고 계속 쓰므로, 그 안에서 연 AsyncFetcher는 스레드의 공유
+    커넥션 풀을 사용한다 (같은 호스트에 반복 요청해도 keep-alive 연결을 재사용).
+    """
+    loop, _ = _thread_loop()
+    return loop.run_until_complete(coro)
+
+
+def close_clients() -> None:
+    """동기 어댑터가 만든 스레드별 클라이언트와 이벤트 루프를 닫는다 (실행 종료 시).
+
+    아직 다른 스레드에서 실행 중인 루프(포기한 사이트 등)는 건드리지 않는다.
+    """
+    with _clients_lock:
+        clients = list(_clients)
+        _clients.clear()
+    for loop, client in clients:
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.aclose())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        except Exception as e:
+            logger.debug("페치 클라이언트 종료 실패: %s", e)
+        finally:
+            loop.close()
+
+
+class FetchError(Exception):
+    """페치 실패 (네트워크 오류, 타임아웃, HTTP 오류 상태)."""
+
+
+@dataclass
+class FetchRequest:
+    """요청 한 건."""
+
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    timeout: Optional[float] = None
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+
+@dataclass
+class FetchResult:
+    """요청 한 건의 결과. 실패해도 예외를 던지지 않고 error에 기록한다."""
+
+    request: FetchRequest
+    status_code: Optional[int] = None
+    text: str = ""
+    url: Optional[str] = None
+    error: Optional[FetchError] = None
+    elapsed: float = 0.0
+    attempts: int = 0
+    from_cache: Optional[str] = None  # "hit" / "revalidated" / None(네트워크)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def raise_for_status(self) -> None:
+        """실패한 결과면 FetchError를 던진다 (requests.Response와 같은 사용법)."""
+        if self.error is not None:
+            raise self.error
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncFetcher:
+    """호스트별 동시성 제한과 재시도를 갖춘 비동기 HTTP 페처.
+
+    사용 예:
+        async with AsyncFetcher(headers=HEADERS) as fetcher:
+            results = await fetcher.fetch_all(requests)
+
+    run_sync로 실행한 코루틴 안에서 열면 스레드의 공유 클라이언트를 쓰고 (닫지 않음),
+    그 밖의 이벤트 루프에서는 블록 동안 쓸 클라이언트를 새로 만든다.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        cache_ttl: Optional[float] = None,
+    ) -> None:
+        # 공통 기본 헤더(User-Agent 등) 위에 호출 측 헤더를 덮어쓴다
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.timeout = timeout
+        self.retries = retries
+        # None이면 캐시 사용 안 함, 0이면 항상 재검증, 양수면 그 시간(초) 동안 재사용
+        self.cache_ttl = cache_ttl
+        self._client: Optional[httpx.AsyncClient] = None
+        self._owns_client = False
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._client = _shared_client()
+        self._owns_client = self._client is None
+        if self._owns_client:
+            self._client = _new_client(self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+
+    async def fetch(self, request: FetchRequest) -> FetchResult:
+        """요청 한 건 수행 (재시도 포함)."""
+        if self._client is None:
+            raise RuntimeError("AsyncFetcher는 async with 블록 안에서 사용해야 합니다.")
+
+        result = FetchResult(request=request)
+        start = time.monotonic()
+        timeout = request.timeout or self.timeout
+
+        # SQLite 캐시는 동기 I/O이므로 루프 밖(기본 executor)에서 조회·저장한다
+        cache = get_cache() if self.cache_ttl is not None else None
+        key = cache_key(request.url, request.params) if cache is not None else None
+        entry = await asyncio.to_thread(cache.get, key) if cache is not None else None
+        if entry is not None and entry.is_fresh(self.cache_ttl):
+            await asyncio.to_thread(cache.touch, key)
+            cache.stats.add(hits=1, bytes_saved=len(entry.body))
+            result.status_code, result.text, result.url, result.from_cache = 200, entry.text, request.url, "hit"
+            return result
+        headers = {**self.headers, **(request.headers or {})}
+        if entry is not None:
+            headers.update(entry.validators())
+
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            try:
+                async with ratelimit.alimit(request.url) as outcome:
+                    res = await self._client.get(
+                        request.url,
+                        params=request.params,
+                        headers=headers,
+                        timeout=timeout,
+                    )
+                    outcome.record(res.status_code, res.headers.get("Retry-After"))
+                result.status_code = res.status_code
+                result.url = str(res.url)
+                if res.status_code == 304 and entry is not None:
+                    await asyncio.to_thread(cache.touch, key, True)
+                    cache.stats.add(revalidated=1, bytes_saved=len(entry.body))
+                    result.status_code, result.text, result.from_cache = 200, entry.text, "revalidated"
+                    result.error = None
+                    break
+                if res.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                    logger.debug("페치 재시도 %d/%d (HTTP %d): %s", attempt + 1, self.retries, res.status_code, request.url)
+                    await asyncio.sleep(_backoff(attempt))
+                    continue
+                res.raise_for_status()
+                result.text = res.text
+                result.error = None
+                if cache is not None:
+                    await asyncio.to_thread(self._store, cache, key, res)
+                break
+            except httpx.HTTPStatusError as e:
+                result.error = FetchError(f"HTTP {e.response.status_code}: {request.url}")
+                break
+            except httpx.HTTPError as e:
+                result.error = FetchError(f"{type(e).__name__}: {e} ({request.url})")
+                if attempt < self.retries:
+                    logger.debug("페치 재시도 %d/%d: %s (%s)", attempt + 1, self.retries, e, request.url)
+                    await asyncio.sleep(_backoff(attempt))
+                    continue
+
+        result.elapsed = time.monotonic() - start
+        return result
+
+    def _store(self, cache, key: str, res: httpx.Response) -> None:
+        cache.stats.add(misses=1)
+        etag = res.headers.get("ETag")
+        last_modified = res.headers.get("Last-Modified")
+        # 재사용(TTL)이나 재검증(검증자) 중 하나라도 가능한 응답만 저장
+        if res.status_code == 200 and (self.cache_ttl > 0 or etag or last_modified):
+            cache.put(key, res.content, res.encoding, res.headers.get("Content-Type"), etag, last_modified)
+
+    async def fetch_all(self, requests: Sequence[FetchRequest]) -> List[FetchResult]:
+        """여러 요청을 동시에 수행하고 요청 순서대로 결과를 반환."""
+        return list(await asyncio.gather(*(self.fetch(r) for r in requests)))
+
+
+def fetch_all(requests: Sequence[FetchRequest], **fetcher_kwargs) -> List[FetchResult]:
+    """동기 어댑터: 여러 요청을 동시에 수행하고 요청 순서대로 결과를 반환.
+
+    이벤트 루프가 없는 스레드(기존 crawl() 함수, 사이트 실행기 워커)에서 호출한다.
+    같은 스레드의 호출들은 커넥션 풀을 공유한다 (run_sync).
+    """
+    if not requests:
+        return []
+
+    async def _run() -> List[FetchResult]:
+        async with AsyncFetcher(**fetcher_kwargs) as fetcher:
+            return await fetcher.fetch_all(requests)
+
+    return run_sync(_run())
+
+
+def fetch_one(url: str, params: Optional[Dict[str, Any]] = None, **fetcher_kwargs) -> FetchResult:
+    """동기 어댑터: 요청 한 건 수행."""
+    return fetch_all([FetchRequest(url, params=params)], **fetcher_kwargs)[0]
+
@@ -0,0 +1,244 @@
+"""디스크 기반 HTTP 캐시 (SQLite).
+
+하루 두 번 실행될 때마다 바뀌지 않은 목록/상세 페이지를 통째로 다시 내려받지 않도록,
+응답 본문을 URL(+쿼리 파라미터) 기준으로 저장해 두고 재사용한다.
+
+- TTL 안의 항목은 네트워크 요청 없이 디스크에서 바로 반환 (hit)
+- TTL이 지난 항목은 ETag / Last-Modified로 조건부 요청을 보내고,
+  304 Not Modified면 디스크의 본문을 반환 (revalidated)
+- 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- hit / miss / revalidated / 저장 / 삭제 건수를 실행 종료 시 로그로 남긴다
+
+CRAWLER_HTTP_CACHE=0 이면 캐시를 사용하지 않는다.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from crawler.utils import cache_dir, logger
+
+# 캐시 DB 파일
+CACHE_PATH = os.path.join(cache_dir, "http_cache.sqlite3")
+
+# 전체 캐시 최대 크기 (압축된 본문 기준)
+MAX_BYTES = int(os.environ.get("CRAWLER_HTTP_CACHE_MB", "100")) * 1024 * 1024
+
+# 용도별 기본 TTL (초)
+# 목록 페이지는 매번 조건부 요청으로 재검증하고, 게시 후 거의 바뀌지 않는 상세 페이지는 3일간 재사용한다.
+LIST_TTL = 0
+DETAIL_TTL = 3 * 24 * 3600
+
+# 이 횟수만큼 저장할 때마다 크기 제한을 확인
+_EVICT_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    encoding TEXT,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def cache_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """URL과 쿼리 파라미터로 캐시 키 생성 (파라미터 순서 무관)."""
+    if not params:
+        return url
+    query = urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+
+@dataclass
+class CachedResponse:
+    """캐시에 저장된 응답 한 건."""
+
+    key: str
+    body: bytes
+    encoding: Optional[str]
+    content_type: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and time.time() - self.fetched_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """조건부 요청 헤더."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
+@dataclass
+class CacheStats:
+    """캐시 사용 통계."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stored: int = 0
+    evicted: int = 0
+    bytes_saved: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+class HttpCache:
+    """SQLite에 응답 본문과 검증자(ETag / Last-Modified)를 저장하는 캐시.
+
+    여러 스레드(사이트 크롤러, 보강 워커)에서 동시에 쓰므로 연결 하나를 락으로 보호한다.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._stores_since_evict = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, encoding, content_type, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        body, encoding, content_type, etag, last_modified, fetched_at = row
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            self.delete(key)
+            return None
+        return CachedResponse(key, body, encoding, content_type, etag, last_modified, fetched_at)
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        encoding: Optional[str] = None,
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, encoding, content_type, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, compressed, encoding, content_type, etag, last_modified, now, now, len(compressed)),
+            )
+            self._stores_since_evict += 1
+            should_evict = self._stores_since_evict >= _EVICT_EVERY
+        self.stats.add(stored=1)
+        if should_evict:
+            self.evict()
+
+    def touch(self, key: str, refreshed: bool = False) -> None:
+        """마지막 사용 시각 갱신. refreshed=True면 (304 재검증) TTL도 다시 시작한다."""
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def evict(self) -> int:
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 사용하지 않은 항목부터 삭제."""
+        with self._lock:
+            self._stores_since_evict = 0
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        self.stats.add(evicted=removed)
+        logger.info("HTTP 캐시 정리: %d개 항목 삭제", removed)
+        return removed
+
+    def log_stats(self) -> None:
+        s = self.stats
+        requests_total = s.hits + s.misses + s.revalidated
+        saved_rate = (s.hits + s.revalidated) / requests_total * 100 if requests_total else 0.0
+        logger.info(
+            "HTTP 캐시: hit %d / revalidated(304) %d / miss %d (재사용 %.1f%%, 절약 %.1fMB), 저장 %d, 삭제 %d",
+            s.hits, s.revalidated, s.misses, saved_rate, s.bytes_saved / 1024 / 1024, s.stored, s.evicted,
+        )
+
+    def close(self) -> None:
+        self.evict()
+        with self._lock:
+            self._conn.close()
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[HttpCache] = None
+
+
+def get_cache() -> Optional[HttpCache]:
+    """프로세스 전역 캐시 (비활성화되었거나 열 수 없으면 None)."""
+    global _cache
+    if os.environ.get("CRAWLER_HTTP_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = HttpCache()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("HTTP 캐시를 열 수 없어 캐시 없이 진행: %s", e)
+                os.environ["CRAWLER_HTTP_CACHE"] = "0"
+                return None
+        return _cache
+
+
+def close_cache() -> None:
+    """통계를 로그로 남기고 캐시를 닫는다 (실행 종료 시)."""
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.log_stats()
+        cache.close()
@@ -0,0 +1,116 @@
+"""캠페인 제목에서 지역 추출 (사이트 공통).
+
+사이트 파서마다 두던 지역 키워드 목록 대신 crawler.region의 지명 사전(GAZETTEER)을 쓴다.
+제목을 한 번 훑어 등장한 지명을 모두 찾고, 그중 하나를 고른다.
+
+- 대괄호 안([서울 강남], [레드버튼 성남모란])의 지명이 제목 본문의 지명보다 우선
+- 그다음 구체적인 지명(시/군/구·동네) > 도/광역시 > 전국
+- 그다음 긴 지명 ("강남역" > "강남"), 같으면 앞쪽
+
+    match = find_location("[서울 강남] 맛집 체험단")
+    match.keyword   # "강남"
+    match.segment   # "서울 강남" (대괄호 안 전체, 본문에서 찾았으면 None)
+    match.region    # Region("서울", "강남구")
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from crawler.region import GAZETTEER, Region
+from crawler.textmatch import PhraseIndex
+
+_BRACKET_RE = re.compile(r"\[([^\]]+)\]")
+
+# 지명 사전에 없지만 사이트 제목에서 지역으로 쓰이는 표기 (광역을 특정할 수 없으면 None)
+EXTRA_KEYWORDS: Dict[str, Optional[Region]] = {
+    "전국": None,
+    "위례": None,  # 서울 송파 / 경기 성남·하남에 걸침
+    "새롬": Region("세종"),
+    "동구": None, "서구": None, "남구": None, "북구": None,
+}
+
+_INDEX = PhraseIndex({**EXTRA_KEYWORDS, **dict(GAZETTEER.items())})
+
+
+class LocationMatch(NamedTuple):
+    keyword: str  # 제목에 등장한 지명 그대로
+    region: Optional[Region]  # 지명 사전 값 (전국 등은 None)
+    start: int  # 제목 안 위치
+    segment: Optional[str] = None  # 대괄호 안에서 찾았으면 그 대괄호 안 전체
+
+    @property
+    def specificity(self) -> int:
+        """2: 시/군/구·동네, 1: 도/광역시, 0: 전국 등."""
+        if self.region is None:
+            return 0
+        return 2 if self.region.city else 1
+
+
+def bracket_spans(title: str) -> List[Tuple[int, int, str]]:
+    """제목의 대괄호 안 내용: [(시작, 끝, 내용), ...] (위치는 대괄호 안쪽 기준)."""
+    if "[" not in title:
+        return []
+    return [(m.start(1), m.end(1), m.group(1)) for m in _BRACKET_RE.finditer(title)]
+
+
+def scan_locations(title: Optional[str], brackets: Optional[Sequence[Tuple[int, int, str]]] = None) -> List[LocationMatch]:
+    """제목에 등장한 지명을 앞에서부터 모두 (겹치면 긴 쪽).
+
+    brackets: 이미 구한 bracket_spans(title) 결과가 있으면 넘겨서 다시 찾지 않게 한다.
+    """
+    if not title:
+        return []
+    found = _INDEX.find_all(title)
+    if not found or "[" not in title:
+        return [LocationMatch(title[start:end], region, start) for start, end, region in found]
+
+    if brackets is None:
+        brackets = bracket_spans(title)
+    starts = [b[0] for b in brackets]
+    matches = []
+    for start, end, region in found:
+        segment = None
+        i = bisect.bisect_right(starts, start) - 1
+        if i >= 0 and end <= brackets[i][1]:
+            segment = brackets[i][2]
+        matches.append(LocationMatch(title[start:end], region, start, segment))
+    return matches
+
+
+def best_location(matches: Sequence[LocationMatch], brackets_only: bool = False) -> Optional[LocationMatch]:
+    """scan_locations 결과 중 가장 우선하는 지명 (대괄호 안 > 구체적 > 긴 것 > 앞쪽). 없으면 None.
+
+    같은 대괄호(또는 본문)에 도/광역시가 있으면 다른 광역의 시/군/구는 구체적이라고 보지 않는다
+    ("[대구 중구]" → 대구, 서울 중구가 아님).
+    brackets_only=True면 대괄호 안에서만 찾는다.
+    """
+    if brackets_only:
+        matches = [m for m in matches if m.segment is not None]
+    if len(matches) <= 1:
+        return matches[0] if matches else None
+
+    provinces: Dict[Optional[str], str] = {}
+    for m in matches:
+        if m.specificity == 1:
+            provinces.setdefault(m.segment, m.region.province)
+
+    def rank(m: LocationMatch):
+        specificity = m.specificity
+        if specificity == 2 and provinces.get(m.segment, m.region.province) != m.region.province:
+            specificity = 0
+        return (m.segment is not None, specificity, len(m.keyword), -m.start)
+
+    return max(matches, key=rank)
+
+
+def find_location(title: Optional[str], brackets_only: bool = False) -> Optional[LocationMatch]:
+    """제목에서 가장 우선하는 지명 (best_location 규칙). 없으면 None."""
+    return best_location(scan_locations(title), brackets_only)
+
+
+def has_location(text: Optional[str]) -> bool:
+    """text에 지명이 하나라도 있는가 (대괄호 안 내용 판별용)."""
+    return bool(text) and _INDEX.search(text) is not None
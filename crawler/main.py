@@ -1,13 +1,22 @@
-import importlib
 import json
 import os
+import time
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from crawler.executor import DEFAULT_SITE_BUDGET_SECONDS, STATUS_OK, SiteResult, join_abandoned
+from crawler.fetch import close_clients
+from crawler.http_cache import close_cache
+from crawler.memo import load_memos, log_memo_stats, save_memos
 from crawler.models import Campaign
-from crawler.utils import logger, save_campaigns_to_supabase, get_existing_source_ids, _campaign_to_supabase_dict
+from crawler.pipeline import run_pipeline
+from crawler.ratelimit import log_rates
+from crawler.sessions import POOL_SIZE, close_sessions
+from crawler.sinks import CampaignSink, open_sink
+from crawler.spool import open_spool, replay_spool
+from crawler.source_index import SourceIdIndex
+from crawler.utils import extract_source_id, logger
 
 # 크롤링할 사이트 모듈 목록
 # 레뷰(revu)는 목록 열람 시 로그인이 필요하므로 현재는 제외
@@ -40,25 +49,21 @@ SITES = [
     "real_review", # 리얼리뷰
 ]
 
+# 마감일을 추정해서 저장하는 사이트: 추정 마감일이 지나도 이 일수만큼은 비활성화하지 않는다
+# (incremental 모드에서는 이미 저장된 캠페인의 추정 마감일이 다시 갱신되지 않기 때문)
+# - modan: 마감일 정보가 없어 수집일 + 30일로 저장
+# - real_review: 모집 상태(open/last/today)로 +7일/+2일/당일 추정
+DEADLINE_GRACE_DAYS = {
+    "modan": 7,
+    "real_review": 7,
+}
 
-def run_crawler(site_name: str) -> List[Campaign]:
-    """특정 사이트 크롤러 실행 후 Campaign 리스트 반환."""
-
-    try:
-        logger.info("[%s] 크롤링 시작...", site_name)
-        module = importlib.import_module(f"crawler.sites.{site_name}")
-        if hasattr(module, "crawl"):
-            campaigns = module.crawl()
-            logger.info("[%s] 크롤링 완료 - %d개 수집", site_name, len(campaigns))
-            return campaigns
-        else:
-            logger.error("[%s] crawl 함수를 찾을 수 없습니다.", site_name)
-    except ImportError:
-        logger.error("[%s] 모듈을 찾을 수 없습니다.", site_name)
-    except Exception as e:
-        logger.error("[%s] 크롤링 중 오류 발생: %s", site_name, e)
-
-    return []
+# 목록에서 사라진 캠페인 정리(sweep) 대상 사이트
+# 목록 전체를 페이지 수집 엔진(crawler.pagination)으로 읽어 완료 여부를 알 수 있는 사이트만 포함한다.
+# (reviewnote는 첫 화면 일부만 읽으므로 제외)
+# sweep을 켜면 이 사이트들은 incremental 모드에서도 이미 아는 페이지에서 멈추지 않고 목록을 끝까지 읽는다
+# (chuble, dinodan, modan은 최신순 조기 종료(REASON_KNOWN)로 멈추면 미완료라 정리 대상에서 빠지기 때문)
+SWEEP_SITES = {"dinnerqueen", "stylec", "modan", "chuble", "dinodan", "real_review"}
 
 
 def _campaign_to_dict(c: Campaign) -> Dict:
@@ -80,41 +85,19 @@ def _campaign_to_dict(c: Campaign) -> Dict:
     }
 
 
-def cleanup_expired_campaigns() -> None:
-    """마감된 캠페인을 is_active=false로 업데이트."""
+def cleanup_expired_campaigns(sink: Optional[CampaignSink]) -> None:
+    """마감된 캠페인을 is_active=false로 업데이트 (전체 source, 한 번의 set 기반 update).
+
+    Supabase는 DB 함수 expire_campaigns(docs/supabase-expire-campaigns.sql)로 한 번의 왕복에 처리하고
+    비활성화된 개수를 받는다. 마감일을 추정하는 사이트는 DEADLINE_GRACE_DAYS만큼 여유를 둔다.
+    """
+    if sink is None:
+        logger.warning("저장소가 없어 마감 캠페인 정리를 건너뜁니다.")
+        return
     try:
-        from dotenv import load_dotenv
-        from supabase import create_client
-        
-        load_dotenv()
-        supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        
-        if not supabase_url or not supabase_key:
-            logger.warning("Supabase 환경 변수가 없어 마감 캠페인 정리를 건너뜁니다.")
-            return
-        
-        supabase = create_client(supabase_url, supabase_key)
-        today = datetime.now(timezone.utc).date().isoformat()
-        
-        # 리뷰노트 캠페인 중 마감된 것 조회
-        response = supabase.table("campaigns")\
-            .select("id")\
-            .eq("source", "reviewnote")\
-            .eq("is_active", True)\
-            .lt("application_deadline", today)\
-            .execute()
-        
-        expired_count = len(response.data) if response.data else 0
+        expired_count = sink.expire(datetime.now(timezone.utc).date(), DEADLINE_GRACE_DAYS)
         
         if expired_count > 0:
-            # 일괄 업데이트
-            for campaign in response.data:
-                supabase.table("campaigns")\
-                    .update({"is_active": False})\
-                    .eq("id", campaign["id"])\
-                    .execute()
-            
             logger.info("마감된 캠페인 %d개 비활성화 완료", expired_count)
         else:
             logger.info("마감된 캠페인 없음")
@@ -123,19 +106,83 @@ def cleanup_expired_campaigns() -> None:
         logger.warning("마감 캠페인 정리 중 오류 (무시하고 계속): %s", e)
 
 
-def main(save_json: bool = True, mode: str = "auto") -> None:
+def sweep_missing_campaigns(site_results: List[SiteResult], generation: int, sink: Optional[CampaignSink]) -> None:
+    """이번 실행 목록에서 사라진 캠페인을 사이트별로 비활성화 (mark-and-sweep).
+
+    목록을 끝까지 정상 수집한 SWEEP_SITES 사이트마다 저장소의 sweep을 한 번 호출한다
+    (Supabase는 DB 함수 sweep_campaigns, docs/supabase-crawl-generation.sql). 이번에 본 캠페인에
+    crawl_generation을 찍고(비활성이었으면 다시 활성화 - incremental 모드는 이미 저장된 캠페인을 다시 저장하지 않는다),
+    같은 source의 활성 캠페인 중 세대가 다른 것을 한 번에 비활성화한다.
+    실패·시간 초과·조기 종료된 사이트는 목록 일부만 봤으므로 건너뛴다.
+    """
+    if sink is None:
+        return
+    for r in site_results:
+        if r.site_name not in SWEEP_SITES:
+            continue
+        if r.status != STATUS_OK or not r.complete or not r.campaigns:
+            logger.info("[%s] 목록을 끝까지 수집하지 못해 사라진 캠페인 정리 건너뜀 (%s)",
+                        r.site_name, r.incomplete_reason or r.status)
+            continue
+        seen_ids = sorted({extract_source_id(c.site_name, c.url) for c in r.campaigns})
+        try:
+            swept = sink.sweep(r.site_name, generation, seen_ids)
+        except Exception as e:
+            logger.warning("[%s] 사라진 캠페인 정리 중 오류 (무시하고 계속): %s", r.site_name, e)
+            continue
+        if swept is None:
+            return  # 저장소가 지원하지 않음
+        logger.info("[%s] 목록에서 사라진 캠페인 %d개 비활성화 (목록 %d개)", r.site_name, swept, len(seen_ids))
+
+
+def main(
+    save_json: bool = True,
+    mode: str = "auto",
+    site_budget: float = DEFAULT_SITE_BUDGET_SECONDS,
+    sweep: bool = False,
+    sink: Optional[str] = None,
+) -> None:
     """
     전체 크롤러 실행.
 
     `mode` 옵션:
     - "auto": campaigns 테이블이 비어있으면 "full", 아니면 "incremental"
     - "full": 모든 페이지를 크롤링
-    - "incremental": 이미 Supabase에 존재하는 캠페인은 건너뜀
+    - "incremental": 이미 Supabase에 존재하는 캠페인은 건너뜀.
+      최신순 목록은 이미 저장된 캠페인만 나오는 페이지가 이어지면 그 사이트/카테고리 수집을 멈춘다.
+
+    `site_budget`: 사이트별 실행 시간 예산(초). 사이트들은 병렬로 실행되며,
+    예산을 넘긴 사이트는 그때까지 수집한 부분 결과만 사용한다.
+
+    `sweep`: True면 목록을 끝까지 수집한 사이트에서 이번 목록에 없는 활성 캠페인을 비활성화한다.
+
+    `sink`: 저장소 ("supabase" 기본, "sqlite[:경로]", "jsonl[:경로]", "none"). crawler.sinks 참고.
     """
+    store = open_sink(sink)
+    if store is not None:
+        logger.info("저장소: %s", store.name)
+
+    # 지난 실행의 정규화 결과로 캐시를 미리 채운다 (규칙이 바뀌었으면 버려짐)
+    load_memos()
+
+    # 지난 실행에서 저장하지 못한 chunk를 먼저 다시 보낸다 (기존 ID 로드 전에 반영되도록)
+    spool = open_spool(store)
+    if spool is not None:
+        try:
+            replay_spool(store, spool)
+        except Exception as e:
+            logger.warning("spool 재전송 중 오류 (다음 실행에서 다시 시도): %s", e)
+
+    def load_existing_ids() -> SourceIdIndex:
+        return store.load_source_ids(SITES) if store is not None else SourceIdIndex().freeze()
+
+    # 이번 실행의 세대 번호 (sweep에서 이번에 본 캠페인 표시용)
+    generation = int(time.time())
 
     # auto 모드: campaigns 테이블 상태에 따라 자동 결정
+    existing_ids = None
     if mode == "auto":
-        existing_ids = get_existing_source_ids()
+        existing_ids = load_existing_ids()
         if len(existing_ids) == 0:
             mode = "full"
             logger.info("campaigns 테이블이 비어있음 -> full 모드로 실행")
@@ -146,34 +193,39 @@ def main(save_json: bool = True, mode: str = "auto") -> None:
     logger.info("=== 전체 크롤링 시작 (mode=%s) ===", mode)
     
     # 마감된 캠페인 정리
-    cleanup_expired_campaigns()
-    
-    all_campaigns: List[Campaign] = []
-
-    for site in SITES:
-        campaigns = run_crawler(site)
-        all_campaigns.extend(campaigns)
+    cleanup_expired_campaigns(store)
 
-    logger.info("전체 사이트 합계: %d개 캠페인 수집", len(all_campaigns))
-
-    # 차등 크롤링: 기존 ID와 겹치는 캠페인 제거
+    # 차등 크롤링: 기존 ID는 크롤러(페이지 조기 종료)와 정규화 단계(중복 제거)에 함께 넘긴다
     if mode == "incremental":
-        existing_ids = get_existing_source_ids()
-        before = len(all_campaigns)
-        all_campaigns = [c for c in all_campaigns if (c.site_name, _campaign_to_supabase_dict(c)["source_id"]) not in existing_ids]
-        logger.info("차등 필터링: %d -> %d (새로운 캠페인 %d개)", before, len(all_campaigns), len(all_campaigns))
+        if existing_ids is None:
+            existing_ids = load_existing_ids()
+    else:
+        existing_ids = None
 
-    # 배치 처리: 리뷰 기간이 없는 캠페인들의 상세 페이지 크롤링
-    # 병렬 처리 워커 수 증가 (더 빠른 처리)
-    all_campaigns = enrich_review_deadlines_batch(all_campaigns, max_workers=10)
+    # 사이트별 병렬 크롤링 → 정규화 → 리뷰 기간 보강 → 배치 저장을 단계별로 겹쳐 실행
+    # (사이트 하나가 끝나는 즉시 저장이 시작되며, 결과는 SITES 순서대로 정렬되어 결정적)
+    result = run_pipeline(
+        SITES,
+        budget_seconds=site_budget,
+        existing_ids=existing_ids,
+        # 실제 호스트별 동시 요청 수는 crawler.ratelimit이 조절하므로 워커 수는 상한일 뿐이다
+        enrich_workers=POOL_SIZE,
+        sink=store,
+        spool=spool,
+        full_listing_sites=SWEEP_SITES if sweep else (),
+    )
+    all_campaigns: List[Campaign] = result.campaigns
 
-    # Supabase에 저장
-    if all_campaigns:
-        try:
-            save_campaigns_to_supabase(all_campaigns)
-        except Exception as e:
-            logger.error("Supabase 저장 실패: %s", e)
-            logger.info("JSON 저장은 계속 진행합니다...")
+    logger.info("전체 사이트 합계: %d개 캠페인 수집", sum(len(r.campaigns) for r in result.site_results))
+    if result.failed_rows:
+        logger.error("Supabase 저장 실패: %d개 캠페인 (실패 chunk %d개)", result.failed_rows, result.failed_batches)
+        if spool is not None:
+            logger.info("실패한 chunk는 spool에 남아 다음 실행에서 다시 보냅니다: %s", spool.path)
+        logger.info("JSON 저장은 계속 진행합니다...")
+
+    # 목록에서 사라진 캠페인 정리 (저장이 끝난 뒤, 목록을 끝까지 본 사이트만)
+    if sweep:
+        sweep_missing_campaigns(result.site_results, generation, store)
 
     if save_json and all_campaigns:
         # output 디렉터리 생성
@@ -193,88 +245,35 @@ def main(save_json: bool = True, mode: str = "auto") -> None:
 
         logger.info("크롤링 결과 JSON 저장 완료: %s", output_path)
 
-    logger.info("=== 전체 크롤링 종료 ===")
-
+    # 포기한 사이트 스레드가 아직 공유 자원(HTTP 클라이언트, 세션, 캐시)을 쓰고 있을 수 있으므로 먼저 기다린다
+    # (데몬 스레드라서 제한 시간이 지나면 기다리지 않고 닫고 종료한다)
+    still_running = join_abandoned()
+    if still_running:
+        logger.warning("중단한 사이트 스레드가 아직 끝나지 않았지만 종료합니다: %s", ", ".join(still_running))
 
-def enrich_review_deadlines_batch(campaigns: List[Campaign], max_workers: int = 5) -> List[Campaign]:
-    """리뷰 기간이 없는 캠페인들의 상세 페이지를 배치로 크롤링하여 리뷰 기간 정보를 추가.
-    
-    Args:
-        campaigns: 리뷰 기간 정보를 추가할 캠페인 리스트
-        max_workers: 병렬 처리할 최대 워커 수
-    
-    Returns:
-        리뷰 기간 정보가 추가된 캠페인 리스트
-    """
-    from crawler.utils_detail import extract_detail_info
-    
-    # 리뷰 기간이 없는 캠페인만 필터링
-    campaigns_to_enrich = [c for c in campaigns if c.review_deadline_days is None]
-    
-    if not campaigns_to_enrich:
-        logger.info("리뷰 기간 정보가 필요한 캠페인이 없습니다.")
-        return campaigns
-    
-    logger.info("리뷰 기간 정보 추가를 위해 %d개 캠페인의 상세 페이지 크롤링 시작...", len(campaigns_to_enrich))
-    
-    def enrich_single_campaign(campaign: Campaign) -> tuple[Campaign, bool]:
-        """단일 캠페인의 리뷰 기간 정보를 추가."""
-        try:
-            info = extract_detail_info(campaign.url, campaign.site_name)
-            review_deadline_days = info.get("review_deadline_days")
-            
-            if review_deadline_days:
-                # Campaign 객체는 불변(immutable)이므로 새 객체 생성
-                return Campaign(
-                    title=campaign.title,
-                    url=campaign.url,
-                    site_name=campaign.site_name,
-                    category=campaign.category,
-                    deadline=campaign.deadline,
-                    location=campaign.location,
-                    image_url=campaign.image_url,
-                    channel=campaign.channel,
-                    type=campaign.type,
-                    review_deadline_days=review_deadline_days,
-                    recruit_count=campaign.recruit_count,
-                    applicant_count=campaign.applicant_count,
-                ), True
-            else:
-                return campaign, False
-        except Exception as e:
-            logger.warning("[%s] 리뷰 기간 정보 추가 실패: %s (URL: %s)", campaign.site_name, e, campaign.url)
-            return campaign, False
-    
-    # 캠페인을 URL로 인덱싱하여 빠른 조회 가능하도록
-    campaign_dict = {c.url: c for c in campaigns}
-    enriched_count = 0
-    
-    # 병렬 처리로 상세 페이지 크롤링
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_campaign = {
-            executor.submit(enrich_single_campaign, c): c 
-            for c in campaigns_to_enrich
-        }
-        
-        for future in as_completed(future_to_campaign):
-            campaign = future_to_campaign[future]
-            try:
-                enriched_campaign, success = future.result()
-                campaign_dict[enriched_campaign.url] = enriched_campaign
-                if success:
-                    enriched_count += 1
-            except Exception as e:
-                logger.warning("[%s] 리뷰 기간 정보 추가 중 예외 발생: %s", campaign.site_name, e)
-    
-    logger.info("리뷰 기간 정보 추가 완료: %d/%d개 성공", enriched_count, len(campaigns_to_enrich))
-    
-    # 원래 순서 유지하면서 업데이트된 캠페인 반환
-    return [campaign_dict.get(c.url, c) for c in campaigns]
+    if spool is not None:
+        spool.compact()
+        spool.close()
+    if store is not None:
+        store.close()
+    log_rates()
+    log_memo_stats()
+    save_memos()
+    close_sessions()
+    close_clients()
+    close_cache()
+    logger.info("=== 전체 크롤링 종료 ===")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run crawler")
     parser.add_argument("--mode", choices=["auto", "full", "incremental"], default="auto",
                         help="auto: auto-detect (full if empty, incremental if not); full: crawl all pages; incremental: skip already stored campaigns")
+    parser.add_argument("--site-budget", type=float, default=DEFAULT_SITE_BUDGET_SECONDS,
+                        help="per-site wall-clock budget in seconds (sites run concurrently)")
+    parser.add_argument("--sweep", action="store_true", default=os.environ.get("CRAWLER_SWEEP") == "1",
+                        help="deactivate campaigns missing from fully crawled site listings (env CRAWLER_SWEEP=1)")
+    parser.add_argument("--sink", default=None,
+                        help="storage backend: supabase (default), sqlite[:path], jsonl[:path], none (env CRAWLER_SINK)")
     args = parser.parse_args()
-    main(save_json=True, mode=args.mode)
+    main(save_json=True, mode=args.mode, site_budget=args.site_budget, sweep=args.sweep, sink=args.sink)
@@ -0,0 +1,189 @@
+"""정규화 함수 결과 메모이제이션 (LRU, 실행 간 유지 선택).
+
+normalize_category(site_name, raw_category, title)와 normalize_region(raw_region)은 같은 입력이
+한 실행 안에서도, 실행마다, 표준화 마이그레이션에서도 반복해서 들어온다.
+`@memoize`를 붙인 함수는 인자 튜플 → 결과를 크기 제한이 있는 LRU(functools.lru_cache)에 담아 두고
+다시 계산하지 않는다.
+
+- 규칙 버전: 함수가 정의된 모듈과 그 모듈이 쓰는 매칭 엔진/데이터 모듈(crawler.textmatch 등) 파일 내용의 해시.
+  키워드 목록이나 규칙, 매칭 방식이 바뀌면 버전이 달라져 디스크에 저장해 둔 결과를 쓰지 않는다
+  (메모리 캐시는 프로세스와 함께 사라지므로 해당 없음).
+- `load_memos()` / `save_memos()`로 cache_dir/normalize_memo.json에 저장해 다음 실행을 미리 데운다.
+- `log_memo_stats()`로 함수별 적중률을 로그로 남긴다.
+
+CRAWLER_MEMO_SIZE로 함수별 최대 항목 수를, CRAWLER_MEMO_PERSIST=0으로 디스크 저장 여부를 바꾼다.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import itertools
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, TypeVar, Union
+
+# 함수별 최대 항목 수
+MAXSIZE = int(os.environ.get("CRAWLER_MEMO_SIZE", "50000"))
+PERSIST = os.environ.get("CRAWLER_MEMO_PERSIST", "1") != "0"
+MEMO_FILE = "normalize_memo.json"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
+
+
+def rules_version(paths: Union[str, Sequence[str]]) -> str:
+    """규칙이 정의된 파일들 내용의 해시 (파일 중 하나라도 바뀌면 달라진다)."""
+    digest = hashlib.sha1()
+    for path in [paths] if isinstance(paths, str) else paths:
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha1(f.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+class Memo:
+    """memoize 한 함수의 캐시 상태: 디스크에서 읽은 결과, 최근 계산 결과(저장용), 적중률.
+
+    LRU 자체는 functools.lru_cache(C 구현)가 맡는다. 캐시 미스일 때만 이 객체를 거친다.
+    (dict 연산 하나하나는 GIL로 안전하고, 횟수 통계는 스레드 경합 시 약간 틀릴 수 있다)
+    """
+
+    def __init__(self, name: str, version: str, maxsize: int = MAXSIZE) -> None:
+        self.name = name
+        self.version = version
+        self.maxsize = maxsize
+        self.computed = 0  # 실제로 계산한 횟수
+        self.warm_hits = 0  # 디스크에서 읽은 결과로 대신한 횟수
+        self.loaded = 0
+        self._warm: Dict[Hashable, Any] = {}
+        self._recent: Dict[Hashable, Any] = {}  # 새로 구한 결과 (삽입 순서, 저장용)
+        self._lock = threading.Lock()
+        self._cache_info: Optional[Callable[[], Any]] = None
+
+    def trim(self) -> None:
+        """저장용 최근 결과를 최근 maxsize개로 줄인다."""
+        with self._lock:
+            excess = len(self._recent) - self.maxsize
+            for old in list(itertools.islice(self._recent, max(0, excess))):
+                self._recent.pop(old, None)
+
+    @property
+    def hits(self) -> int:
+        lru_hits = self._cache_info().hits if self._cache_info else 0
+        return lru_hits + self.warm_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.computed
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return self._cache_info().currsize if self._cache_info else 0
+
+    def dump(self) -> dict:
+        with self._lock:
+            entries = list(self._recent.items())[-self.maxsize:]
+        return {"version": self.version, "entries": [[list(k), v] for k, v in entries]}
+
+    def restore(self, data: dict) -> int:
+        """dump() 결과를 읽어 들인다. 규칙 버전이 다르면 무시하고 0을 반환."""
+        if data.get("version") != self.version:
+            return 0
+        entries = data.get("entries") or []
+        with self._lock:
+            for key, value in entries[-self.maxsize:]:
+                self._warm.setdefault(tuple(key), value)
+            self.loaded = len(self._warm)
+        return self.loaded
+
+
+_memos: Dict[str, Memo] = {}
+
+
+def memoize(name: str, rules: Union[str, Sequence[str]], maxsize: int = MAXSIZE) -> Callable[[F], F]:
+    """위치 인자 튜플을 키로 결과를 캐시하는 데코레이터 (인자는 해시 가능하고 JSON으로 저장 가능해야 한다).
+
+    Args:
+        name: 캐시 이름 (디스크 저장과 통계에 쓰임)
+        rules: 결과를 좌우하는 파일 경로들 (함수 모듈의 __file__과 그 모듈이 쓰는 매칭/데이터 모듈의 __file__).
+            내용 해시가 규칙 버전이 된다
+        maxsize: 최대 항목 수 (넘으면 가장 오래 쓰이지 않은 것부터 버림)
+
+    캐시하지 않은 원래 함수는 `.__wrapped__`로 부를 수 있다.
+    """
+    memo = Memo(name, rules_version(rules), maxsize)
+    _memos[name] = memo
+
+    def decorator(fn: F) -> F:
+        warm, recent, limit = memo._warm, memo._recent, memo.maxsize * 2
+
+        def miss(*args: Hashable, **kwargs: Any) -> Any:
+            if kwargs:  # 키워드 인자 호출은 저장하지 않음
+                return fn(*args, **kwargs)
+            value = warm.pop(args, _MISSING) if warm else _MISSING
+            if value is _MISSING:
+                value = fn(*args)
+                memo.computed += 1
+            else:
+                memo.warm_hits += 1
+            recent[args] = value
+            if len(recent) > limit:
+                memo.trim()
+            return value
+
+        wrapper = functools.lru_cache(maxsize=maxsize)(miss)
+        functools.update_wrapper(wrapper, fn)
+        memo._cache_info = wrapper.cache_info
+        wrapper.memo = memo  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _memo_path(path: Optional[str]) -> str:
+    from crawler.utils import cache_dir
+
+    return path or os.path.join(cache_dir, MEMO_FILE)
+
+
+def load_memos(path: Optional[str] = None) -> Dict[str, int]:
+    """디스크에 저장된 결과를 읽어 캐시를 데운다. 캐시 이름 → 읽은 항목 수."""
+    if not PERSIST:
+        return {}
+    try:
+        with open(_memo_path(path), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {name: memo.restore(data.get(name) or {}) for name, memo in _memos.items()}
+
+
+def save_memos(path: Optional[str] = None) -> None:
+    """현재 캐시 내용을 디스크에 저장 (다음 실행용)."""
+    if not PERSIST:
+        return
+    from crawler.utils import logger
+
+    path = _memo_path(path)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({name: memo.dump() for name, memo in _memos.items()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("정규화 캐시 저장 실패: %s", e)
+
+
+def log_memo_stats() -> None:
+    """캐시별 적중률을 로그로 남긴다 (실행 종료 시)."""
+    from crawler.utils import logger
+
+    for name, memo in sorted(_memos.items()):
+        if memo.hits or memo.computed:
+            logger.info(
+                "정규화 캐시 %s: 적중률 %.1f%% (적중 %d, 계산 %d, 항목 %d개, 디스크에서 읽은 %d개 중 %d개 사용)",
+                name, memo.hit_rate * 100, memo.hits, memo.computed, len(memo), memo.loaded, memo.warm_hits,
+            )
@@ -0,0 +1,240 @@
+"""목록 페이지 병렬 수집 엔진.
+
+페이지를 1, 2, 3 ... 순서대로 하나씩 요청하면 수집 시간이 페이지 수만큼의 왕복 지연이 된다.
+이 모듈은 여러 페이지를 미리 요청해 두고, 응답은 페이지 순서대로 처리하면서 목록의 끝을 판단한다.
+
+- 사이트/카테고리별로 지난 실행에서 마지막으로 게시물이 있던 페이지를 학습해 두고,
+  다음 실행에서는 그 페이지(+ 끝 확인용 페이지)까지 한 번에 요청한다.
+  학습값이 없거나 그 이후 페이지는 window 크기만큼만 앞서 요청한다.
+- 연속 empty_limit개 페이지에서 새 게시물(새 URL)이 없으면 목록의 끝으로 보고,
+  아직 진행 중인 이후 페이지 요청은 취소한다.
+- 실행 시간 예산 초과나 StopPagination(최대 수집 개수 도달 등)으로도 중단할 수 있다.
+- 목록 끝(REASON_END)이 아닌 이유로 멈췄거나 실패한 페이지 요청이 있으면 실행기에 알려
+  (mark_incomplete) 그 사이트를 "목록에서 사라진 캠페인" 정리에서 제외하게 한다.
+- incremental 모드에서 최신순 목록(newest_first=True)은 연속 known_limit개 페이지의 새 캠페인이
+  모두 이미 저장된 것이면 그 이후는 볼 필요가 없으므로 멈춘다 (sweep 대상 사이트는 끝까지 읽는다).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+
+from crawler.executor import budget_exceeded, known_source_ids, mark_incomplete
+from crawler.fetch import PAGE_WINDOW, AsyncFetcher, FetchRequest, FetchResult, run_sync
+from crawler.http_cache import LIST_TTL
+from crawler.models import Campaign
+from crawler.utils import cache_dir, extract_source_id, logger
+
+# 학습된 페이지 수 저장 파일
+HINTS_FILE = os.path.join(cache_dir, "page_hints.json")
+
+# incremental 모드에서 연속 몇 페이지가 이미 저장된 캠페인뿐이면 멈출지
+KNOWN_PAGE_LIMIT = 2
+
+# 중단 사유
+REASON_END = "end"
+REASON_MAX_PAGES = "max_pages"
+REASON_BUDGET = "budget"
+REASON_STOPPED = "stopped"
+REASON_KNOWN = "known"
+
+_hints_lock = threading.Lock()
+_hints: Optional[Dict[str, dict]] = None
+
+
+class StopPagination(Exception):
+    """handle_page에서 던지면 남은 페이지 요청을 취소하고 수집을 끝낸다 (예: 최대 수집 개수 도달)."""
+
+
+@dataclass
+class PaginationStats:
+    """페이지 수집 결과 요약."""
+
+    key: str
+    pages_processed: int = 0
+    failed_pages: int = 0  # 요청이 실패한 페이지 수
+    last_page: int = 0  # 마지막으로 새 게시물이 있던 페이지
+    cancelled: int = 0  # 목록 끝 이후라서 취소된 요청 수
+    reason: str = REASON_MAX_PAGES
+    hint: Optional[int] = None
+    elapsed: float = 0.0
+
+
+def _load_hints() -> Dict[str, dict]:
+    global _hints
+    if _hints is None:
+        try:
+            with open(HINTS_FILE, encoding="utf-8") as f:
+                _hints = json.load(f)
+        except (OSError, ValueError):
+            _hints = {}
+    return _hints
+
+
+def get_page_hint(key: str) -> Optional[int]:
+    """지난 실행에서 학습한 마지막 게시물 페이지 (없으면 None)."""
+    with _hints_lock:
+        entry = _load_hints().get(key)
+    return entry.get("last_page") if entry else None
+
+
+def _save_page_hint(key: str, last_page: int) -> None:
+    with _hints_lock:
+        hints = _load_hints()
+        hints[key] = {"last_page": last_page, "updated_at": datetime.now().isoformat(timespec="seconds")}
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{HINTS_FILE}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(hints, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, HINTS_FILE)
+        except OSError as e:
+            logger.warning("페이지 수 학습값 저장 실패: %s", e)
+
+
+async def apaginate(
+    fetcher: AsyncFetcher,
+    key: str,
+    make_request: Callable[[int], FetchRequest],
+    handle_page: Callable[[int, FetchResult], Sequence[Campaign]],
+    max_pages: int,
+    empty_limit: int = 2,
+    window: int = PAGE_WINDOW,
+    site_name: Optional[str] = None,
+    newest_first: bool = False,
+    known_limit: int = KNOWN_PAGE_LIMIT,
+) -> PaginationStats:
+    """목록 페이지를 미리 요청해 두고 페이지 순서대로 handle_page에 넘긴다.
+
+    Args:
+        fetcher: 열려 있는 AsyncFetcher
+        key: 페이지 수 학습 키 (사이트 또는 "사이트:카테고리")
+        make_request: 페이지 번호(1부터)를 받아 FetchRequest를 만드는 함수
+        handle_page: (page, result)를 받아 이 페이지에서 새로 수집한 캠페인 리스트를 반환하는 함수.
+            빈 리스트를 반환하면 빈 페이지로 본다. StopPagination을 던지면 즉시 종료한다.
+        max_pages: 최대 페이지 수
+        empty_limit: 연속으로 몇 페이지가 비면 목록의 끝으로 볼지
+        window: 학습값 이후 구간에서 앞서 요청할 페이지 수
+        site_name: 실행 시간 예산을 확인할 사이트 이름
+        newest_first: 목록이 최신 등록순이면 True. incremental 모드에서 이미 저장된 캠페인만
+            연속 known_limit페이지 나오면 멈춘다.
+        known_limit: 위 조기 종료에 필요한 연속 페이지 수
+    """
+    stats = PaginationStats(key=key, hint=get_page_hint(key))
+    start = time.monotonic()
+    tasks: Dict[int, asyncio.Task] = {}
+    next_page = 1
+
+    # 학습값이 있으면 끝 확인용 페이지까지 한 번에, 그 이후는 window만큼만 앞서 요청.
+    # 단, 앞쪽 몇 페이지만 보고 멈출 가능성이 높은 incremental 최신순 목록은 window만큼만 요청한다.
+    known = known_source_ids(site_name) if newest_first else None
+    eager_until = stats.hint + empty_limit if stats.hint and known is None else 0
+
+    def schedule(current: int) -> None:
+        nonlocal next_page
+        until = min(max(current + window - 1, eager_until), max_pages)
+        while next_page <= until:
+            tasks[next_page] = asyncio.create_task(fetcher.fetch(make_request(next_page)))
+            next_page += 1
+
+    known_count = 0
+    empty_count = 0
+    page = 1
+    try:
+        while page <= max_pages:
+            if site_name and budget_exceeded(site_name):
+                logger.warning("[%s] 실행 시간 예산 초과로 페이지 수집 중단 (page %d)", key, page)
+                stats.reason = REASON_BUDGET
+                break
+            schedule(page)
+            result = await tasks.pop(page)
+            stats.pages_processed += 1
+            if not result.ok:
+                stats.failed_pages += 1
+            try:
+                found = handle_page(page, result)
+            except StopPagination:
+                stats.reason = REASON_STOPPED
+                break
+            except Exception as e:
+                # 처리 실패는 빈 페이지가 아니다: 실패 페이지로 세고(목록 미완료) 목록 끝 판단에는 넣지 않는다
+                logger.error("[%s] 페이지 %d 처리 중 오류: %s", key, page, e)
+                stats.failed_pages += 1
+                page += 1
+                continue
+
+            if found:
+                empty_count = 0
+                stats.last_page = page
+                if known is not None:
+                    if all((c.site_name, extract_source_id(c.site_name, c.url)) in known for c in found):
+                        known_count += 1
+                        if known_count >= known_limit:
+                            stats.reason = REASON_KNOWN
+                            break
+                    else:
+                        known_count = 0
+            else:
+                empty_count += 1
+                if empty_count >= empty_limit:
+                    stats.reason = REASON_END
+                    break
+            page += 1
+    finally:
+        # 목록 끝 이후로 미리 보낸 요청 취소
+        for task in tasks.values():
+            if task.cancel():
+                stats.cancelled += 1
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    stats.elapsed = time.monotonic() - start
+
+    if site_name and (stats.reason != REASON_END or stats.failed_pages):
+        mark_incomplete(site_name, f"{key}: {stats.reason}, 실패 페이지 {stats.failed_pages}개")
+
+    # 목록을 끝까지 본 경우에만 학습 (예산 초과/중단은 실제 길이를 알 수 없음)
+    if stats.reason in (REASON_END, REASON_MAX_PAGES) and stats.last_page and stats.last_page != stats.hint:
+        _save_page_hint(key, stats.last_page)
+
+    logger.info(
+        "[%s] 페이지 수집 종료 (%s): %d페이지 처리, 마지막 게시물 페이지 %d, 학습값 %s, 취소 %d건, %.1f초",
+        key, stats.reason, stats.pages_processed, stats.last_page,
+        stats.hint if stats.hint is not None else "-", stats.cancelled, stats.elapsed,
+    )
+    return stats
+
+
+def paginate(
+    key: str,
+    make_request: Callable[[int], FetchRequest],
+    handle_page: Callable[[int, FetchResult], Sequence[Campaign]],
+    max_pages: int,
+    empty_limit: int = 2,
+    window: int = PAGE_WINDOW,
+    site_name: Optional[str] = None,
+    newest_first: bool = False,
+    **fetcher_kwargs,
+) -> PaginationStats:
+    """동기 어댑터: 기존 crawl() 함수에서 apaginate를 실행한다.
+
+    fetcher_kwargs는 AsyncFetcher에 그대로 전달된다 (timeout, headers 등).
+    목록 페이지는 기본으로 HTTP 캐시를 거쳐 바뀌지 않은 페이지는 304 재검증으로 받는다.
+    """
+    fetcher_kwargs.setdefault("cache_ttl", LIST_TTL)
+
+    async def _run() -> PaginationStats:
+        async with AsyncFetcher(**fetcher_kwargs) as fetcher:
+            return await apaginate(
+                fetcher, key, make_request, handle_page, max_pages,
+                empty_limit=empty_limit, window=window, site_name=site_name, newest_first=newest_first,
+            )
+
+    return run_sync(_run())
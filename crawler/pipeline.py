@@ -0,0 +1,297 @@
+"""크롤링 → 정규화 → 상세 보강 → 저장 스트리밍 파이프라인.
+
+모든 사이트를 다 모은 뒤 한 번에 보강·저장하던 방식 대신, 사이트 하나가 끝나는 즉시
+그 결과가 다음 단계로 흘러가도록 단계들을 크기 제한 큐로 연결한다.
+
+    [사이트 실행기] → normalize → (리뷰 기간 없는 것만) enrich × N → upsert (배치)
+                            └──── 리뷰 기간 있는 것 / 보강 캐시 hit ────┘
+
+- 각 단계는 별도 스레드에서 동시에 동작하고, 큐가 가득 차면 앞 단계가 대기한다 (backpressure).
+- upsert 단계는 batch_size개 또는 flush_interval초마다 crawler.writer.BatchWriter에 넘기므로
+  첫 캠페인이 일찍 반영되고, 여러 chunk가 동시에 저장되며, 거부된 행만 빠지고 나머지는 저장된다.
+- 상세 보강 결과는 crawler.enrichment 저장소에 남겨 두고, 유효한 값이 있으면 상세 페이지를 요청하지 않는다.
+- 단계별 처리량(건수, 처리 시간, 초당 건수)을 실행 종료 시 로그로 남긴다.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Container, List, Optional, Sequence, Set, Tuple
+
+from crawler.enrichment import open_store
+from crawler.executor import DEFAULT_SITE_BUDGET_SECONDS, SiteResult, run_sites
+from crawler.models import Campaign
+from crawler.sinks import CampaignSink
+from crawler.spool import Spool
+from crawler.utils import _campaign_to_supabase_dict, content_hash, logger
+from crawler.utils_detail import enrich_campaign
+from crawler.writer import BatchWriter
+
+# 단계 사이 큐의 최대 크기 (이보다 많이 쌓이면 앞 단계가 대기)
+QUEUE_SIZE = 500
+
+# upsert 배치 크기와 최대 대기 시간 (초)
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 5.0
+
+# 단계 종료 신호
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """단계 하나의 처리량 통계."""
+
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, busy: float, items_in: int = 1, items_out: int = 1) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.started_at is None:
+                self.started_at = now - busy
+            self.finished_at = now
+            self.items_in += items_in
+            self.items_out += items_out
+            self.busy_seconds += busy
+
+    def summary(self) -> str:
+        wall = (self.finished_at - self.started_at) if self.started_at and self.finished_at else 0.0
+        rate = self.items_in / wall if wall > 0 else 0.0
+        return (
+            f"{self.name}: 입력 {self.items_in}건 / 출력 {self.items_out}건, "
+            f"처리 {self.busy_seconds:.1f}초, 경과 {wall:.1f}초, {rate:.1f}건/초"
+        )
+
+
+@dataclass
+class _Item:
+    """파이프라인을 흐르는 캠페인 한 건. order는 최종 결과 정렬용 (사이트 순서, 사이트 내 순서)."""
+
+    order: Tuple[int, int]
+    campaign: Campaign
+    row: dict
+
+
+@dataclass
+class PipelineResult:
+    """파이프라인 실행 결과."""
+
+    site_results: List[SiteResult]
+    campaigns: List[Campaign]
+    stats: List[StageStats]
+    written: int = 0
+    unchanged: int = 0
+    failed_batches: int = 0
+    failed_rows: int = 0
+
+
+def _with_review_days(item: _Item, review_deadline_days: int) -> _Item:
+    row = {**item.row, "review_deadline_days": review_deadline_days}
+    row["content_hash"] = content_hash(row)
+    return replace(item, campaign=replace(item.campaign, review_deadline_days=review_deadline_days), row=row)
+
+
+def run_pipeline(
+    sites: Sequence[str],
+    budget_seconds: float = DEFAULT_SITE_BUDGET_SECONDS,
+    existing_ids: Optional[Container[Tuple[str, str]]] = None,
+    enrich_workers: int = 10,
+    batch_size: int = BATCH_SIZE,
+    sink: Optional[CampaignSink] = None,
+    spool: Optional[Spool] = None,
+    full_listing_sites: Container[str] = (),
+) -> PipelineResult:
+    """사이트 크롤링부터 저장소(sink) 저장까지 단계들을 겹쳐서 실행.
+
+    Args:
+        sites: 크롤링할 사이트 목록
+        budget_seconds: 사이트별 실행 시간 예산 (초)
+        existing_ids: incremental 모드에서 건너뛸 (source, source_id) 집합. None이면 모두 처리
+        enrich_workers: 상세 페이지 보강 워커 수
+        batch_size: upsert 배치 크기
+        sink: 저장소 (crawler.sinks). None이면 저장 단계는 건너뛰고 결과만 모은다
+        spool: chunk를 보내기 전에 기록할 로컬 spool (crawler.spool). 실패한 chunk는 다음 실행에서 다시 보낸다
+        full_listing_sites: incremental 모드에서도 이미 아는 페이지에서 멈추지 않고 목록을 끝까지 읽을 사이트
+            (sweep 대상. 저장 단계의 중복 건너뛰기는 그대로)
+
+    Returns:
+        PipelineResult (campaigns는 사이트 순서 → 사이트 내 순서로 정렬된 최종 캠페인)
+    """
+    site_index = {site: i for i, site in enumerate(sites)}
+    normalize_q: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+    enrich_q: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+    upsert_q: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+
+    crawl_stats = StageStats("crawl")
+    normalize_stats = StageStats("normalize")
+    enrich_stats = StageStats("enrich")
+    upsert_stats = StageStats("upsert")
+
+    collected: List[_Item] = []
+    collected_lock = threading.Lock()
+    counters = {"skipped_existing": 0, "enrich_cached": 0}
+
+    # 상세 보강 결과 저장소 (시작 시 한 번에 로드)
+    store = open_store()
+
+    if sink is None:
+        logger.info("저장소 없음: 로컬 크롤링만 수행 (저장 생략)")
+
+    def emit(item: _Item) -> None:
+        with collected_lock:
+            collected.append(item)
+        upsert_q.put(item)
+
+    # --- 1단계: 사이트 결과를 정규화 큐로 (사이트가 끝나는 즉시) ---
+    def on_site_result(result: SiteResult) -> None:
+        crawl_stats.record(result.elapsed, len(result.campaigns), len(result.campaigns))
+        idx = site_index[result.site_name]
+        for i, campaign in enumerate(result.campaigns):
+            normalize_q.put(((idx, i), campaign))
+
+    # --- 2단계: 정규화 + 차등 필터 + 중복 제거 ---
+    def normalize_worker() -> None:
+        seen: Set[Tuple[str, str]] = set()
+        while True:
+            msg = normalize_q.get()
+            if msg is _DONE:
+                break
+            start = time.monotonic()
+            order, campaign = msg
+            out = 0
+            try:
+                row = _campaign_to_supabase_dict(campaign)
+                key = (row["source"], row["source_id"])
+                if existing_ids is not None and key in existing_ids:
+                    counters["skipped_existing"] += 1
+                elif key in seen:
+                    logger.debug("중복 캠페인 제거: %s - %s", row["source"], row["title"])
+                else:
+                    seen.add(key)
+                    item = _Item(order, campaign, row)
+                    out = 1
+                    record = None
+                    if campaign.review_deadline_days is None and store is not None:
+                        record = store.get(row["source"], row["source_id"])
+                    if campaign.review_deadline_days is None and record is None:
+                        enrich_q.put(item)
+                    else:
+                        if record is not None:
+                            counters["enrich_cached"] += 1
+                            if record.review_deadline_days:
+                                item = _with_review_days(item, record.review_deadline_days)
+                        emit(item)
+            except Exception as e:
+                logger.warning("[%s] 정규화 실패: %s (URL: %s)", campaign.site_name, e, campaign.url)
+            normalize_stats.record(time.monotonic() - start, 1, out)
+        for _ in range(enrich_workers):
+            enrich_q.put(_DONE)
+        upsert_q.put(_DONE)
+
+    # --- 3단계: 리뷰 기간이 없는 캠페인만 상세 페이지 보강 ---
+    def enrich_worker() -> None:
+        try:
+            while True:
+                item = enrich_q.get()
+                if item is _DONE:
+                    break
+                start = time.monotonic()
+                success = False
+                try:
+                    campaign, success = enrich_campaign(item.campaign, store, use_cached=False)
+                    if success:
+                        item = _with_review_days(item, campaign.review_deadline_days)
+                except Exception as e:
+                    success = False
+                    logger.warning("[%s] 상세 보강 실패: %s (URL: %s)", item.campaign.site_name, e, item.campaign.url)
+                enrich_stats.record(time.monotonic() - start, 1, 1 if success else 0)
+                emit(item)  # 보강에 실패해도 리뷰 기간 없이 저장
+        finally:
+            # 예외로 끝나도 upsert 단계가 종료 신호를 기다리다 멈추지 않도록
+            upsert_q.put(_DONE)
+
+    # --- 4단계: 배치 upsert (chunk 여러 개를 동시에 저장, chunk별 재시도) ---
+    # full 모드는 저장된 content_hash와 비교해 바뀐 캠페인만 보낸다
+    # (incremental 모드는 이미 저장된 캠페인을 정규화 단계에서 건너뛰므로 비교할 필요가 없다)
+    writer = None
+    if sink is not None:
+        known_hashes = sink.load_content_hashes(sites) if existing_ids is None else None
+        writer = BatchWriter(
+            chunk_size=batch_size, upsert=sink.upsert_rows, on_chunk=upsert_stats.record,
+            known_hashes=known_hashes, rejected_errors=sink.rejected_errors, spool=spool,
+        )
+
+    def flush(batch: List[dict]) -> None:
+        if not batch:
+            return
+        if writer is not None:
+            writer.submit(batch)
+        else:
+            upsert_stats.record(0.0, len(batch), 0)
+
+    def upsert_worker() -> None:
+        producers = 1 + enrich_workers  # normalize 1개 + enrich 워커들
+        batch: List[dict] = []
+        last_flush = time.monotonic()
+        while producers > 0:
+            timeout = max(0.1, FLUSH_INTERVAL - (time.monotonic() - last_flush))
+            try:
+                item = upsert_q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _DONE:
+                producers -= 1
+            elif item is not None:
+                batch.append(item.row)
+            if len(batch) >= batch_size or (batch and time.monotonic() - last_flush >= FLUSH_INTERVAL):
+                flush(batch)
+                batch = []
+                last_flush = time.monotonic()
+        flush(batch)
+
+    threads = [threading.Thread(target=normalize_worker, name="normalize", daemon=True)]
+    threads += [threading.Thread(target=enrich_worker, name=f"enrich-{i}", daemon=True) for i in range(enrich_workers)]
+    threads.append(threading.Thread(target=upsert_worker, name="upsert", daemon=True))
+    for t in threads:
+        t.start()
+
+    site_results = run_sites(
+        sites, budget_seconds=budget_seconds, on_result=on_site_result,
+        known_ids=existing_ids, full_listing=full_listing_sites,
+    )
+    normalize_q.put(_DONE)
+    for t in threads:
+        t.join()
+    write_stats = writer.close() if writer is not None else None
+
+    if existing_ids is not None:
+        logger.info("차등 필터링: 기존 캠페인 %d개 건너뜀", counters["skipped_existing"])
+
+    stats = [crawl_stats, normalize_stats, enrich_stats, upsert_stats]
+    logger.info("=== 파이프라인 단계별 처리량 ===")
+    for s in stats:
+        logger.info("  %s", s.summary())
+    if enrich_stats.items_in:
+        logger.info("리뷰 기간 정보 추가 완료: %d/%d개 성공", enrich_stats.items_out, enrich_stats.items_in)
+    if store is not None:
+        logger.info("상세 보강 캐시 사용: %d개 (상세 페이지 요청 생략)", counters["enrich_cached"])
+        store.log_stats()
+        store.close()
+
+    collected.sort(key=lambda item: item.order)
+    return PipelineResult(
+        site_results=site_results,
+        campaigns=[item.campaign for item in collected],
+        stats=stats,
+        written=write_stats.rows_written if write_stats else 0,
+        unchanged=write_stats.rows_unchanged if write_stats else 0,
+        failed_batches=write_stats.failed_chunks if write_stats else 0,
+        failed_rows=write_stats.rows_failed if write_stats else 0,
+    )
@@ -0,0 +1,254 @@
+"""호스트별 요청 속도 제한기 (토큰 버킷 + AIMD).
+
+사이트 크롤러, 상세 페이지 보강 워커, 카테고리별 ThreadPoolExecutor가 같은 호스트에
+제각각 요청을 보내던 것을 호스트 단위로 한곳에서 조율한다.
+
+- 호스트마다 초당 요청 수(rate)의 토큰 버킷과 동시 요청 수(concurrency) 한도를 둔다.
+- 응답이 빠르고 정상이면 rate와 concurrency를 조금씩 올리고 (additive increase),
+  429 / 5xx / 타임아웃 / 연결 오류가 나면 절반으로 줄이고 잠시 쉰다 (multiplicative decrease).
+  응답 시간이 평소보다 크게 늘어나도 서버가 버거워하는 신호로 보고 rate를 줄인다.
+- Retry-After 헤더가 있으면 그 시간만큼 해당 호스트 요청을 멈춘다.
+- 스레드(`limit`)와 asyncio(`alimit`) 양쪽에서 같은 제한기를 공유한다.
+- 실행 종료 시 `log_rates()`로 호스트별 현재 rate / concurrency를 남긴다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from crawler.utils import logger
+
+# 시작값과 범위
+INITIAL_RATE = 4.0  # 초당 요청 수
+MIN_RATE = 0.2
+MAX_RATE = 20.0
+INITIAL_CONCURRENCY = 4
+# 호스트별 커넥션 풀 크기(sessions.POOL_SIZE)를 넘지 않도록 같은 설정값을 사용
+MAX_CONCURRENCY = int(os.environ.get("CRAWLER_HTTP_POOL_SIZE", "16"))
+
+# 증가 / 감소 폭
+RATE_INCREASE = 0.25  # 성공 1건당 rate 증가량
+DECREASE_FACTOR = 0.5  # 오류 시 rate, concurrency 감소 비율
+SLOW_FACTOR = 0.8  # 응답 지연 시 rate 감소 비율
+
+# 평소 응답 시간의 몇 배 이상이면 지연으로 볼지 (그리고 최소 몇 초 이상일 때)
+SLOW_LATENCY_RATIO = 3.0
+SLOW_LATENCY_MIN = 1.0
+
+# 오류 후 쉬는 시간 (초): 연속 오류마다 두 배, 최대 MAX_COOLDOWN
+BASE_COOLDOWN = 0.5
+MAX_COOLDOWN = 30.0
+
+# 속도를 줄이는 HTTP 상태 코드
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class Outcome:
+    """요청 결과를 제한기에 알려 주기 위한 기록. limit()/alimit() 블록 안에서 채운다."""
+
+    status: Optional[int] = None
+    error: bool = False
+    cancelled: bool = False
+    retry_after: Optional[float] = None
+
+    def record(self, status: int, retry_after: Optional[str] = None) -> None:
+        self.status = status
+        if retry_after:
+            try:
+                self.retry_after = float(retry_after)
+            except ValueError:
+                pass  # HTTP-date 형식은 무시하고 기본 쿨다운 사용
+
+
+class HostLimiter:
+    """호스트 하나의 토큰 버킷 + AIMD 동시성 제한."""
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.rate = INITIAL_RATE
+        self.concurrency = INITIAL_CONCURRENCY
+        self.in_flight = 0
+        self.tokens = 1.0
+        self.latency: Optional[float] = None  # 응답 시간 EWMA
+        self.baseline: Optional[float] = None  # 관측된 가장 낮은 EWMA
+        self.requests = 0
+        self.throttled = 0
+        self._failures = 0
+        self._successes = 0
+        self._cooldown_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    def _refill(self, now: float) -> None:
+        burst = max(1.0, float(self.concurrency))
+        self.tokens = min(burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self) -> float:
+        """슬롯과 토큰을 얻으면 0, 아니면 다시 시도할 때까지 기다릴 시간(초). 락을 잡은 상태에서 호출."""
+        now = time.monotonic()
+        if now < self._cooldown_until:
+            return self._cooldown_until - now
+        if self.in_flight >= self.concurrency:
+            return 0.05
+        self._refill(now)
+        if self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.rate
+        self.tokens -= 1.0
+        self.in_flight += 1
+        self.requests += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        """요청을 보내도 될 때까지 대기 (스레드용)."""
+        with self._cond:
+            while True:
+                wait = self._try_take()
+                if wait <= 0:
+                    return
+                self._cond.wait(timeout=wait)
+
+    async def aacquire(self) -> None:
+        """요청을 보내도 될 때까지 대기 (asyncio용)."""
+        while True:
+            with self._lock:
+                wait = self._try_take()
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(self, latency: float, outcome: Outcome) -> None:
+        """요청 완료를 알리고 rate / concurrency를 조정."""
+        with self._cond:
+            self.in_flight -= 1
+            if outcome.cancelled:
+                self._cond.notify_all()
+                return
+            throttled = outcome.error or outcome.status in THROTTLE_STATUS_CODES
+            if throttled:
+                self._decrease(outcome)
+            else:
+                self._failures = 0
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+                if self.latency > max(SLOW_LATENCY_MIN, self.baseline * SLOW_LATENCY_RATIO):
+                    self.rate = max(MIN_RATE, self.rate * SLOW_FACTOR)
+                else:
+                    self.rate = min(MAX_RATE, self.rate + RATE_INCREASE)
+                    self._successes += 1
+                    # 현재 동시성만큼 연속 성공하면 동시성 1 증가 (왕복 1회당 +1)
+                    if self._successes >= self.concurrency:
+                        self._successes = 0
+                        self.concurrency = min(MAX_CONCURRENCY, self.concurrency + 1)
+            self._cond.notify_all()
+
+    def _decrease(self, outcome: Outcome) -> None:
+        self.throttled += 1
+        self._failures += 1
+        self._successes = 0
+        self.rate = max(MIN_RATE, self.rate * DECREASE_FACTOR)
+        self.concurrency = max(1, int(self.concurrency * DECREASE_FACTOR))
+        cooldown = outcome.retry_after
+        if cooldown is None:
+            cooldown = BASE_COOLDOWN * 2 ** (self._failures - 1)
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + min(cooldown, MAX_COOLDOWN))
+        self.tokens = 0.0
+        logger.debug(
+            "[%s] 요청 속도 감소: rate %.2f/s, 동시 %d (status=%s, error=%s)",
+            self.host, self.rate, self.concurrency, outcome.status, outcome.error,
+        )
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "concurrency": self.concurrency,
+                "latency": round(self.latency or 0.0, 3),
+                "requests": self.requests,
+                "throttled": self.throttled,
+            }
+
+
+_limiters_lock = threading.Lock()
+_limiters: Dict[str, HostLimiter] = {}
+
+
+def get_limiter(url_or_host: str) -> HostLimiter:
+    """호스트 전용 제한기 반환 (없으면 생성)."""
+    host = urlsplit(url_or_host).netloc if "://" in url_or_host else url_or_host
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter(host)
+        return limiter
+
+
+@contextmanager
+def limit(url: str) -> Iterator[Outcome]:
+    """스레드용: 호스트 한도 안에서 요청 하나를 수행.
+
+    사용 예:
+        with limit(url) as outcome:
+            res = session.get(url)
+            outcome.record(res.status_code, res.headers.get("Retry-After"))
+    """
+    limiter = get_limiter(url)
+    limiter.acquire()
+    outcome = Outcome()
+    start = time.monotonic()
+    try:
+        yield outcome
+    except Exception:
+        outcome.error = True
+        raise
+    finally:
+        limiter.release(time.monotonic() - start, outcome)
+
+
+@asynccontextmanager
+async def alimit(url: str) -> AsyncIterator[Outcome]:
+    """asyncio용 limit()."""
+    limiter = get_limiter(url)
+    await limiter.aacquire()
+    outcome = Outcome()
+    start = time.monotonic()
+    try:
+        yield outcome
+    except asyncio.CancelledError:
+        # 목록 끝 이후 요청 취소 등: 슬롯만 반납하고 속도 조정에는 반영하지 않는다
+        outcome.cancelled = True
+        raise
+    except Exception:
+        outcome.error = True
+        raise
+    finally:
+        limiter.release(time.monotonic() - start, outcome)
+
+
+def rate_snapshot() -> Dict[str, Dict[str, float]]:
+    """호스트별 현재 rate / concurrency / 응답 시간 / 요청 수 / 감속 횟수."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.snapshot() for limiter in limiters}
+
+
+def log_rates() -> None:
+    """호스트별 요청 속도 현황을 로그로 남긴다 (실행 종료 시)."""
+    snapshot = rate_snapshot()
+    if not snapshot:
+        return
+    logger.info("=== 호스트별 요청 속도 ===")
+    for host, s in sorted(snapshot.items()):
+        logger.info(
+            "  %s: %.2f req/s, 동시 %d, 응답 %.2f초, 요청 %d건, 감속 %d회",
+            host, s["rate"], s["concurrency"], s["latency"], s["requests"], s["throttled"],
+        )
@@ -1,6 +1,181 @@
-from typing import Optional
+"""지역명 표준화와 지명 사전(gazetteer).
+
+도/광역시, 시/군/구, 동네·핫플레이스 별칭(홍대, 성수, 동탄 등) → (광역, 시군구)를 모듈 import 시
+한 번 만들어 두고 모든 지역 처리에서 같이 쓴다.
+
+- normalize_region(raw): 저장용 문자열 ("서울 강남구", "경기 수원", "배송" ...). 기존 데이터와 같은 표기.
+- parse_region(raw): 같은 입력을 Region(province, city)로. 앞 단어로 알 수 없으면 문자열 전체에서
+  가장 긴 지명을 찾는다 ("홍대입구역 근처" → 서울 마포구).
+- normalize_regions(raws): 여러 개를 한 번에 (마이그레이션, 배치 저장용).
+- match_place(text): 임의의 텍스트(제목, 괄호 안 등)에서 가장 길고 구체적인 지명.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 import re
 
+from crawler import textmatch
+from crawler.memo import memoize
+from crawler.textmatch import PhraseIndex
+
+
+class Region(NamedTuple):
+    province: str  # 서울, 경기, ... (PROVINCES 중 하나)
+    city: Optional[str] = None  # 강남구, 수원, ... (normalize_region의 두 번째 단어 표기)
+
+    @property
+    def label(self) -> str:
+        return f"{self.province} {self.city}" if self.city else self.province
+
+
+# 표준 도/광역시 표기
+PROVINCES = ("서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주")
+_PROVINCE_SET = frozenset(PROVINCES)
+
+# 지역 정보가 아니라 그대로 두는 값
+SPECIAL_REGIONS = ("배송", "전국", "재택", "기자단")
+
+# 채널명 등이 지역으로 잘못 들어온 경우
+GARBAGE_KEYWORDS = (
+    "인스타", "클립", "블로그", "유튜브", "틱톡", "릴스", "쇼츠",
+    "구매평", "페이백", "기자단", "포토", "배송형", "체험형", "상품평", "인플루언서", "재택",
+)
+_GARBAGE_RE = re.compile("|".join(map(re.escape, GARBAGE_KEYWORDS)))
+
+# 도/광역시 별칭 → 표준 표기
+PROVINCE_ALIASES: Dict[str, str] = {
+    "서울특별시": "서울", "서울시": "서울",
+    "경기도": "경기",
+    "인천광역시": "인천", "인천시": "인천",
+    "부산광역시": "부산", "부산시": "부산",
+    "대구광역시": "대구", "대구시": "대구",
+    "광주광역시": "광주", "광주시": "광주",
+    "광주": "광주",  # 광주광역시 (경기 광주는 '경기 광주'나 '경기도 광주'로 들어옴)
+    "대전광역시": "대전", "대전시": "대전",
+    "울산광역시": "울산", "울산시": "울산",
+    "세종특별자치시": "세종", "세종시": "세종",
+    "강원도": "강원", "강원특별자치도": "강원",
+    "충청북도": "충북", "충북": "충북",
+    "충청남도": "충남", "충남": "충남",
+    "전라북도": "전북", "전북특별자치도": "전북", "전북": "전북",
+    "전라남도": "전남", "전남": "전남",
+    "경상북도": "경북", "경북": "경북",
+    "경상남도": "경남", "경남": "경남",
+    "제주도": "제주", "제주특별자치도": "제주", "제주시": "제주", "서귀포시": "제주",
+    "제주스냅": "제주",
+}
+
+
+def _cities(province: str, names: Iterable[str], suffix: str = "시") -> Dict[str, Region]:
+    """"수원", "수원시" → Region("경기", "수원")"""
+    return {alias: Region(province, name) for name in names for alias in (name, name + suffix)}
+
+
+def _districts(province: str, names: Iterable[str]) -> Dict[str, Region]:
+    """"강남", "강남구" → Region("서울", "강남구")"""
+    return {alias: Region(province, name + "구") for name in names for alias in (name, name + "구")}
+
+
+# 시/군/구와 동네 별칭 → Region. normalize_region이 앞 단어를 이 표기로 바꾼다 (도/광역시 누락 복구)
+CITY_ALIASES: Dict[str, Region] = {
+    **_cities("경기", [
+        "수원", "성남", "고양", "용인", "부천", "안산", "안양", "남양주", "화성", "평택", "의정부", "시흥",
+        "파주", "김포", "광명",
+    ]),
+    **_cities("경기", ["군포", "이천", "양주", "오산", "구리", "안성", "포천", "의왕", "하남"]),
+    **_cities("경기", ["가평", "양평"], suffix="군"),
+    "동탄": Region("경기", "화성"),
+    "분당": Region("경기", "성남"),
+
+    **_cities("충남", ["천안", "아산"]),
+    **_cities("충북", ["청주"]),
+    **_cities("전북", ["전주"]),
+    **_cities("경북", ["포항", "구미", "경주"]),
+    **_cities("경남", ["창원", "김해", "진주"]),
+    **_cities("강원", ["강릉", "원주", "춘천"]),
+
+    # 서울 주요 구/핫플레이스 (서울 누락 복구)
+    **_districts("서울", ["강남", "서초", "송파", "마포", "용산", "성동", "종로"]),
+    "중구": Region("서울", "중구"), "강서구": Region("서울", "강서구"),  # 부산 강서구도 있지만 서울 확률 높음
+    "영등포": Region("서울", "영등포"), "영등포구": Region("서울", "영등포"),
+    "홍대": Region("서울", "마포구"),
+    "강남역": Region("서울", "강남구"),
+    "신사": Region("서울", "강남구"),
+    "합정": Region("서울", "마포구"),
+    "명동": Region("서울", "중구"),
+    "성수": Region("서울", "성동구"),
+    "반포": Region("서울", "서초구"),
+    "당산": Region("서울", "영등포"),
+    "신촌": Region("서울", "서대문구"),
+}
+
+# parse_region / match_place에서만 쓰는 지명 (normalize_region의 저장 표기는 바꾸지 않음).
+# 사이트 제목의 [지역] 표기에 자주 나오는 곳들
+PLACE_ALIASES: Dict[str, Region] = {
+    **_districts("서울", [
+        "강동", "강북", "강서", "관악", "광진", "구로", "금천", "노원", "도봉", "동대문", "동작", "서대문",
+        "성북", "양천", "은평", "중랑",
+    ]),
+    **{name: Region("서울", "강남구") for name in ("압구정", "청담", "역삼", "선릉", "논현", "삼성역", "가로수길", "신논현")},
+    **{name: Region("서울", "마포구") for name in ("홍대입구", "상수", "망원", "연남", "공덕")},
+    **{name: Region("서울", "용산구") for name in ("이태원", "한남", "용리단길")},
+    **{name: Region("서울", "송파구") for name in ("잠실", "문정", "석촌", "방이")},
+    **{name: Region("서울", "종로구") for name in ("익선", "혜화", "대학로", "북촌", "서촌", "인사동", "광화문")},
+    **{name: Region("서울", "영등포") for name in ("여의도", "문래")},
+    **{name: Region("서울", "강서구") for name in ("마곡", "발산")},
+    **{name: Region("서울", "동작구") for name in ("사당", "노량진")},
+    "을지로": Region("서울", "중구"),
+    "건대": Region("서울", "광진구"),
+    "신림": Region("서울", "관악구"),
+    "가산": Region("서울", "금천구"),
+    "목동": Region("서울", "양천구"),
+    "천호": Region("서울", "강동구"),
+    "교대": Region("서울", "서초구"),
+
+    **_cities("경기", ["동두천", "여주"]),
+    **_cities("경기", ["연천"], suffix="군"),
+    "판교": Region("경기", "성남"),
+    "일산": Region("경기", "고양"),
+    "광교": Region("경기", "수원"),
+    "병점": Region("경기", "화성"),
+    "역곡": Region("경기", "부천"),
+
+    **_districts("인천", ["계양", "부평", "연수", "미추홀"]),
+    "송도": Region("인천", "연수구"),
+    **_districts("부산", ["해운대", "수영", "부산진", "사하", "금정"]),
+    "광안리": Region("부산", "수영구"),
+    "서면역": Region("부산", "부산진구"),
+    **_districts("대구", ["수성", "달서"]),
+    "동성로": Region("대구", "중구"),
+    **_districts("대전", ["유성"]),
+    "둔산": Region("대전", "서구"),
+
+    **_cities("충북", ["충주", "제천"]),
+    **_cities("충남", ["당진", "서산", "공주", "논산"]),
+    **_cities("전북", ["군산", "익산"]),
+    **_cities("전남", ["목포", "여수", "순천", "광양"]),
+    **_cities("경북", ["안동", "문경", "경산", "김천"]),
+    **_cities("경남", ["거제", "양산", "통영"]),
+    **_cities("강원", ["속초", "동해", "삼척"]),
+    **_cities("강원", ["양양", "평창"], suffix="군"),
+    "서귀포": Region("제주", "서귀포"),
+}
+
+# normalize_region의 앞 단어 매핑 (기존 저장 표기)
+_FIRST_WORD_MAP: Dict[str, str] = {
+    **PROVINCE_ALIASES,
+    **{alias: region.label for alias, region in CITY_ALIASES.items()},
+}
+
+# 전체 지명 사전: 별칭 → Region
+GAZETTEER = PhraseIndex({
+    **{province: Region(province) for province in PROVINCES},
+    **{alias: Region(province) for alias, province in PROVINCE_ALIASES.items()},
+    **PLACE_ALIASES,
+    **CITY_ALIASES,
+})
+
+
+@memoize("region", rules=(__file__, textmatch.__file__))
 def normalize_region(raw_region: Optional[str]) -> Optional[str]:
     """
     지역명을 표준화합니다.
@@ -15,135 +190,77 @@ def normalize_region(raw_region: Optional[str]) -> Optional[str]:
     region = raw_region.strip()
 
     # 1. 특수 케이스 처리
-    if region in ["배송", "전국", "재택", "기자단"]:
+    if region in SPECIAL_REGIONS:
         return region
-    
+
     # 2. 채널명 등 오염 데이터 필터링
-    garbage_keywords = [
-        "인스타", "클립", "블로그", "유튜브", "틱톡", "릴스", "쇼츠", 
-        "구매평", "페이백", "기자단", "포토", "배송형", "체험형", "상품평", "인플루언서", "재택"
-    ]
-    if any(k in region for k in garbage_keywords):
+    if _GARBAGE_RE.search(region):
         return None  # 지역 정보 아님
 
-    # 3. 구분자 통일 (슬래시 -> 공백)
+    # 3. 구분자 통일 (슬래시 -> 공백) 후 공백으로 분리
     # "경기/수원" -> "경기 수원"
-    region = region.replace("/", " ")
-    
-    # 4. 공백으로 분리
-    parts = region.split()
+    parts = region.replace("/", " ").split()
     if not parts:
         return None
 
+    # 4. 순서가 뒤집힌 경우 ("남구 대구", "달성군 대구"): 두 번째 단어가 도/광역시면 자리를 바꾼다
+    if len(parts) >= 2 and _FIRST_WORD_MAP.get(parts[1], parts[1]) in _PROVINCE_SET:
+        parts[0], parts[1] = parts[1], parts[0]
+
     # 5. 첫 번째 단어(도/광역시) 정규화
-    first = parts[0]
-    
-    # 매핑 테이블 (도/광역시 + 주요 도시 -> 도/광역시 포함 형태로)
-    province_map = {
-        # 도/광역시 정규화
-        "서울특별시": "서울", "서울시": "서울",
-        "경기도": "경기",
-        "인천광역시": "인천", "인천시": "인천",
-        "부산광역시": "부산", "부산시": "부산",
-        "대구광역시": "대구", "대구시": "대구",
-        "광주광역시": "광주", "광주시": "광주",
-        "대전광역시": "대전", "대전시": "대전",
-        "울산광역시": "울산", "울산시": "울산",
-        "세종특별자치시": "세종", "세종시": "세종",
-        "강원도": "강원", "강원특별자치도": "강원",
-        "충청북도": "충북", "충북": "충북",
-        "충청남도": "충남", "충남": "충남",
-        "전라북도": "전북", "전북특별자치도": "전북", "전북": "전북",
-        "전라남도": "전남", "전남": "전남",
-        "경상북도": "경북", "경북": "경북",
-        "경상남도": "경남", "경남": "경남",
-        "제주도": "제주", "제주특별자치도": "제주", "제주시": "제주", "서귀포시": "제주",
-        
-        # 주요 도시 -> 도/시 매핑 (prefix 누락된 경우 복구)
-        "수원": "경기 수원", "수원시": "경기 수원",
-        "성남": "경기 성남", "성남시": "경기 성남",
-        "고양": "경기 고양", "고양시": "경기 고양",
-        "용인": "경기 용인", "용인시": "경기 용인",
-        "부천": "경기 부천", "부천시": "경기 부천",
-        "안산": "경기 안산", "안산시": "경기 안산",
-        "안양": "경기 안양", "안양시": "경기 안양",
-        "남양주": "경기 남양주", "남양주시": "경기 남양주",
-        "화성": "경기 화성", "화성시": "경기 화성",
-        "평택": "경기 평택", "평택시": "경기 평택",
-        "의정부": "경기 의정부", "의정부시": "경기 의정부",
-        "시흥": "경기 시흥", "시흥시": "경기 시흥",
-        "파주": "경기 파주", "파주시": "경기 파주",
-        "김포": "경기 김포", "김포시": "경기 김포",
-        "광명": "경기 광명", "광명시": "경기 광명",
-        "광주": "광주", # 광주광역시 (경기 광주는 '경기 광주'로 들어오거나 '경기도 광주'로 들어옴)
-        "군포": "경기 군포", "군포시": "경기 군포",
-        "이천": "경기 이천", "이천시": "경기 이천",
-        "양주": "경기 양주", "양주시": "경기 양주",
-        "오산": "경기 오산", "오산시": "경기 오산",
-        "구리": "경기 구리", "구리시": "경기 구리",
-        "안성": "경기 안성", "안성시": "경기 안성",
-        "포천": "경기 포천", "포천시": "경기 포천",
-        "의왕": "경기 의왕", "의왕시": "경기 의왕",
-        "하남": "경기 하남", "하남시": "경기 하남",
-        "가평": "경기 가평", "가평군": "경기 가평",
-        "양평": "경기 양평", "양평군": "경기 양평",
-        "동탄": "경기 화성",
-        "분당": "경기 성남",
-        
-        "천안": "충남 천안", "천안시": "충남 천안",
-        "아산": "충남 아산", "아산시": "충남 아산",
-        "청주": "충북 청주", "청주시": "충북 청주",
-        "전주": "전북 전주", "전주시": "전북 전주",
-        "포항": "경북 포항", "포항시": "경북 포항",
-        "구미": "경북 구미", "구미시": "경북 구미",
-        "경주": "경북 경주", "경주시": "경북 경주",
-        "창원": "경남 창원", "창원시": "경남 창원",
-        "김해": "경남 김해", "김해시": "경남 김해",
-        "진주": "경남 진주", "진주시": "경남 진주",
-        "강릉": "강원 강릉", "강릉시": "강원 강릉",
-        "원주": "강원 원주", "원주시": "강원 원주",
-        "춘천": "강원 춘천", "춘천시": "강원 춘천",
-        
-        # 서울 주요 핫플레이스/구 (서울 누락 복구)
-        "강남": "서울 강남구", "강남구": "서울 강남구",
-        "서초": "서울 서초구", "서초구": "서울 서초구",
-        "송파": "서울 송파구", "송파구": "서울 송파구",
-        "마포": "서울 마포구", "마포구": "서울 마포구",
-        "용산": "서울 용산구", "용산구": "서울 용산구",
-        "성동": "서울 성동구", "성동구": "서울 성동구",
-        "종로": "서울 종로구", "종로구": "서울 종로구",
-        "중구": "서울 중구", "강서구": "서울 강서구", # 부산 강서구도 있지만 서울 확률 높음
-        "영등포": "서울 영등포", "영등포구": "서울 영등포",
-        "홍대": "서울 마포구", 
-        "강남역": "서울 강남구",
-        "신사": "서울 강남구",
-        "합정": "서울 마포구",
-        "명동": "서울 중구",
-        "성수": "서울 성동구",
-        "반포": "서울 서초구",
-        "당산": "서울 영등포",
-        "신촌": "서울 서대문구",
-        
-        "제주스냅": "제주",
-    }
-    
-    # 1. Reversed Case Detection (e.g., "남구 대구", "달성군 대구")
-    # If standard province is found at index 1, swap.
-    if len(parts) >= 2:
-        second_norm = province_map.get(parts[1], parts[1])
-        if second_norm in ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]:
-             # Swap parts
-             parts[0], parts[1] = parts[1], parts[0]
-             first = parts[0]
-
-    # 매핑 적용
-    normalized_first = province_map.get(first, first)
-    parts[0] = normalized_first
-    
+    parts[0] = _FIRST_WORD_MAP.get(parts[0], parts[0])
+
     # 다시 합치기 (최대 2단계까지만)
     # "경기 수원시 팔달구" -> "경기 수원시" (시/구 까지만)
     if len(parts) > 2:
         return f"{parts[0]} {parts[1]}"
-    
+
     # "경기 수원" -> "경기 수원"
     return " ".join(parts)
+
+
+def match_place(text: Optional[str]) -> Optional[Region]:
+    """텍스트에서 가장 길고 구체적인 지명.
+
+    도/광역시가 있으면 그 안의 시/군/구만 인정한다 ("[경기 광주]" → 경기, "부산 해운대" → 부산 해운대구).
+    """
+    if not text:
+        return None
+    matches = GAZETTEER.find_all(text)
+    province = next((region.province for _, _, region in matches if region.city is None), None)
+    best, best_len = None, 0
+    for start, end, region in matches:
+        if region.city and (province is None or region.province == province) and end - start > best_len:
+            best, best_len = region, end - start
+    return best or (Region(province) if province else None)
+
+
+def parse_region(raw_region: Optional[str]) -> Optional[Region]:
+    """normalize_region 결과를 Region(province, city)로. 지역이 아니거나(배송, 전국 등) 알 수 없으면 None."""
+    label = normalize_region(raw_region)
+    if not label or label in SPECIAL_REGIONS:
+        return None
+    province, _, rest = label.partition(" ")
+    if province not in _PROVINCE_SET:
+        return match_place(label)
+    if rest in _PROVINCE_SET:  # "경기 광주시" → "광주 경기"처럼 순서가 바뀐 경우는 원문에서 찾는다
+        return match_place(raw_region)
+    if not rest:
+        return Region(province)
+    # "서울 강남" → 서울 강남구, "경기 수원시" → 경기 수원
+    known = GAZETTEER.get(rest)
+    if known is not None and known.city and known.province == province:
+        return known
+    return Region(province, rest)
+
+
+def normalize_regions(raw_regions: Iterable[Optional[str]]) -> List[Tuple[Optional[str], Optional[Region]]]:
+    """여러 지역명을 한 번에 표준화. 입력 순서대로 (normalize_region 문자열, parse_region 결과)."""
+    done: Dict[Optional[str], Tuple[Optional[str], Optional[Region]]] = {}
+    results = []
+    for raw in raw_regions:
+        result = done.get(raw)
+        if result is None:
+            result = done[raw] = (normalize_region(raw), parse_region(raw))
+        results.append(result)
+    return results
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""제목 지역 추출 / 제목 정리 벤치마크
+
+1. 지역 추출: 사이트 파서가 쓰던 방식(대괄호마다 지역 키워드 목록을 차례로 `in` 검사, 처음 찾은 것)과
+   crawler.location.find_location(지명 사전 한 번 훑기, 가장 구체적이고 긴 지명)
+2. 제목 정리: 이전 stylec 방식(태그 패턴마다 re.sub 16번 + 지역 추출)과
+   crawler.title.parse_title(대괄호를 한 번 잘라 분류, 지역까지 함께)
+
+- 제목: 크롤러 결과 JSON(crawler/output/campaigns_*.json 또는 --input)의 제목 + 가짜 제목
+- 호출당 평균 시간과, 두 방식의 결과가 다른 제목 몇 개를 보여준다
+
+실행 방법:
+    python -m crawler.scripts.bench_location
+    python -m crawler.scripts.bench_location --titles 200000 --input crawler/output/campaigns_20250113_120000.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from crawler.location import find_location
+from crawler.region import GAZETTEER
+from crawler.title import CHANNEL, PLATFORM, parse_title
+
+# 이전 stylec 파서의 LOCATION_KEYWORDS (비교용)
+LEGACY_KEYWORDS = [
+    "전국",
+    "서울", "강남", "홍대", "이태원", "신촌", "명동", "종로", "압구정", "청담",
+    "잠실", "건대", "신림", "영등포", "마포", "용산", "송파", "강서", "강동",
+    "노원", "도봉", "중랑", "성북", "동대문", "성동", "광진", "서초", "관악",
+    "선릉", "역삼", "삼성", "논현", "신사", "가로수길", "합정", "상수", "망원",
+    "마곡", "가산", "구로", "금천", "목동", "양천", "강북", "은평", "서대문",
+    "경기", "수원", "성남", "용인", "고양", "화성", "부천", "안산", "안양",
+    "평택", "시흥", "파주", "김포", "광명", "군포", "오산", "이천", "양주",
+    "의왕", "하남", "위례", "판교", "분당", "일산", "동탄", "동두천", "의정부",
+    "남양주", "구리", "광주",
+    "부산", "대구", "인천", "광주", "대전", "울산", "세종",
+    "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주",
+    "천안", "청주", "전주", "포항", "창원", "진주", "춘천", "원주", "강릉",
+]
+
+# 이전 stylec._clean_title의 제거 패턴 (비교용)
+LEGACY_TAG_PATTERNS = [
+    r"\[네이버\s*블로그[^\]]*\]", r"\[네이버\s*클립[^\]]*\]", r"\[인스타그램[^\]]*\]", r"\[인스타\s*릴스[^\]]*\]",
+    r"\[유튜브[^\]]*\]", r"\[유튜브\s*쇼츠[^\]]*\]", r"\[틱톡[^\]]*\]", r"\[쿠팡[^\]]*\]", r"\[스마트스토어[^\]]*\]",
+    r"\[스스[^\]]*\]", r"\[blog[^\]]*\]", r"\[미션형\s*체험단[^\]]*\]", r"\[현금캐시백[^\]]*\]", r"\[현금페이백[^\]]*\]",
+    r"\[푸드앳홈[^\]]*\]", r"\[방문\s*포장[^\]]*\]", r"\[1만캐시\s*지급[^\]]*\]",
+]
+
+BRANDS = ["레드버튼", "피자알볼로", "도원센트럴", "OO헤어", "스시한", "라멘집", "카페 모먼트", "필라테스"]
+CHANNELS = ["블로그", "인스타 릴스", "클립", "유튜브 쇼츠", "네이버 블로그/12월3주", "쿠팡 구매평", "현금페이백"]
+PLACES = [alias for alias, _ in GAZETTEER.items()] + ["전국", "위례"]
+
+
+def legacy_extract(title: str):
+    for match in re.findall(r"\[([^\]]+)\]", title):
+        for keyword in LEGACY_KEYWORDS:
+            if keyword in match:
+                return keyword
+    for keyword in LEGACY_KEYWORDS:
+        if keyword in title:
+            return keyword
+    return None
+
+
+def current_extract(title: str):
+    match = find_location(title)
+    return match.keyword if match else None
+
+
+def legacy_title(title: str):
+    cleaned = title
+    for pattern in LEGACY_TAG_PATTERNS:
+        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    return cleaned or title, legacy_extract(title)
+
+
+def current_title(title: str):
+    parts = parse_title(title, drop=(CHANNEL, PLATFORM))
+    return parts.title, parts.location.keyword if parts.location else None
+
+
+def synthetic_titles(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        place = rng.choice(PLACES)
+        brand = rng.choice(BRANDS)
+        shape = rng.randrange(4)
+        if shape == 0:
+            titles.append(f"[{rng.choice(CHANNELS)}] [{place}] {brand} 체험단 모집")
+        elif shape == 1:
+            titles.append(f"[{brand} {place}점] 신메뉴 리뷰")
+        elif shape == 2:
+            titles.append(f"{place} {brand} 방문 후기")
+        else:
+            titles.append(f"[{rng.choice(CHANNELS)}] {brand} 제품 체험")
+    return titles
+
+
+def recorded_titles(paths) -> list:
+    titles = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            titles += [item["title"] for item in json.load(f) if item.get("title")]
+    return titles
+
+
+def timed(fn, titles) -> tuple:
+    start = time.perf_counter()
+    results = [fn(t) for t in titles]
+    return results, (time.perf_counter() - start) / max(len(titles), 1) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark title location extraction and title cleaning")
+    parser.add_argument("--titles", type=int, default=100000, help="가짜 제목 수")
+    parser.add_argument("--input", action="append", default=None, help="크롤러 결과 JSON (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    paths = args.input or sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "output", "campaigns_*.json")))
+    titles = recorded_titles(paths) + synthetic_titles(args.titles)
+    print(f"제목 {len(titles)}개 ({len(paths)}개 파일 + 가짜 {args.titles}개), 지명 {len(PLACES)}개")
+
+    for label, old_fn, new_fn, new_name in (
+        ("지역 추출", legacy_extract, current_extract, "find_location"),
+        ("제목 정리 + 지역", legacy_title, current_title, "parse_title"),
+    ):
+        legacy, legacy_us = timed(old_fn, titles)
+        current, current_us = timed(new_fn, titles)
+        print(f"\n{label}")
+        print(f"  이전 방식:     {legacy_us:.2f}µs/제목")
+        print(f"  {new_name + ':':<14} {current_us:.2f}µs/제목 ({legacy_us / max(current_us, 1e-9):.1f}배)")
+
+        diffs = [(t, old, new) for t, old, new in zip(titles, legacy, current) if old != new]
+        print(f"  결과가 다른 제목 {len(diffs)}개 (예시):")
+        for title, old, new in diffs[:8]:
+            print(f"    {title!r}: {old} -> {new}")
+
+
+if __name__ == "__main__":
+    main()
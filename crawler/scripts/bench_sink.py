@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""저장소(sink) 쓰기 경로 벤치마크
+
+Supabase 없이 로컬 저장소(기본: 임시 SQLite 파일)에 가짜 캠페인 N개를 저장하며
+실제 크롤러와 같은 공통 계층(BatchWriter, content_hash 변경 감지, 마감 정리, sweep)의 처리량을 잰다.
+
+실행 방법:
+    python -m crawler.scripts.bench_sink --rows 100000
+    python -m crawler.scripts.bench_sink --rows 100000 --sink jsonl:/tmp/campaigns.jsonl
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from crawler.models import Campaign
+from crawler.sinks import open_sink
+from crawler.utils import _campaign_to_supabase_dict
+from crawler.writer import BatchWriter
+
+SOURCES = ["dinnerqueen", "chuble", "dinodan", "real_review"]
+URL_PATTERNS = {
+    "dinnerqueen": "https://dinnerqueen.net/taste/{}",
+    "chuble": "https://chuble.net/campaign/{}",
+    "dinodan": "https://dinodan.co.kr/campaign/{}",
+    "real_review": "https://www.real-review.kr/campaign/{}",
+}
+
+
+def make_rows(n: int, version: int = 0) -> list:
+    """가짜 캠페인 행 n개 (version이 바뀌면 10%의 행 내용이 바뀐다)."""
+    today = date.today()
+    rows = []
+    for i in range(n):
+        source = SOURCES[i % len(SOURCES)]
+        changed = version and i % 10 == 0
+        campaign = Campaign(
+            title=f"캠페인 {i}{' (수정)' if changed else ''}",
+            url=URL_PATTERNS[source].format(100000 + i),
+            site_name=source,
+            category="맛집",
+            deadline=(today + timedelta(days=i % 30 - 5)).isoformat(),
+            location="서울 강남구",
+            recruit_count=5,
+        )
+        rows.append(_campaign_to_supabase_dict(campaign))
+    return rows
+
+
+def timed(label: str, fn):
+    start = time.monotonic()
+    result = fn()
+    print(f"  {label}: {time.monotonic() - start:.2f}초")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the campaign write path on a local sink")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--sink", default=None, help="sqlite[:path] (default: temp file) or jsonl[:path]")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    spec = args.sink or f"sqlite:{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}"
+    sink = open_sink(spec)
+    print("=" * 60)
+    print(f"저장소 벤치마크: {spec}, {args.rows}행")
+    print("=" * 60)
+
+    rows = timed("행 생성 (정규화 + content_hash)", lambda: make_rows(args.rows))
+
+    def write(rows, known_hashes=None):
+        writer = BatchWriter(
+            chunk_size=args.chunk_size, max_in_flight=args.workers, upsert=sink.upsert_rows,
+            known_hashes=known_hashes, rejected_errors=sink.rejected_errors,
+        )
+        writer.submit(rows)
+        return writer.close()
+
+    print("\n1. 최초 저장")
+    stats = timed("upsert", lambda: write(rows))
+    print(f"  {stats.summary()}")
+
+    print("\n2. 재실행 (10% 변경, content_hash 비교)")
+    hashes = timed("content_hash 로드", lambda: sink.load_content_hashes(SOURCES))
+    stats = timed("upsert", lambda: write(make_rows(args.rows, version=1), hashes))
+    print(f"  {stats.summary()}")
+
+    print("\n3. 기존 ID 인덱스")
+    index = timed("로드", lambda: sink.load_source_ids(SOURCES))
+    print(f"  {len(index)}개, 약 {index.memory_bytes() / 1024:.0f}KB")
+
+    print("\n4. 마감 정리")
+    expired = timed("expire", lambda: sink.expire(date.today(), {"real_review": 7}))
+    print(f"  {expired}개 비활성화")
+
+    print("\n5. 사라진 캠페인 정리 (dinnerqueen 목록의 90%만 봤다고 가정)")
+    seen = [r["source_id"] for r in rows if r["source"] == "dinnerqueen"]
+    seen = seen[: len(seen) * 9 // 10]
+    swept = timed("sweep", lambda: sink.sweep("dinnerqueen", int(time.time()), seen))
+    print(f"  {swept if swept is not None else '지원하지 않음'}")
+
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
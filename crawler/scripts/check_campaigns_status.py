@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """캠페인 저장 현황 확인 스크립트"""
 
-import os
 import sys
 from pathlib import Path
 
@@ -9,22 +8,15 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from dotenv import load_dotenv
-from supabase import create_client
+# 공유 Supabase 클라이언트 (환경 변수는 crawler.utils가 .env.local / .env에서 로드)
+from crawler.utils import get_supabase_client
 
-# .env.local 파일 로드
-env_file = project_root / ".env.local"
-load_dotenv(env_file)
+client = get_supabase_client()
 
-url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not url or not key:
+if client is None:
     print("❌ 환경 변수가 설정되지 않았습니다.")
     sys.exit(1)
 
-client = create_client(url, key)
-
 print("=" * 60)
 print("전체 캠페인 현황")
 print("=" * 60)
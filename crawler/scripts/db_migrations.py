@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""크롤러용 campaigns 인덱스 / DB 함수 버전 관리 마이그레이션
+
+크롤러가 매 실행마다 보내는 쿼리를 받쳐 주는 인덱스와 DB 함수를 버전 순서대로 적용한다.
+
+- 001 content_hash 컬럼 (변경 없는 캠페인 저장 생략)
+- 002 마감 캠페인 일괄 비활성화 함수 expire_campaigns + 활성 캠페인 마감일 부분 인덱스
+- 003 crawl_generation 컬럼 + 목록에서 사라진 캠페인 비활성화 함수 sweep_campaigns
+- 004 source별 활성 캠페인 부분 인덱스 (마감 정리 fallback, hide 스크립트, content_hash 로드)
+- 005 활성 캠페인 content_hash keyset 조회 함수 campaign_content_hashes
+- 006 sweep_campaigns 재정의: 이번 목록에 있던 캠페인은 다시 활성화
+
+적용된 버전은 crawler_schema_migrations 테이블에 기록한다.
+Supabase Python 클라이언트는 DDL을 실행할 수 없으므로, 직접 적용하려면 Postgres 접속 문자열
+(SUPABASE_DB_URL 또는 DATABASE_URL)과 psycopg(3) 또는 psycopg2가 필요하다.
+둘 중 하나라도 없으면 적용할 SQL을 출력하므로 Supabase SQL Editor에서 실행하면 된다.
+
+실행 방법:
+    python -m crawler.scripts.db_migrations status
+    python -m crawler.scripts.db_migrations apply
+    python -m crawler.scripts.db_migrations sql            # SQL Editor용 출력
+    python -m crawler.scripts.db_migrations sql --from 4   # 004부터
+"""
+
+import argparse
+import os
+import sys
+from typing import List, NamedTuple, Optional, Set
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# 환경 변수는 crawler.utils가 .env.local / .env에서 로드
+import crawler.utils  # noqa: F401
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    sql: str
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "content_hash", """
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN campaigns.content_hash IS '크롤러가 계산한 캠페인 내용 해시 (변경 없는 캠페인 저장 생략용)';
+"""),
+    Migration(2, "expire_campaigns", """
+-- 활성 캠페인 중 마감일 기준 조회용
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_deadline
+ON campaigns(application_deadline)
+WHERE is_active = true;
+
+-- p_today: 기준 날짜 (이 날짜 이전 마감은 만료)
+-- p_grace_days: 마감일을 추정하는 source별 유예 일수 (예: {"modan": 7, "real_review": 7})
+CREATE OR REPLACE FUNCTION expire_campaigns(p_today DATE, p_grace_days JSONB DEFAULT '{}'::jsonb)
+RETURNS INTEGER AS $$
+DECLARE
+  affected INTEGER;
+BEGIN
+  UPDATE campaigns
+  SET is_active = false,
+      updated_at = NOW()
+  WHERE is_active = true
+    AND application_deadline IS NOT NULL
+    AND application_deadline < p_today - COALESCE((p_grace_days ->> source)::INTEGER, 0);
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION expire_campaigns(DATE, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION expire_campaigns(DATE, JSONB) TO service_role;
+"""),
+    Migration(3, "sweep_campaigns", """
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS crawl_generation BIGINT;
+
+COMMENT ON COLUMN campaigns.crawl_generation IS '이 캠페인을 마지막으로 목록에서 본 크롤러 실행 세대';
+
+-- p_seen_ids에 없는 p_source의 활성 캠페인을 비활성화 (p_max_ratio를 넘으면 아무것도 바꾸지 않고 오류)
+CREATE OR REPLACE FUNCTION sweep_campaigns(
+  p_source TEXT,
+  p_generation BIGINT,
+  p_seen_ids TEXT[],
+  p_max_ratio REAL DEFAULT 0.5
+)
+RETURNS INTEGER AS $$
+DECLARE
+  active_count INTEGER;
+  stale_count INTEGER;
+  affected INTEGER;
+BEGIN
+  UPDATE campaigns
+  SET crawl_generation = p_generation
+  WHERE source = p_source
+    AND source_id = ANY(p_seen_ids);
+
+  SELECT COUNT(*), COUNT(*) FILTER (WHERE crawl_generation IS DISTINCT FROM p_generation)
+  INTO active_count, stale_count
+  FROM campaigns
+  WHERE source = p_source AND is_active = true;
+
+  IF active_count > 0 AND stale_count > active_count * p_max_ratio THEN
+    RAISE EXCEPTION 'sweep_campaigns(%): 활성 캠페인 %개 중 %개를 비활성화하게 되어 중단 (한도 %)',
+      p_source, active_count, stale_count, p_max_ratio;
+  END IF;
+
+  UPDATE campaigns
+  SET is_active = false,
+      updated_at = NOW()
+  WHERE source = p_source
+    AND is_active = true
+    AND crawl_generation IS DISTINCT FROM p_generation;
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION sweep_campaigns(TEXT, BIGINT, TEXT[], REAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION sweep_campaigns(TEXT, BIGINT, TEXT[], REAL) TO service_role;
+"""),
+    Migration(4, "active_source_indexes", """
+-- 마감 정리 fallback(source별 필터 update), hide 스크립트(source + is_active),
+-- sweep_campaigns의 활성 캠페인 집계: 활성 캠페인만 source, 마감일 순으로
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_source_deadline
+ON campaigns(source, application_deadline)
+WHERE is_active = true;
+
+-- content_hash 로드(source별 source_id keyset): 활성 캠페인만, 테이블을 읽지 않는 index-only scan
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_source_hash
+ON campaigns(source, source_id) INCLUDE (content_hash)
+WHERE is_active = true;
+
+ANALYZE campaigns;
+"""),
+    Migration(5, "campaign_content_hashes", """
+-- 활성 캠페인의 source_id, content_hash를 source_id 순으로 p_after 다음부터 p_limit개
+CREATE OR REPLACE FUNCTION campaign_content_hashes(p_source TEXT, p_after TEXT DEFAULT NULL, p_limit INTEGER DEFAULT 1000)
+RETURNS TABLE(source_id TEXT, content_hash TEXT) AS $$
+  SELECT c.source_id, c.content_hash
+  FROM campaigns c
+  WHERE c.source = p_source
+    AND c.is_active = true
+    AND (p_after IS NULL OR c.source_id > p_after)
+  ORDER BY c.source_id
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+REVOKE EXECUTE ON FUNCTION campaign_content_hashes(TEXT, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION campaign_content_hashes(TEXT, TEXT, INTEGER) TO service_role;
+"""),
+    Migration(6, "sweep_reactivate_seen", """
+-- 잘못 정리·마감된 캠페인이 목록에 돌아오면 mark 단계에서 다시 활성화한다
+-- (incremental 모드는 이미 저장된 캠페인을 다시 upsert하지 않으므로 여기서만 되살릴 수 있다)
+CREATE OR REPLACE FUNCTION sweep_campaigns(
+  p_source TEXT,
+  p_generation BIGINT,
+  p_seen_ids TEXT[],
+  p_max_ratio REAL DEFAULT 0.5
+)
+RETURNS INTEGER AS $$
+DECLARE
+  active_count INTEGER;
+  stale_count INTEGER;
+  affected INTEGER;
+BEGIN
+  UPDATE campaigns
+  SET crawl_generation = p_generation,
+      is_active = true,
+      updated_at = CASE WHEN is_active THEN updated_at ELSE NOW() END
+  WHERE source = p_source
+    AND source_id = ANY(p_seen_ids);
+
+  SELECT COUNT(*), COUNT(*) FILTER (WHERE crawl_generation IS DISTINCT FROM p_generation)
+  INTO active_count, stale_count
+  FROM campaigns
+  WHERE source = p_source AND is_active = true;
+
+  IF active_count > 0 AND stale_count > active_count * p_max_ratio THEN
+    RAISE EXCEPTION 'sweep_campaigns(%): 활성 캠페인 %개 중 %개를 비활성화하게 되어 중단 (한도 %)',
+      p_source, active_count, stale_count, p_max_ratio;
+  END IF;
+
+  UPDATE campaigns
+  SET is_active = false,
+      updated_at = NOW()
+  WHERE source = p_source
+    AND is_active = true
+    AND crawl_generation IS DISTINCT FROM p_generation;
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION sweep_campaigns(TEXT, BIGINT, TEXT[], REAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION sweep_campaigns(TEXT, BIGINT, TEXT[], REAL) TO service_role;
+"""),
+]
+
+_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS crawler_schema_migrations (
+  version INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+
+def connect(url: Optional[str] = None):
+    """Postgres 직접 연결 (psycopg 3 → psycopg2 순). 접속 문자열이나 드라이버가 없으면 None."""
+    url = url or os.environ.get("SUPABASE_DB_URL") or os.environ.get("DATABASE_URL")
+    if not url:
+        return None
+    try:
+        import psycopg
+        return psycopg.connect(url)
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+        return psycopg2.connect(url)
+    except ImportError:
+        return None
+
+
+def applied_versions(conn) -> Set[int]:
+    with conn.cursor() as cur:
+        cur.execute(_VERSION_TABLE)
+        cur.execute("SELECT version FROM crawler_schema_migrations")
+        versions = {row[0] for row in cur.fetchall()}
+    conn.commit()
+    return versions
+
+
+def apply(conn, migration: Migration) -> None:
+    """마이그레이션 하나를 버전 기록과 함께 한 트랜잭션으로 적용."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(migration.sql)
+            cur.execute(
+                "INSERT INTO crawler_schema_migrations (version, name) VALUES (%s, %s)",
+                (migration.version, migration.name),
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def print_sql(migrations: List[Migration]) -> None:
+    print(_VERSION_TABLE.strip())
+    for m in migrations:
+        print(f"\n-- {m.version:03d} {m.name}")
+        print(m.sql.strip())
+        print(f"INSERT INTO crawler_schema_migrations (version, name) VALUES ({m.version}, '{m.name}') ON CONFLICT DO NOTHING;")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply versioned crawler indexes and database functions")
+    parser.add_argument("command", choices=["status", "apply", "sql"])
+    parser.add_argument("--from", dest="from_version", type=int, default=1, help="이 버전부터 (sql)")
+    parser.add_argument("--db-url", default=None, help="Postgres 접속 문자열 (기본: SUPABASE_DB_URL / DATABASE_URL)")
+    args = parser.parse_args()
+
+    conn = connect(args.db_url)
+    try:
+        done = applied_versions(conn) if conn is not None else None
+
+        if args.command == "status":
+            if done is None:
+                print("⚠️  DB에 직접 연결할 수 없어 적용 여부를 알 수 없습니다 (SUPABASE_DB_URL, psycopg 확인).")
+            for m in MIGRATIONS:
+                mark = "?" if done is None else ("✅" if m.version in done else "⏳")
+                print(f"  {mark} {m.version:03d} {m.name}")
+            return
+
+        if args.command == "sql" or conn is None:
+            if args.command == "apply":
+                print("⚠️  DB에 직접 연결할 수 없습니다 (SUPABASE_DB_URL, psycopg 확인).")
+                print("다음 SQL을 Supabase SQL Editor에서 실행하세요:\n")
+            pending = [m for m in MIGRATIONS if m.version >= args.from_version and (done is None or m.version not in done)]
+            print_sql(pending)
+            return
+
+        pending = [m for m in MIGRATIONS if m.version not in done]
+        if not pending:
+            print("✅ 적용할 마이그레이션이 없습니다.")
+            return
+        for m in pending:
+            print(f"적용 중: {m.version:03d} {m.name}")
+            apply(conn, m)
+        print(f"✅ {len(pending)}개 적용 완료")
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
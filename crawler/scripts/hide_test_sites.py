@@ -6,13 +6,11 @@
 
 import os
 import sys
-from dotenv import load_dotenv
-from supabase import create_client
 
 # 상위 디렉토리를 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from crawler.utils import logger
+from crawler.utils import get_supabase_client, logger
 
 # 테스트 중인 사이트 (활성화 유지)
 TESTING_SITES = [
@@ -50,24 +48,15 @@ ALL_SITES_TO_HIDE = NEW_SITES_TO_HIDE + RISKY_SITES + REPLACED_SITES
 def hide_campaigns():
     """테스트 중이 아닌 사이트들의 캠페인을 is_active=false로 업데이트."""
     
-    # 환경 변수 로드
-    env_path = os.path.join(os.path.dirname(__file__), "..", "..", ".env.local")
-    if not os.path.exists(env_path):
-        env_path = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
+    # 공유 클라이언트 (환경 변수는 crawler.utils가 .env.local / .env에서 로드)
+    supabase = get_supabase_client()
     
-    load_dotenv(env_path)
-    
-    supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    if not supabase_url or not supabase_key:
+    if supabase is None:
         logger.error("Supabase 환경 변수가 설정되지 않았습니다.")
         logger.error("NEXT_PUBLIC_SUPABASE_URL와 SUPABASE_SERVICE_ROLE_KEY를 확인해주세요.")
         return
     
     try:
-        supabase = create_client(supabase_url, supabase_key)
-        
         total_hidden = 0
         
         for site in ALL_SITES_TO_HIDE:
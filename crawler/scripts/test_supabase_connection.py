@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Supabase 연결 테스트 스크립트"""
 
-import os
 import sys
 from pathlib import Path
 
@@ -9,29 +8,23 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from dotenv import load_dotenv
-from supabase import create_client
-
-# .env.local 파일 로드
-env_file = project_root / ".env.local"
-load_dotenv(env_file)
+# 공유 Supabase 클라이언트 (환경 변수는 crawler.utils가 .env.local / .env에서 로드)
+from crawler.utils import get_supabase_client
 
 print("=" * 60)
 print("Supabase 연결 테스트")
 print("=" * 60)
 
-url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+print(f"\n1. 클라이언트 생성 중...")
+client = get_supabase_client()
 
-if not url or not key:
+if client is None:
     print("❌ 환경 변수가 설정되지 않았습니다.")
     sys.exit(1)
 
+print("   ✅ 클라이언트 생성 성공")
+
 try:
-    print(f"\n1. 클라이언트 생성 중...")
-    client = create_client(url, key)
-    print("   ✅ 클라이언트 생성 성공")
-    
     print(f"\n2. campaigns 테이블 쿼리 테스트...")
     result = client.table("campaigns").select("id").limit(1).execute()
     print(f"   ✅ 쿼리 성공! ({len(result.data)}개 행 반환)")
@@ -4,7 +4,6 @@
 Supabase campaigns 테이블에 새 사이트들(stylec, modan 등)을 추가합니다.
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -12,27 +11,20 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from dotenv import load_dotenv
-from supabase import create_client
-
-# .env.local 파일 로드
-env_file = project_root / ".env.local"
-load_dotenv(env_file)
+# 공유 Supabase 클라이언트 (환경 변수는 crawler.utils가 .env.local / .env에서 로드)
+from crawler.utils import get_supabase_client
 
 print("=" * 60)
 print("데이터베이스 Source 제약 조건 업데이트")
 print("=" * 60)
 
-url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+client = get_supabase_client()
 
-if not url or not key:
+if client is None:
     print("❌ 환경 변수가 설정되지 않았습니다.")
     sys.exit(1)
 
 try:
-    client = create_client(url, key)
-    
     # SQL 파일 읽기
     sql_file = project_root / "docs" / "supabase-add-new-sites.sql"
     if not sql_file.exists():
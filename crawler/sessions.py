@@ -0,0 +1,148 @@
+"""프로세스 전역 HTTP 세션 레지스트리.
+
+호스트마다 keep-alive 커넥션 풀을 가진 `requests.Session`을 하나씩 만들어 공유한다.
+같은 호스트의 2페이지 이후 요청이나 수백 개의 상세 페이지 요청이 매번
+TCP + TLS 핸드셰이크를 새로 하지 않도록 하기 위함이다.
+
+- 사이트 크롤러, 상세 페이지 보강(extract_detail_info), 카테고리별 ThreadPoolExecutor
+  크롤러가 모두 같은 세션을 재사용한다 (requests.Session의 커넥션 풀은 스레드 안전).
+- 모듈마다 복사되어 있던 User-Agent / Accept 헤더는 DEFAULT_HEADERS로 통합했다.
+- brotli 패키지가 설치되어 있으면 br 압축도 협상한다.
+- 모든 네트워크 요청은 crawler.ratelimit의 호스트별 속도 제한을 거친다.
+- cache_ttl을 넘기면 crawler.http_cache의 디스크 캐시를 거친다 (TTL 안이면 재사용, 지나면 304 재검증).
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from crawler import ratelimit
+from crawler.http_cache import CachedResponse, cache_key, get_cache
+
+# 호스트별 커넥션 풀 크기 (호스트별 최대 동시 요청 수(ratelimit.MAX_CONCURRENCY)와 같다)
+POOL_SIZE = int(os.environ.get("CRAWLER_HTTP_POOL_SIZE", "16"))
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def _accept_encoding() -> str:
+    """설치된 디코더에 맞는 Accept-Encoding 값."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Accept-Encoding": _accept_encoding(),
+}
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+
+
+def _host_of(url_or_host: str) -> str:
+    if "://" in url_or_host:
+        return urlsplit(url_or_host).netloc
+    return url_or_host
+
+
+def get_session(url_or_host: str) -> requests.Session:
+    """호스트 전용 keep-alive 세션 반환 (없으면 생성)."""
+    host = _host_of(url_or_host)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def _cached_response(entry: CachedResponse, url: str, status: str) -> requests.Response:
+    """캐시 항목을 requests.Response로 감싼다 (X-Crawler-Cache 헤더로 출처 표시)."""
+    res = requests.Response()
+    res.status_code = 200
+    res._content = entry.body
+    res.url = url
+    res.encoding = entry.encoding
+    res.headers = CaseInsensitiveDict({"Content-Type": entry.content_type or "", "X-Crawler-Cache": status})
+    return res
+
+
+def _limited_get(url: str, **kwargs) -> requests.Response:
+    """호스트별 속도 제한 안에서 GET 요청 (응답 상태를 제한기에 알린다)."""
+    with ratelimit.limit(url) as outcome:
+        res = get_session(url).get(url, **kwargs)
+        outcome.record(res.status_code, res.headers.get("Retry-After"))
+    return res
+
+
+def get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10,
+    cache_ttl: Optional[float] = None,
+    **kwargs,
+) -> requests.Response:
+    """공유 세션으로 GET 요청 (requests.get과 같은 사용법).
+
+    cache_ttl(초)을 지정하면 디스크 캐시를 사용한다. 0이면 항상 조건부 요청으로 재검증한다.
+    """
+    cache = get_cache() if cache_ttl is not None else None
+    if cache is None:
+        return _limited_get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+
+    key = cache_key(url, params)
+    entry = cache.get(key)
+    if entry is not None and entry.is_fresh(cache_ttl):
+        cache.touch(key)
+        cache.stats.add(hits=1, bytes_saved=len(entry.body))
+        return _cached_response(entry, url, "hit")
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.validators())
+    res = _limited_get(url, params=params, headers=request_headers, timeout=timeout, **kwargs)
+
+    if res.status_code == 304 and entry is not None:
+        cache.touch(key, refreshed=True)
+        cache.stats.add(revalidated=1, bytes_saved=len(entry.body))
+        return _cached_response(entry, res.url, "revalidated")
+
+    cache.stats.add(misses=1)
+    etag = res.headers.get("ETag")
+    last_modified = res.headers.get("Last-Modified")
+    # 재사용(TTL)이나 재검증(검증자) 중 하나라도 가능한 응답만 저장
+    if res.status_code == 200 and (cache_ttl > 0 or etag or last_modified):
+        cache.put(key, res.content, res.encoding, res.headers.get("Content-Type"), etag, last_modified)
+    return res
+
+
+def close_sessions() -> None:
+    """모든 세션의 커넥션을 닫는다 (실행 종료 시)."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,367 @@
+"""캠페인 저장소(sink) 인터페이스와 구현.
+
+크롤러의 쓰기 경로(기존 ID 조회, 변경 감지용 해시 조회, upsert, 마감 정리, 사라진 캠페인 정리)를
+저장소 하나의 인터페이스로 묶는다. 배치·재시도(crawler.writer), 변경 감지(content_hash),
+중복 제거(crawler.pipeline)는 공통 계층에 있고, 저장소는 아래 연산만 구현한다.
+
+- SupabaseSink: 운영 저장소 (campaigns 테이블, DB 함수 expire_campaigns / sweep_campaigns)
+- SqliteSink: 로컬 SQLite 파일. campaigns와 같은 UNIQUE(source, source_id)와 같은 정리 규칙을 가진다.
+  Supabase 없이 쓰기 경로를 측정·부하 테스트할 때 사용한다.
+- JsonlSink: upsert한 행을 JSONL로 이어 쓰는 기록용 저장소 (정리 연산은 지원하지 않음)
+
+`open_sink("supabase" | "sqlite[:경로]" | "jsonl[:경로]" | "none")`로 연다 (CLI --sink, 환경 변수 CRAWLER_SINK).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Type
+
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
+
+from crawler.source_index import ALL_SOURCES, SourceIdIndex, load_content_hashes, load_source_id_index
+from crawler.utils import cache_dir, get_supabase_client, logger, run_supabase, upsert_campaign_rows
+
+# sweep에서 활성 캠페인 중 이 비율을 넘게 비활성화하게 되면 중단 (사이트 개편 등 대비)
+SWEEP_MAX_RATIO = 0.5
+
+# campaigns 행 컬럼 (crawler.utils._campaign_to_supabase_dict와 같은 순서)
+COLUMNS = (
+    "source", "source_id", "title", "description", "source_url", "thumbnail_url", "category", "region",
+    "type", "channel", "reward", "reward_value", "capacity", "application_deadline", "review_deadline_days",
+    "recruit_count", "applicant_count", "selection_rate", "is_active", "content_hash",
+)
+
+
+class CampaignSink(ABC):
+    """캠페인 저장소.
+
+    upsert_rows는 여러 스레드(BatchWriter)에서 동시에 호출될 수 있다.
+    rejected_errors는 "이 행들은 저장할 수 없다"는 뜻의 예외로, BatchWriter가 chunk를 나눠 문제 행을 골라낸다.
+    """
+
+    name = "sink"
+    rejected_errors: Tuple[Type[BaseException], ...] = ()
+
+    @abstractmethod
+    def load_source_ids(self, sources: Sequence[str] = ALL_SOURCES) -> SourceIdIndex:
+        """저장된 (source, source_id) 인덱스."""
+
+    @abstractmethod
+    def load_content_hashes(self, sources: Sequence[str] = ALL_SOURCES) -> Dict[Tuple[str, str], str]:
+        """활성 캠페인의 (source, source_id) → content_hash."""
+
+    @abstractmethod
+    def upsert_rows(self, rows: Sequence[dict]) -> None:
+        """행들을 (source, source_id) 기준으로 upsert. 실패하면 예외."""
+
+    @abstractmethod
+    def expire(self, today: date, grace_days: Mapping[str, int]) -> int:
+        """마감일이 지난 활성 캠페인을 비활성화하고 개수를 반환 (grace_days: source별 유예 일수)."""
+
+    @abstractmethod
+    def sweep(self, source: str, generation: int, seen_ids: Sequence[str], max_ratio: float = SWEEP_MAX_RATIO) -> Optional[int]:
+        """seen_ids에 세대 표시(비활성이었으면 다시 활성화) 후 source의 나머지 활성 캠페인을 비활성화. 지원하지 않으면 None."""
+
+    def close(self) -> None:
+        pass
+
+
+class SupabaseSink(CampaignSink):
+    """Supabase campaigns 테이블 (공유 클라이언트 사용)."""
+
+    name = "supabase"
+    rejected_errors = (APIError,)
+
+    def load_source_ids(self, sources: Sequence[str] = ALL_SOURCES) -> SourceIdIndex:
+        return load_source_id_index(sources)
+
+    def load_content_hashes(self, sources: Sequence[str] = ALL_SOURCES) -> Dict[Tuple[str, str], str]:
+        return load_content_hashes(sources)
+
+    def upsert_rows(self, rows: Sequence[dict]) -> None:
+        upsert_campaign_rows(rows)
+
+    def expire(self, today: date, grace_days: Mapping[str, int]) -> int:
+        """DB 함수 expire_campaigns(docs/supabase-expire-campaigns.sql)로 한 번에 처리.
+
+        함수가 아직 없으면 규칙별 필터 update(source 그룹당 요청 1번)로 대신한다.
+        """
+        try:
+            return run_supabase(lambda supabase: supabase.rpc(
+                "expire_campaigns",
+                {"p_today": today.isoformat(), "p_grace_days": dict(grace_days)},
+            ).execute()).data or 0
+        except APIError as e:
+            if e.code != "PGRST202":  # 함수 없음 이외의 오류
+                raise
+            logger.info("expire_campaigns 함수가 없어 필터 update로 정리합니다 (docs/supabase-expire-campaigns.sql)")
+
+        def expire(cutoff: date, eq_source: Optional[str] = None) -> int:
+            def run(supabase):
+                query = supabase.table("campaigns")\
+                    .update({"is_active": False}, count=CountMethod.exact, returning=ReturnMethod.minimal)\
+                    .eq("is_active", True)\
+                    .lt("application_deadline", cutoff.isoformat())
+                if eq_source:
+                    query = query.eq("source", eq_source)
+                elif grace_days:
+                    query = query.not_.in_("source", list(grace_days))
+                return query.execute()
+            return run_supabase(run).count or 0
+
+        expired = expire(today)
+        for source, grace in grace_days.items():
+            expired += expire(today - timedelta(days=grace), source)
+        return expired
+
+    def sweep(self, source: str, generation: int, seen_ids: Sequence[str], max_ratio: float = SWEEP_MAX_RATIO) -> Optional[int]:
+        """DB 함수 sweep_campaigns(docs/supabase-crawl-generation.sql)를 한 번 호출. 함수가 없으면 None."""
+        try:
+            return run_supabase(lambda supabase: supabase.rpc("sweep_campaigns", {
+                "p_source": source,
+                "p_generation": generation,
+                "p_seen_ids": list(seen_ids),
+                "p_max_ratio": max_ratio,
+            }).execute()).data or 0
+        except APIError as e:
+            if e.code == "PGRST202":  # 함수 없음
+                logger.warning("sweep_campaigns 함수가 없어 정리를 건너뜁니다 (docs/supabase-crawl-generation.sql)")
+                return None
+            raise
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    source_url TEXT,
+    thumbnail_url TEXT,
+    category TEXT,
+    region TEXT,
+    type TEXT,
+    channel TEXT,
+    reward TEXT,
+    reward_value INTEGER,
+    capacity INTEGER,
+    application_deadline TEXT,
+    review_deadline_days INTEGER,
+    recruit_count INTEGER,
+    applicant_count INTEGER,
+    selection_rate REAL,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    content_hash TEXT,
+    crawl_generation INTEGER,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (source, source_id)
+);
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_deadline ON campaigns (application_deadline) WHERE is_active = 1;
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class SqliteSink(CampaignSink):
+    """로컬 SQLite campaigns 테이블. Supabase와 같은 유일성·정리 규칙을 가진다."""
+
+    name = "sqlite"
+    rejected_errors = (sqlite3.IntegrityError, sqlite3.InterfaceError)
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.path.join(cache_dir, "campaigns.sqlite3")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def load_source_ids(self, sources: Sequence[str] = ALL_SOURCES) -> SourceIdIndex:
+        start = time.monotonic()
+        index = SourceIdIndex()
+        with self._lock:
+            for source in sources:
+                for (source_id,) in self._conn.execute("SELECT source_id FROM campaigns WHERE source = ?", (source,)):
+                    index.add(source, source_id)
+        index.freeze()
+        logger.info("기존 캠페인 ID 로드 (sqlite): %d개, %.2f초", len(index), time.monotonic() - start)
+        return index
+
+    def load_content_hashes(self, sources: Sequence[str] = ALL_SOURCES) -> Dict[Tuple[str, str], str]:
+        hashes: Dict[Tuple[str, str], str] = {}
+        with self._lock:
+            for source in sources:
+                rows = self._conn.execute(
+                    "SELECT source_id, content_hash FROM campaigns "
+                    "WHERE source = ? AND is_active = 1 AND content_hash IS NOT NULL",
+                    (source,),
+                )
+                hashes.update(((source, source_id), h) for source_id, h in rows)
+        return hashes
+
+    def upsert_rows(self, rows: Sequence[dict]) -> None:
+        if not rows:
+            return
+        now = _now()
+        columns = [c for c in COLUMNS if c in rows[0]]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in ("source", "source_id"))
+        sql = (
+            f"INSERT INTO campaigns ({', '.join(columns)}, created_at, updated_at) "
+            f"VALUES ({', '.join('?' for _ in columns)}, ?, ?) "
+            f"ON CONFLICT (source, source_id) DO UPDATE SET {updates}, updated_at = excluded.updated_at"
+        )
+        values = [[row.get(c) for c in columns] + [now, now] for row in rows]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(sql, values)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def expire(self, today: date, grace_days: Mapping[str, int]) -> int:
+        now = _now()
+        expired = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                placeholders = ", ".join("?" for _ in grace_days)
+                expired += self._conn.execute(
+                    "UPDATE campaigns SET is_active = 0, updated_at = ? "
+                    "WHERE is_active = 1 AND application_deadline IS NOT NULL "
+                    f"AND substr(application_deadline, 1, 10) < ? AND source NOT IN ({placeholders})",
+                    (now, today.isoformat(), *grace_days),
+                ).rowcount
+                for source, grace in grace_days.items():
+                    expired += self._conn.execute(
+                        "UPDATE campaigns SET is_active = 0, updated_at = ? "
+                        "WHERE is_active = 1 AND application_deadline IS NOT NULL "
+                        "AND substr(application_deadline, 1, 10) < ? AND source = ?",
+                        (now, (today - timedelta(days=grace)).isoformat(), source),
+                    ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return expired
+
+    def sweep(self, source: str, generation: int, seen_ids: Sequence[str], max_ratio: float = SWEEP_MAX_RATIO) -> Optional[int]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                # 이번 목록에 있던 캠페인은 세대 표시와 함께 다시 활성화 (잘못 정리·마감된 뒤 목록에 돌아온 경우)
+                now = _now()
+                self._conn.executemany(
+                    "UPDATE campaigns SET crawl_generation = ?, is_active = 1, "
+                    "updated_at = CASE WHEN is_active = 1 THEN updated_at ELSE ? END "
+                    "WHERE source = ? AND source_id = ?",
+                    ((generation, now, source, sid) for sid in seen_ids),
+                )
+                active, stale = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(crawl_generation IS NOT ?), 0) FROM campaigns "
+                    "WHERE source = ? AND is_active = 1",
+                    (generation, source),
+                ).fetchone()
+                if active and stale > active * max_ratio:
+                    raise ValueError(f"sweep({source}): 활성 캠페인 {active}개 중 {stale}개를 비활성화하게 되어 중단")
+                swept = self._conn.execute(
+                    "UPDATE campaigns SET is_active = 0, updated_at = ? "
+                    "WHERE source = ? AND is_active = 1 AND crawl_generation IS NOT ?",
+                    (now, source, generation),
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return swept
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JsonlSink(CampaignSink):
+    """upsert한 행을 JSONL 파일에 이어 쓰는 저장소. 같은 키는 마지막 줄이 현재 값이다."""
+
+    name = "jsonl"
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.path.join(cache_dir, "campaigns.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _latest(self, sources: Sequence[str]) -> Dict[Tuple[str, str], dict]:
+        wanted = set(sources)
+        latest: Dict[Tuple[str, str], dict] = {}
+        with self._lock:
+            self._file.flush()
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # 중단된 마지막 줄 등
+                    if row.get("source") in wanted:
+                        latest[(row["source"], row["source_id"])] = row
+        return latest
+
+    def load_source_ids(self, sources: Sequence[str] = ALL_SOURCES) -> SourceIdIndex:
+        index = SourceIdIndex()
+        for source, source_id in self._latest(sources):
+            index.add(source, source_id)
+        return index.freeze()
+
+    def load_content_hashes(self, sources: Sequence[str] = ALL_SOURCES) -> Dict[Tuple[str, str], str]:
+        return {
+            key: row["content_hash"]
+            for key, row in self._latest(sources).items()
+            if row.get("is_active") and row.get("content_hash")
+        }
+
+    def upsert_rows(self, rows: Sequence[dict]) -> None:
+        lines = "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+        with self._lock:
+            self._file.write(lines)
+
+    def expire(self, today: date, grace_days: Mapping[str, int]) -> int:
+        return 0  # 기록용 저장소: 정리 연산 없음
+
+    def sweep(self, source: str, generation: int, seen_ids: Sequence[str], max_ratio: float = SWEEP_MAX_RATIO) -> Optional[int]:
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def open_sink(spec: Optional[str] = None) -> Optional[CampaignSink]:
+    """저장소 열기. spec: "supabase"(기본) / "sqlite[:경로]" / "jsonl[:경로]" / "none".
+
+    Supabase 환경 변수가 없거나 "none"이면 None (로컬 크롤링만 수행).
+    """
+    spec = spec or os.environ.get("CRAWLER_SINK", "supabase")
+    kind, _, path = spec.partition(":")
+    if kind == "supabase":
+        return SupabaseSink() if get_supabase_client() is not None else None
+    if kind == "sqlite":
+        return SqliteSink(path or None)
+    if kind == "jsonl":
+        return JsonlSink(path or None)
+    if kind == "none":
+        return None
+    raise ValueError(f"알 수 없는 저장소: {spec}")
@@ -3,10 +3,13 @@ from __future__ import annotations
 import re
 from typing import List
 
-import requests
 from bs4 import BeautifulSoup
 
+from crawler.executor import track
+from crawler.fetch import FetchRequest, FetchResult
+from crawler.pagination import paginate
 from crawler.models import Campaign
+from crawler.title import REWARD_CHANNELS, parse_title
 from crawler.utils import clean_text, logger
 from crawler.utils_detail import extract_detail_info
 
@@ -55,37 +58,11 @@ def _parse_campaign_element(card) -> Campaign | None:
             raw_title = clean_text(title_el.get_text())
 
         # 제목에서 지역 정보 추출: "[전국][피자알볼로] sUPer 포테이토 피자" 형태
-        # 첫 번째 대괄호 안이 지역일 가능성이 높음
-        location: str | None = None
-        title = raw_title
-
-        # 대괄호 패턴으로 분리: "[전국][피자알볼로] 제목"
-        bracket_pattern = r"\[([^\]]+)\]"
-        matches = re.findall(bracket_pattern, raw_title)
-
-        # 채널/플랫폼/브랜드 키워드 목록
-        channel_keywords = [
-            "릴스",
-            "리워드",
-            "클립",
-            "블로그",
-            "인스타",
-            "유튜브",
-            "쇼츠",
-            "틱톡",
-        ]
-
-        if matches:
-            # 첫 번째 대괄호 안 텍스트가 지역인지 판단
-            first_bracket = matches[0]
-            # "전국", "서울", "강남" 같은 지역 키워드가 있거나, 채널 키워드가 없으면 지역으로 판단
-            if not any(keyword in first_bracket for keyword in channel_keywords):
-                # 지역 정보로 판단
-                location = first_bracket
-            # 첫 번째가 채널이면 지역 정보 없음 (location은 None 유지)
-            
-            # 제목에서 모든 대괄호 부분 제거
-            title = re.sub(r"\[[^\]]+\]\s*", "", raw_title).strip()
+        # 지명이 있는 대괄호, 없으면 첫 번째 대괄호가 채널이 아닐 때 지역으로 판단
+        # 제목에서는 모든 대괄호 부분 제거
+        parts = parse_title(raw_title, channels=REWARD_CHANNELS)
+        title = parts.title
+        location: str | None = parts.location_text(fallback=True)
 
         # 마감일: div.layer-primary > p.qz-caption-kr--line > strong
         deadline_el = card.select_one("div.layer-primary p.qz-caption-kr--line strong")
@@ -124,14 +101,9 @@ def _parse_campaign_element(card) -> Campaign | None:
                     channel_list.append(cat_text)
         
         # 제목에서도 채널 정보 확인 (예: "[서울 관악][릴스] 제목" 또는 "[인스타/릴스] 제목")
-        if matches:
-            for match in matches:
-                # 대괄호 안에 "/"로 구분된 여러 채널이 있을 수 있음
-                match_parts = re.split(r"[\/,\s]+", match)
-                for part in match_parts:
-                    part = part.strip()
-                    if part in channel_keywords_list and part not in channel_list:
-                        channel_list.append(part)
+        for name in parts.channels:
+            if name not in channel_list:
+                channel_list.append(name)
         
         # 채널이 여러 개면 "/"로 구분하여 저장
         # 채널 정보가 없으면 기본값으로 "블로그" 설정
@@ -223,13 +195,12 @@ def crawl(max_pages: int = 20) -> List[Campaign]:
 
     logger.info("디너의여왕 크롤링 시작")
     campaigns: list[Campaign] = []
-    empty_page_count = 0  # 연속 빈 페이지 카운트
+    track("dinnerqueen", campaigns)
+    seen_urls = set()
 
-    for page in range(1, max_pages + 1):
+    def handle_page(page: int, res: FetchResult) -> List[Campaign]:
         try:
-            # 맛집 전체 목록 페이지
-            url = f"{BASE_URL}{LIST_PATH}&page={page}"
-            res = requests.get(url, timeout=10)
+            url = res.request.url
             res.raise_for_status()
 
             soup = BeautifulSoup(res.text, "html.parser")
@@ -239,31 +210,34 @@ def crawl(max_pages: int = 20) -> List[Campaign]:
             cards = soup.select("#taste_list div.qz-dq-card, div.qz-dq-card")
             logger.info("디너의여왕 %s 에서 %d개 카드 발견", url, len(cards))
 
-            if not cards:
-                empty_page_count += 1
-                if empty_page_count >= 2:  # 연속 2페이지가 비어있으면 종료
-                    logger.info("디너의여왕: 연속 빈 페이지로 크롤링 종료 (page %d)", page)
-                    break
-                continue
-            else:
-                empty_page_count = 0  # 게시물이 있으면 카운트 리셋
-
+            found: List[Campaign] = []
             for card in cards:
                 campaign = _parse_campaign_element(card)
                 if campaign:
-                    campaigns.append(campaign)
+                    if campaign.url not in seen_urls:
+                        seen_urls.add(campaign.url)
+                        campaigns.append(campaign)
+                        found.append(campaign)
                 else:
                     # 디버깅: 왜 파싱이 실패하는지 확인
                     link_el = card.select_one("a.qz-dq-card__link")
                     if link_el:
                         logger.debug("디너의여왕 카드 파싱 실패: href=%s", link_el.get("href"))
+            return found
         except Exception as e:  # pragma: no cover
             logger.error("디너의여왕 페이지 %d 크롤링 중 오류: %s", page, e)
-            empty_page_count += 1
-            if empty_page_count >= 2:
-                break
+            return []
+
+    # 맛집 전체 목록 페이지 (여러 페이지를 동시에 요청, 연속 2페이지에 새 게시물이 없으면 종료)
+    paginate(
+        "dinnerqueen",
+        lambda p: FetchRequest(f"{BASE_URL}{LIST_PATH}&page={p}"),
+        handle_page,
+        max_pages,
+        site_name="dinnerqueen",
+        timeout=10,
+    )
 
     logger.info("디너의여왕 총 %d개 캠페인 수집", len(campaigns))
     logger.info("디너의여왕 크롤링 완료")
     return campaigns
-
@@ -3,20 +3,17 @@
 import re
 from datetime import datetime, timedelta
 from typing import List
-import requests
 from bs4 import BeautifulSoup
 
+from crawler.executor import track
+from crawler.fetch import FetchRequest, FetchResult
+from crawler.pagination import paginate
 from crawler.models import Campaign
+from crawler.title import parse_title
 from crawler.utils import clean_text, logger
 
 BASE_URL = "https://dinodan.co.kr"
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-}
-
 # 카테고리 ID -> 카테고리명 매핑
 CATEGORY_MAP = {
     # 방문형
@@ -57,25 +54,10 @@ def _parse_campaign_element(card, category_id: str) -> Campaign | None:
         if not raw_title:
             return None
 
-        # 지역 추출 (제목에서 [지역] 패턴)
-        location = None
-        bracket_matches = re.findall(r"\[([^\]]+)\]", raw_title)
-        location_keywords = ["전국", "서울", "강남", "강서", "강북", "강동", "송파", "마포", "종로", "천호",
-                           "부산", "대구", "인천", "광주", "대전", "울산", "세종",
-                           "경기", "수원", "성남", "용인", "고양", "안양", "일산", "분당", "김포", "평택",
-                           "전북", "전주", "충북", "청주", "충남", "천안",
-                           "경북", "포항", "경남", "창원", "강원", "춘천", "제주"]
-
-        if bracket_matches:
-            for match in bracket_matches:
-                if any(keyword in match for keyword in location_keywords):
-                    location = match
-                    break
-
-        # 제목에서 대괄호 제거
-        title = re.sub(r"\[[^\]]+\]\s*", "", raw_title).strip()
-        if not title:
-            title = raw_title
+        # 제목에서 대괄호 제거, 지역 추출 (제목의 [지역] 패턴)
+        parts = parse_title(raw_title)
+        title = parts.title
+        location = parts.location_text()
 
         # 채널 추출 (제목에서 클립/인스타 등)
         channel = "블로그"
@@ -162,8 +144,8 @@ def crawl(max_pages: int = 10) -> List[Campaign]:
     """디노단 크롤링 로직."""
     logger.info("디노단 크롤링 시작")
     campaigns: List[Campaign] = []
+    track("dinodan", campaigns)
     seen_urls = set()
-    empty_page_count = 0
 
     # 카테고리별 크롤링 - 방문(829), 배송(832)
     categories = [
@@ -172,40 +154,39 @@ def crawl(max_pages: int = 10) -> List[Campaign]:
     ]
 
     for category_id, category_name in categories:
-        empty_page_count = 0
-        for page in range(1, max_pages + 1):
+        def handle_page(page: int, res: FetchResult) -> List[Campaign]:
             try:
-                url = f"{BASE_URL}/category.php"
-                params = {"category": category_id, "page": page}
-                res = requests.get(url, params=params, headers=HEADERS, timeout=10)
                 res.raise_for_status()
 
                 soup = BeautifulSoup(res.text, "html.parser")
                 # .common_graph_rows 클래스 내의 캠페인 아이템들
                 cards = soup.select(".common_graph_rows")
+                if cards:
+                    logger.info("디노단 %s 페이지 %d에서 %d개 캠페인 발견", category_name, page, len(cards))
 
-                if not cards:
-                    empty_page_count += 1
-                    if empty_page_count >= 2:
-                        logger.info("디노단 %s: 연속 빈 페이지로 크롤링 종료 (page %d)", category_name, page)
-                        break
-                    continue
-                else:
-                    empty_page_count = 0
-
-                logger.info("디노단 %s 페이지 %d에서 %d개 캠페인 발견", category_name, page, len(cards))
-
+                found: List[Campaign] = []
                 for card in cards:
                     campaign = _parse_campaign_element(card, category_id)
                     if campaign and campaign.url not in seen_urls:
                         seen_urls.add(campaign.url)
                         campaigns.append(campaign)
+                        found.append(campaign)
+                return found
 
             except Exception as e:
                 logger.error("디노단 %s 페이지 %d 크롤링 중 오류: %s", category_name, page, e)
-                empty_page_count += 1
-                if empty_page_count >= 2:
-                    break
+                return []
+
+        # 여러 페이지를 동시에 요청하고, 연속 2페이지에 새 캠페인이 없으면 다음 카테고리로
+        paginate(
+            f"dinodan:{category_id}",
+            lambda p: FetchRequest(f"{BASE_URL}/category.php", params={"category": category_id, "page": p}),
+            handle_page,
+            max_pages,
+            site_name="dinodan",
+            newest_first=True,  # 등록 최신순 게시판 목록
+            timeout=10,
+        )
 
     logger.info("디노단 총 %d개 캠페인 수집", len(campaigns))
     return campaigns
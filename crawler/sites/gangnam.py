@@ -3,10 +3,11 @@
 import re
 import concurrent.futures
 from typing import List, Tuple
-import requests
 from bs4 import BeautifulSoup
 
+from crawler import sessions
 from crawler.models import Campaign
+from crawler.title import parse_title
 from crawler.utils import clean_text, logger
 from crawler.category import normalize_category
 
@@ -69,54 +70,25 @@ def _parse_card(card, fixed_type: str, fixed_category: str) -> Campaign | None:
         raw_title = clean_text(title_el.get_text())
         title = raw_title
 
-        # 지역 및 채널 추출 (제목 파싱)
+        # 지역 및 채널 추출 (제목의 [지역], [채널] 대괄호)
         location = None
-        channel = None
-        channel_mapping = {
-            "블로그": "블로그",
-            "인스타": "인스타", 
-            "릴스": "릴스", 
-            "유튜브": "유튜브", 
-            "쇼츠": "쇼츠",
-            "틱톡": "틱톡",
-            "클립": "클립",
-            "clip": "클립"
-        }
-        
-        # [지역], [채널] 등의 대괄호 파싱
-        bracket_matches = re.findall(r"\[([^\]]+)\]", raw_title)
-        
-        found_channels = []
-        possible_location = None
-        
-        for b_text in bracket_matches:
-            b_lower = b_text.lower()
-            is_channel = False
-            for k, v in channel_mapping.items():
-                if k in b_lower:
-                    if v not in found_channels:
-                        found_channels.append(v)
-                    is_channel = True
-            
-            if not is_channel and not possible_location:
-                possible_location = b_text
-        
-        if found_channels:
-            channel = "/".join(found_channels)
-        else:
+        parts = parse_title(raw_title)
+        channel = parts.channel
+
+        if not channel:
             # HTML 태그 백업 확인 (em.blog 등)
             blog_el = card.select_one("em.blog")
             if blog_el and "blog" in blog_el.get_text().lower():
                 channel = "블로그"
-        
+
         if fixed_type == "visit":
-            location = possible_location
+            location = parts.location_text(fallback=True)
             # 제목에서 대괄호 제거하여 깔끔하게
-            title = re.sub(r"\[[^\]]+\]\s*", "", raw_title).strip()
+            title = parts.title
         elif fixed_type == "delivery":
             location = "배송"
-            title = re.sub(r"\[[^\]]+\]\s*", "", raw_title).strip()
-        
+            title = parts.title
+
         # 마감일
         deadline_el = card.select_one("span.dday em.day_c")
         deadline_raw = clean_text(deadline_el.get_text()) if deadline_el else None
@@ -165,9 +137,7 @@ def _crawl_category(cat_id: int, c_type: str, c_cat: str, max_pages: int = 20) -
         url = f"{BASE_URL}/cp/?ca={cat_id}&page={page}"
         
         try:
-            res = requests.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }, timeout=10)
+            res = sessions.get(url, timeout=10)
             res.raise_for_status()
             
             soup = BeautifulSoup(res.text, "html.parser")
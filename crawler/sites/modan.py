@@ -1,12 +1,14 @@
 """모두의체험단 크롤러"""
 
-import re
 from datetime import datetime, timedelta
 from typing import List
-import requests
 from bs4 import BeautifulSoup
 
+from crawler.executor import track
+from crawler.fetch import FetchRequest, FetchResult
+from crawler.pagination import StopPagination, paginate
 from crawler.models import Campaign
+from crawler.title import CHANNEL, REWARD_CHANNELS, parse_title
 from crawler.utils import clean_text, logger
 
 BASE_URL = "https://www.modan.kr"
@@ -63,12 +65,6 @@ def _classify_product_category(title: str) -> str:
     # 기본값: 배송 (일반 제품)
     return "배송"
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-}
-
 
 def _parse_campaign_element(card, category_name: str) -> Campaign | None:
     """모두의체험단 캠페인 카드 한 개를 Campaign으로 변환."""
@@ -103,28 +99,12 @@ def _parse_campaign_element(card, category_name: str) -> Campaign | None:
         if not raw_title:
             return None
 
-        # 지역 및 채널 추출
-        location = None
-        channel = "블로그"
-        bracket_matches = re.findall(r"\[([^\]]+)\]", raw_title)
-        location_keywords = ["전국", "서울", "강남", "부산", "대구", "인천", "광주", "대전", "울산",
-                           "경기", "수원", "성남", "용인", "고양", "전북", "전주", "충북", "청주",
-                           "경북", "포항", "경남", "창원", "강원", "춘천", "제주"]
-        channel_keywords = ["릴스", "리워드", "클립", "블로그", "인스타", "유튜브", "쇼츠", "틱톡"]
-
-        if bracket_matches:
-            for match in bracket_matches:
-                match_lower = match.lower()
-                if any(keyword in match for keyword in location_keywords):
-                    location = match
-                elif any(keyword in match_lower for keyword in channel_keywords):
-                    channel = match
-
-        # 제목에서 플랫폼 태그만 제거 (지역은 유지)
-        title = raw_title
-        for kw in channel_keywords:
-            title = re.sub(rf"\[{kw}[^\]]*\]", "", title, flags=re.IGNORECASE)
-        title = re.sub(r"\s+", " ", title).strip()
+        # 지역 및 채널 추출, 제목에서 채널 태그만 제거 (지역은 유지)
+        parts = parse_title(raw_title, drop=(CHANNEL,), channels=REWARD_CHANNELS)
+        title = parts.title
+        location = parts.location_text()
+        channel_segment = parts.last(CHANNEL)
+        channel = channel_segment.text if channel_segment else "블로그"
 
         # 이미지: JSON에서 또는 HTML에서 추출
         image_url = props.get("image_url", "")
@@ -177,7 +157,8 @@ def crawl(max_pages: int = 20, max_total: int = 200) -> List[Campaign]:
     """
     logger.info("모두의체험단 크롤링 시작 (최대 %d개)", max_total)
     campaigns: List[Campaign] = []
-    empty_page_count = 0
+    track("modan", campaigns)
+    seen_urls = set()
 
     # 카테고리별 크롤링
     categories = [
@@ -190,40 +171,43 @@ def crawl(max_pages: int = 20, max_total: int = 200) -> List[Campaign]:
         if len(campaigns) >= max_total:
             break
 
-        for page in range(1, max_pages + 1):
-            if len(campaigns) >= max_total:
-                break
-
+        def handle_page(page: int, res: FetchResult) -> List[Campaign]:
             try:
-                url = f"{BASE_URL}{category_path}?page={page}"
-                res = requests.get(url, headers=HEADERS, timeout=10)
                 res.raise_for_status()
 
                 soup = BeautifulSoup(res.text, "html.parser")
                 cards = soup.select(".shop-item")
+                if cards:
+                    logger.info("모두의체험단 %s 페이지 %d에서 %d개 카드 발견", category_name, page, len(cards))
 
-                if not cards:
-                    empty_page_count += 1
-                    if empty_page_count >= 2:
-                        break
-                    continue
-                else:
-                    empty_page_count = 0
-
-                logger.info("모두의체험단 %s 페이지 %d에서 %d개 카드 발견", category_name, page, len(cards))
-
+                found: List[Campaign] = []
                 for card in cards:
                     if len(campaigns) >= max_total:
                         break
                     campaign = _parse_campaign_element(card, category_name)
-                    if campaign:
+                    if campaign and campaign.url not in seen_urls:
+                        seen_urls.add(campaign.url)
                         campaigns.append(campaign)
-
+                        found.append(campaign)
             except Exception as e:
                 logger.error("모두의체험단 %s 페이지 %d 크롤링 중 오류: %s", category_name, page, e)
-                empty_page_count += 1
-                if empty_page_count >= 2:
-                    break
+                return []
+
+            # 최대 수집 개수에 도달하면 미리 요청해 둔 페이지는 취소
+            if len(campaigns) >= max_total:
+                raise StopPagination
+            return found
+
+        # 여러 페이지를 동시에 요청하고, 연속 2페이지에 새 캠페인이 없으면 다음 카테고리로
+        paginate(
+            f"modan:{category_path}",
+            lambda p: FetchRequest(f"{BASE_URL}{category_path}?page={p}"),
+            handle_page,
+            max_pages,
+            site_name="modan",
+            newest_first=True,  # 등록 최신순 게시판 목록
+            timeout=10,
+        )
 
     logger.info("모두의체험단 총 %d개 캠페인 수집", len(campaigns))
     return campaigns
@@ -3,10 +3,11 @@
 import re
 import concurrent.futures
 from typing import List, Tuple
-import requests
 from bs4 import BeautifulSoup
 
+from crawler import sessions
 from crawler.models import Campaign
+from crawler.title import parse_title
 from crawler.utils import clean_text, logger
 from crawler.category import normalize_category
 
@@ -62,13 +63,12 @@ def _parse_card(card, fixed_type: str, fixed_category: str) -> Campaign | None:
         # 지역 (방문형일 때만)
         location = None
         if fixed_type == "visit":
-             match = re.search(r"\[([^\]]+)\]", title)
-             if match:
+             parts = parse_title(title)
+             if parts.segments:
                  # [울산/사주] -> 울산
-                 parts = match.group(1).split("/")
-                 location = parts[0].strip()
+                 location = parts.segments[0].text.split("/")[0].strip()
                  # 제목에서 지역 제거
-                 title = re.sub(r"\[[^\]]+\]\s*", "", title).strip()
+                 title = parts.title
         elif fixed_type == "delivery":
             location = "배송"
 
@@ -134,9 +134,7 @@ def _crawl_category(cat_id: str, c_type: str, c_cat: str, max_pages: int = 20) -
         params = {"category_id": cat_id, "page": page}
         
         try:
-            res = requests.get(url, params=params, headers={
-                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }, timeout=10)
+            res = sessions.get(url, params=params, timeout=10)
             res.raise_for_status()
             
             soup = BeautifulSoup(res.text, "html.parser")
@@ -1,12 +1,14 @@
 """리얼리뷰 크롤러"""
 
-import re
 from datetime import datetime, timedelta
 from typing import List
-import requests
 from bs4 import BeautifulSoup
 
+from crawler.executor import track
+from crawler.fetch import FetchRequest, FetchResult
+from crawler.pagination import paginate
 from crawler.models import Campaign
+from crawler.title import CHANNEL, LOCATION, REWARD_CHANNELS, parse_title
 from crawler.utils import clean_text, logger
 
 BASE_URL = "https://www.real-review.kr"
@@ -50,12 +52,6 @@ def _classify_category(title: str, campaign_type: str) -> str:
     # 기본값: 맛집 (방문형 체험단은 대부분 맛집)
     return "맛집"
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-}
-
 
 def _parse_campaign_element(card) -> Campaign | None:
     """리얼리뷰 캠페인 카드 한 개를 Campaign으로 변환."""
@@ -84,50 +80,10 @@ def _parse_campaign_element(card) -> Campaign | None:
             if status == "close":
                 return None
 
-        # 지역 추출 (제목에서 [지역] 패턴)
-        location = None
-        bracket_matches = re.findall(r"\[([^\]]+)\]", raw_title)
-        location_keywords = ["전국", "서울", "강남", "강서", "강북", "강동", "송파", "마포", "종로",
-                           "부산", "대구", "인천", "광주", "대전", "울산", "세종",
-                           "경기", "수원", "성남", "용인", "고양", "안양", "일산", "분당", "김포", "평택",
-                           "병점", "부천", "역곡", "발산",
-                           "전북", "전주", "충북", "청주", "충남", "천안",
-                           "경북", "포항", "경남", "창원", "강원", "춘천", "제주"]
-
-        # 채널 키워드 (제목에서 제거할 대괄호)
-        channel_bracket_keywords = ["릴스", "리워드", "클립", "인스타", "유튜브", "쇼츠", "틱톡", "블로그"]
-
-        # 제거할 대괄호 패턴 찾기 (지역 또는 채널 키워드가 포함된 경우만)
-        # 단, 점포명 패턴("XX점", "XX호점" 등)이 있으면 제거하지 않음
-        brackets_to_remove = []
-        if bracket_matches:
-            for match in bracket_matches:
-                # 점포명 패턴 체크 - 점포명이 있으면 제거 대상에서 제외
-                is_store_name = bool(re.search(r"점\]?$|호점\]?$|지점\]?$|본점\]?$|매장\]?$", match))
-
-                if is_store_name:
-                    # 점포명이 포함된 경우, 지역 정보만 추출하고 대괄호는 유지
-                    for keyword in location_keywords:
-                        if keyword in match:
-                            location = keyword
-                            break
-                    continue  # 대괄호 제거 대상에 추가하지 않음
-
-                # 지역 키워드 확인 (점포명이 아닌 경우에만 제거)
-                if any(keyword in match for keyword in location_keywords):
-                    location = match
-                    brackets_to_remove.append(match)
-                # 채널 키워드 확인
-                elif any(keyword in match.lower() for keyword in channel_bracket_keywords):
-                    brackets_to_remove.append(match)
-
-        # 제목에서 지역/채널 대괄호만 제거 (식당 이름 등은 유지)
-        title = raw_title
-        for bracket in brackets_to_remove:
-            title = title.replace(f"[{bracket}]", "").strip()
-        title = re.sub(r"\s+", " ", title).strip()  # 중복 공백 제거
-        if not title:
-            title = raw_title
+        # 지역 추출, 제목에서 지역/채널 대괄호만 제거 (식당 이름, 점포명 대괄호는 유지)
+        parts = parse_title(raw_title, drop=(LOCATION, CHANNEL), channels=REWARD_CHANNELS)
+        title = parts.title
+        location = parts.location_text()
 
         # 채널 추출
         channel = "블로그"
@@ -204,14 +160,11 @@ def crawl(max_pages: int = 10) -> List[Campaign]:
     """리얼리뷰 크롤링 로직."""
     logger.info("리얼리뷰 크롤링 시작")
     campaigns: List[Campaign] = []
+    track("real_review", campaigns)
     seen_urls = set()
-    empty_page_count = 0
 
-    for page in range(1, max_pages + 1):
+    def handle_page(page: int, res: FetchResult) -> List[Campaign]:
         try:
-            url = f"{BASE_URL}/explore/"
-            params = {"page": page}
-            res = requests.get(url, params=params, headers=HEADERS, timeout=15)
             res.raise_for_status()
 
             soup = BeautifulSoup(res.text, "html.parser")
@@ -233,28 +186,31 @@ def crawl(max_pages: int = 10) -> List[Campaign]:
                             break
                         parent = parent.parent if parent else None
 
-            if not cards:
-                empty_page_count += 1
-                if empty_page_count >= 2:
-                    logger.info("리얼리뷰: 연속 빈 페이지로 크롤링 종료 (page %d)", page)
-                    break
-                continue
-            else:
-                empty_page_count = 0
-
-            logger.info("리얼리뷰 페이지 %d에서 %d개 카드 발견", page, len(cards))
+            if cards:
+                logger.info("리얼리뷰 페이지 %d에서 %d개 카드 발견", page, len(cards))
 
+            found: List[Campaign] = []
             for card in cards:
                 campaign = _parse_campaign_element(card)
                 if campaign and campaign.url not in seen_urls:
                     seen_urls.add(campaign.url)
                     campaigns.append(campaign)
+                    found.append(campaign)
+            return found
 
         except Exception as e:
             logger.error("리얼리뷰 페이지 %d 크롤링 중 오류: %s", page, e)
-            empty_page_count += 1
-            if empty_page_count >= 2:
-                break
+            return []
+
+    # 여러 페이지를 동시에 요청하고, 연속 2페이지에 새 캠페인이 없으면 종료
+    paginate(
+        "real_review",
+        lambda p: FetchRequest(f"{BASE_URL}/explore/", params={"page": p}),
+        handle_page,
+        max_pages,
+        site_name="real_review",
+        timeout=15,
+    )
 
     logger.info("리얼리뷰 총 %d개 캠페인 수집", len(campaigns))
     return campaigns
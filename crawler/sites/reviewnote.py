@@ -2,9 +2,9 @@ import json
 from datetime import datetime, timezone
 from typing import List, Set
 
-import requests
 from bs4 import BeautifulSoup
 
+from crawler.fetch import fetch_one
 from crawler.models import Campaign
 from crawler.utils import clean_text, logger
 
@@ -202,18 +202,11 @@ def crawl() -> List[Campaign]:
 
     logger.info("리뷰노트 크롤링 시작")
     url = "https://www.reviewnote.co.kr/"
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-    }
 
     campaigns: list[Campaign] = []
 
     try:
-        res = requests.get(url, headers=headers, timeout=10)
+        res = fetch_one(url, timeout=10)
         res.raise_for_status()
         
         soup = BeautifulSoup(res.text, "html.parser")
@@ -3,10 +3,11 @@
 import re
 import concurrent.futures
 from typing import List, Tuple
-import requests
 from bs4 import BeautifulSoup
 
+from crawler import sessions
 from crawler.models import Campaign
+from crawler.title import parse_title
 from crawler.utils import clean_text, logger
 from crawler.category import normalize_category
 
@@ -85,25 +86,11 @@ def _parse_card(card, fixed_type: str, fixed_category: str) -> Campaign | None:
                     if "클립" not in channel_list: channel_list.append("클립")
         
         # 2. 텍스트(대괄호) 기반
-        channel_keywords = ["블로그", "인스타", "릴스", "유튜브", "쇼츠", "틱톡", "클립"]
-        bracket_matches = re.findall(r"\[([^\]]+)\]", raw_title)
-        
-        clean_brackets = [] # 지역 정보 후보
-        
-        for b_text in bracket_matches:
-            # 채널 찾기
-            found_chan = False
-            parts = re.split(r"[\/,\s]+", b_text)
-            for part in parts:
-                p_clean = part.strip()
-                if p_clean in channel_keywords:
-                    if p_clean not in channel_list:
-                        channel_list.append(p_clean)
-                    found_chan = True
-            
-            if not found_chan:
-                clean_brackets.append(b_text)
-        
+        parts = parse_title(raw_title)
+        for name in parts.channels:
+            if name not in channel_list:
+                channel_list.append(name)
+
         channel = "/".join(channel_list) if channel_list else None
 
         # 지역 정보
@@ -111,12 +98,11 @@ def _parse_card(card, fixed_type: str, fixed_category: str) -> Campaign | None:
         if fixed_type == "delivery":
             location = "배송"
         elif fixed_type == "visit":
-            # 남은 대괄호 내용을 지역으로 간주 (첫번째 것만)
-            if clean_brackets:
-                location = clean_brackets[0]
-        
+            # 지명이 있는 대괄호, 없으면 첫 번째 대괄호 (채널 태그가 아닐 때)
+            location = parts.location_text(fallback=True)
+
         # 제목 정제 (대괄호 제거)
-        title = re.sub(r"\[[^\]]+\]\s*", "", raw_title).strip()
+        title = parts.title
 
         # 마감일
         deadline_el = card.select_one("div.date_wrap p.date")
@@ -174,9 +160,7 @@ def _crawl_category(ct1: str, ct2: str | None, c_type: str, c_cat: str, max_page
             params["ct2"] = ct2
             
         try:
-            res = requests.get(url, params=params, headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }, timeout=10)
+            res = sessions.get(url, params=params, timeout=10)
             res.raise_for_status()
             
             soup = BeautifulSoup(res.text, "html.parser")
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from typing import List
 
-import requests
 from bs4 import BeautifulSoup
 
+from crawler import sessions
 from crawler.models import Campaign
 from crawler.utils import clean_text, logger
 
@@ -80,7 +80,7 @@ def crawl(max_pages: int = 1) -> List[Campaign]:
         try:
             # 실제 리스트 URL은 운영 환경에서 확인 후 수정 필요
             url = f"{BASE_URL}/campaign/list?page={page}"
-            res = requests.get(url, timeout=10)
+            res = sessions.get(url, timeout=10)
             res.raise_for_status()
 
             soup = BeautifulSoup(res.text, "html.parser")
@@ -3,9 +3,9 @@
 import re
 import concurrent.futures
 from typing import List, Tuple
-import requests
 from bs4 import BeautifulSoup
 
+from crawler import sessions
 from crawler.models import Campaign
 from crawler.utils import clean_text, logger
 from crawler.category import normalize_category
@@ -123,9 +123,7 @@ def _crawl_category(cat_id: int, c_type: str, c_cat: str, max_pages: int = 20) -
         url = f"{BASE_URL}/campaign/?cat={cat_id}&page={page}"
         
         try:
-            res = requests.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }, timeout=10)
+            res = sessions.get(url, timeout=10)
             res.raise_for_status()
             
             soup = BeautifulSoup(res.text, "html.parser")
@@ -4,12 +4,15 @@ API 직접 호출 방식으로 캠페인 데이터를 수집합니다.
 API Host: https://api2.stylec.co.kr:6439/v1
 """
 
-import re
+import asyncio
 from typing import List, Set
 
-import requests
-
+from crawler.executor import track
+from crawler.fetch import AsyncFetcher, FetchError, FetchRequest, FetchResult, run_sync
+from crawler.http_cache import LIST_TTL
+from crawler.pagination import apaginate
 from crawler.models import Campaign
+from crawler.title import CHANNEL, PLATFORM, parse_title
 from crawler.utils import clean_text, logger
 
 BASE_URL = "https://www.stylec.co.kr"
@@ -85,30 +88,6 @@ SNS_TYPE_MAP = {
     "tiktok": "틱톡",
 }
 
-# 지역 키워드 (대괄호 안에서 추출)
-LOCATION_KEYWORDS = [
-    # 전국/배송
-    "전국",
-    # 서울 세부
-    "서울", "강남", "홍대", "이태원", "신촌", "명동", "종로", "압구정", "청담",
-    "잠실", "건대", "신림", "영등포", "마포", "용산", "송파", "강서", "강동",
-    "노원", "도봉", "중랑", "성북", "동대문", "성동", "광진", "서초", "관악",
-    "선릉", "역삼", "삼성", "논현", "신사", "가로수길", "합정", "상수", "망원",
-    "마곡", "가산", "구로", "금천", "목동", "양천", "강북", "은평", "서대문",
-    # 경기 세부
-    "경기", "수원", "성남", "용인", "고양", "화성", "부천", "안산", "안양",
-    "평택", "시흥", "파주", "김포", "광명", "군포", "오산", "이천", "양주",
-    "의왕", "하남", "위례", "판교", "분당", "일산", "동탄", "동두천", "의정부",
-    "남양주", "구리", "광주",
-    # 광역시
-    "부산", "대구", "인천", "광주", "대전", "울산", "세종",
-    # 도
-    "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주",
-    # 주요 도시
-    "천안", "청주", "전주", "포항", "창원", "진주", "춘천", "원주", "강릉",
-]
-
-
 def _parse_channel(sns_type: str, wr_type: str) -> str:
     """SNS 타입과 캠페인 타입으로 채널 결정."""
     if sns_type and sns_type in SNS_TYPE_MAP:
@@ -121,60 +100,6 @@ def _parse_channel(sns_type: str, wr_type: str) -> str:
     return "블로그"  # 기본값
 
 
-def _extract_location(title: str) -> str | None:
-    """제목에서 지역 정보 추출.
-
-    예: "[레드버튼 성남모란] ..." → "성남"
-         "대구 도원센트럴 지점" → "대구"
-    """
-    # 1. 대괄호 안의 내용에서 먼저 추출 (우선순위 높음)
-    bracket_matches = re.findall(r"\[([^\]]+)\]", title)
-
-    for match in bracket_matches:
-        for keyword in LOCATION_KEYWORDS:
-            if keyword in match:
-                return keyword
-
-    # 2. 제목 전체에서 지역 키워드 검색 (대괄호 없는 경우)
-    for keyword in LOCATION_KEYWORDS:
-        if keyword in title:
-            return keyword
-
-    return None
-
-
-def _clean_title(title: str) -> str:
-    """제목에서 플랫폼/채널 태그만 제거 (상호명은 유지)."""
-    # 제거할 태그 패턴 (플랫폼, 채널, 지역 등)
-    remove_patterns = [
-        r"\[네이버\s*블로그[^\]]*\]",  # [네이버 블로그], [네이버블로그/12월3주] 등
-        r"\[네이버\s*클립[^\]]*\]",
-        r"\[인스타그램[^\]]*\]",
-        r"\[인스타\s*릴스[^\]]*\]",
-        r"\[유튜브[^\]]*\]",
-        r"\[유튜브\s*쇼츠[^\]]*\]",
-        r"\[틱톡[^\]]*\]",
-        r"\[쿠팡[^\]]*\]",  # [쿠팡], [쿠팡 리뷰], [쿠팡 구매평] 등
-        r"\[스마트스토어[^\]]*\]",
-        r"\[스스[^\]]*\]",
-        r"\[blog[^\]]*\]",
-        r"\[미션형\s*체험단[^\]]*\]",
-        r"\[현금캐시백[^\]]*\]",
-        r"\[현금페이백[^\]]*\]",
-        r"\[푸드앳홈[^\]]*\]",
-        r"\[방문\s*포장[^\]]*\]",
-        r"\[1만캐시\s*지급[^\]]*\]",
-    ]
-
-    cleaned = title
-    for pattern in remove_patterns:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
-
-    # 연속 공백 정리
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-    return cleaned if cleaned else title
-
-
 def _parse_campaign(item: dict) -> Campaign | None:
     """API 응답 아이템을 Campaign 객체로 변환."""
     try:
@@ -193,8 +118,9 @@ def _parse_campaign(item: dict) -> Campaign | None:
         else:
             url = BASE_URL + "/" + link
 
-        # 제목 정리
-        title = _clean_title(clean_text(raw_title))
+        # 제목 정리: 플랫폼/채널 태그만 제거 (지역, 상호명은 유지)
+        parts = parse_title(clean_text(raw_title), drop=(CHANNEL, PLATFORM))
+        title = parts.title
         if not title:
             return None
 
@@ -237,8 +163,9 @@ def _parse_campaign(item: dict) -> Campaign | None:
         wr_type = item.get("wr_type", "")
         channel = _parse_channel(sns_type, wr_type)
 
-        # 지역 (제목에서 추출)
-        location = _extract_location(raw_title)
+        # 지역 (제목에서 추출: 대괄호 안 우선, 구체적이고 긴 지명 우선)
+        # 예: "[레드버튼 성남모란] ..." → "성남", "대구 도원센트럴 지점" → "대구"
+        location = parts.location.keyword if parts.location else None
 
         # 타입 결정: API의 ca_name 기반
         # 제품 → delivery, 방문/서비스 → visit
@@ -280,17 +207,18 @@ def _parse_campaign(item: dict) -> Campaign | None:
         return None
 
 
-def _fetch_api(endpoint: str, params: dict = None) -> list:
-    """API 호출 및 데이터 추출."""
-    try:
-        url = f"{API_HOST}{endpoint}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Accept": "application/json",
-            "Referer": "https://www.stylec.co.kr/",
-        }
+API_HEADERS = {
+    "Accept": "application/json",
+    "Referer": "https://www.stylec.co.kr/",
+}
+
+# /trial 목록을 한 번에 몇 페이지씩 앞서 요청할지
+PAGE_WINDOW = 6
 
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+
+def _extract_items(response: FetchResult, endpoint: str) -> list:
+    """API 응답에서 캠페인 배열 추출."""
+    try:
         response.raise_for_status()
 
         data = response.json()
@@ -313,7 +241,7 @@ def _fetch_api(endpoint: str, params: dict = None) -> list:
 
         return []
 
-    except requests.RequestException as e:
+    except FetchError as e:
         logger.error("스타일씨 API 요청 오류 (%s): %s", endpoint, e)
         return []
     except Exception as e:
@@ -321,68 +249,99 @@ def _fetch_api(endpoint: str, params: dict = None) -> list:
         return []
 
 
-def crawl(max_pages: int = 50, include_closing: bool = False) -> List[Campaign]:
-    """스타일씨 크롤링 - API 직접 호출 방식.
+def _parse_new(items: list, seen_urls: Set[str]) -> List[Campaign]:
+    """seen_urls에 없는 캠페인만 파싱해서 반환 (seen_urls 갱신)."""
+    parsed = []
+    for item in items:
+        campaign = _parse_campaign(item)
+        if campaign and campaign.url not in seen_urls:
+            seen_urls.add(campaign.url)
+            parsed.append(campaign)
+    return parsed
+
+
+async def _crawl_async(campaigns: List[Campaign], max_pages: int, include_closing: bool) -> List[Campaign]:
+    """인기/마감임박 API와 일반 목록 페이지들을 동시에 요청해서 수집."""
+    async with AsyncFetcher(headers=API_HEADERS, timeout=30, cache_ttl=LIST_TTL) as fetcher:
+        # 1. 인기 / 마감 임박 캠페인은 목록 페이지와 병렬로 조회
+        extra_endpoints = ["/trial/popular"] + (["/trial/closing-trials"] if include_closing else [])
+        extra_tasks = {
+            endpoint: asyncio.create_task(fetcher.fetch(FetchRequest(f"{API_HOST}{endpoint}")))
+            for endpoint in extra_endpoints
+        }
 
-    여러 API 엔드포인트에서 데이터를 수집하여 통합합니다.
+        # 2. 일반 캠페인 페이지별 조회 (마감되지 않은 것만), 응답이 도착하는 대로 페이지 순서대로 파싱
+        list_seen: Set[str] = set()
+        total_general = 0
+
+        def handle_page(page: int, res: FetchResult) -> List[Campaign]:
+            nonlocal total_general
+            general_items = _extract_items(res, "/trial")
+            if not general_items:
+                logger.info("스타일씨 페이지 %d: 결과 없음, 중단", page)
+                return []
+
+            new_campaigns = _parse_new(general_items, list_seen)
+            campaigns.extend(new_campaigns)
+            total_general += len(general_items)
+
+            # 새로운 캠페인이 없으면 중단 (중복 페이지)
+            if not new_campaigns:
+                logger.info("스타일씨 페이지 %d: 새 캠페인 없음, 중단", page)
+            else:
+                logger.info("스타일씨 페이지 %d: %d개 중 %d개 신규", page, len(general_items), len(new_campaigns))
+            return new_campaigns
+
+        await apaginate(
+            fetcher,
+            "stylec",
+            lambda p: FetchRequest(f"{API_HOST}/trial", params={"include_finish": "false", "page": p}),
+            handle_page,
+            max_pages,
+            empty_limit=1,
+            window=PAGE_WINDOW,
+            site_name="stylec",
+        )
+        logger.info("스타일씨 일반 캠페인 총: %d개 조회", total_general)
 
-    Args:
-        max_pages: 최대 페이지 수 (기본 50페이지)
-        include_closing: 마감임박 캠페인 포함 여부 (기본 False)
-    """
-    logger.info("스타일씨 크롤링 시작 (API 방식, max_pages=%d)", max_pages)
+        extra_items = {endpoint: _extract_items(await task, endpoint) for endpoint, task in extra_tasks.items()}
 
-    campaigns: List[Campaign] = []
+    # 3. 인기 → 일반 → 마감 임박 순서로 병합 (URL 기준 중복 제거)
     seen_urls: Set[str] = set()
-
-    # 1. 인기 캠페인 조회
-    popular_items = _fetch_api("/trial/popular")
+    popular_items = extra_items["/trial/popular"]
     logger.info("스타일씨 인기 캠페인: %d개", len(popular_items))
-
-    for item in popular_items:
-        campaign = _parse_campaign(item)
-        if campaign and campaign.url not in seen_urls:
-            campaigns.append(campaign)
+    merged = _parse_new(popular_items, seen_urls)
+    for campaign in campaigns:
+        if campaign.url not in seen_urls:
             seen_urls.add(campaign.url)
+            merged.append(campaign)
 
-    # 2. 일반 캠페인 페이지별 조회 (마감되지 않은 것만)
-    total_general = 0
-    for page in range(1, max_pages + 1):
-        general_items = _fetch_api("/trial", {"include_finish": "false", "page": page})
-
-        if not general_items:
-            logger.info("스타일씨 페이지 %d: 결과 없음, 중단", page)
-            break
+    if include_closing:
+        closing_items = extra_items["/trial/closing-trials"]
+        logger.info("스타일씨 마감임박 캠페인: %d개", len(closing_items))
+        merged.extend(_parse_new(closing_items, seen_urls))
 
-        new_count = 0
-        for item in general_items:
-            campaign = _parse_campaign(item)
-            if campaign and campaign.url not in seen_urls:
-                campaigns.append(campaign)
-                seen_urls.add(campaign.url)
-                new_count += 1
+    return merged
 
-        total_general += len(general_items)
 
-        # 새로운 캠페인이 없으면 중단 (중복 페이지)
-        if new_count == 0:
-            logger.info("스타일씨 페이지 %d: 새 캠페인 없음, 중단", page)
-            break
+def crawl(max_pages: int = 50, include_closing: bool = False) -> List[Campaign]:
+    """스타일씨 크롤링 - API 직접 호출 방식.
 
-        logger.info("스타일씨 페이지 %d: %d개 중 %d개 신규", page, len(general_items), new_count)
+    여러 API 엔드포인트에서 데이터를 수집하여 통합합니다.
+    인기/마감임박 API와 일반 목록의 여러 페이지를 동시에 요청하고,
+    일반 목록은 새 캠페인이 없는 페이지가 나오면 중단합니다.
 
-    logger.info("스타일씨 일반 캠페인 총: %d개 조회", total_general)
+    Args:
+        max_pages: 최대 페이지 수 (기본 50페이지)
+        include_closing: 마감임박 캠페인 포함 여부 (기본 False)
+    """
+    logger.info("스타일씨 크롤링 시작 (API 방식, max_pages=%d)", max_pages)
 
-    # 3. 마감 임박 캠페인 조회 (선택적)
-    if include_closing:
-        closing_items = _fetch_api("/trial/closing-trials")
-        logger.info("스타일씨 마감임박 캠페인: %d개", len(closing_items))
+    # 시간 초과 시에는 지금까지 받은 일반 목록이 부분 결과로 회수된다
+    campaigns: List[Campaign] = []
+    track("stylec", campaigns)
 
-        for item in closing_items:
-            campaign = _parse_campaign(item)
-            if campaign and campaign.url not in seen_urls:
-                campaigns.append(campaign)
-                seen_urls.add(campaign.url)
+    campaigns[:] = run_sync(_crawl_async(campaigns, max_pages, include_closing))
 
     logger.info("스타일씨 총 %d개 캠페인 수집 완료", len(campaigns))
 
@@ -0,0 +1,275 @@
+"""이미 저장된 캠페인 ID 인덱스.
+
+incremental 모드의 차등 필터에 쓰이는 (source, source_id) 집합을 작게, 빠짐없이 읽어 온다.
+
+- PostgREST는 응답 행 수에 상한이 있으므로 source별로 source_id keyset 페이지네이션
+  (`source_id > 마지막 값 ORDER BY source_id LIMIT n`)으로 끝까지 읽고, source끼리는 병렬로 읽는다.
+  UNIQUE(source, source_id) 인덱스를 그대로 타므로 offset 방식처럼 뒤로 갈수록 느려지지 않는다.
+- source_id는 대부분 숫자 ID이거나 URL 해시(16자리 hex)이므로 정렬된 64비트 정수 배열에 담고
+  이진 탐색으로 조회한다. 튜플 + 문자열 집합보다 항목당 메모리가 훨씬 작다.
+- 그 밖의 문자열 ID는 집합에 담거나, bloom_bits를 지정하면 블룸 필터에 담는다
+  (오탐 시 새 캠페인을 기존 것으로 보고 건너뛸 수 있으므로 기본은 정확한 집합).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from postgrest.exceptions import APIError
+
+from crawler.utils import (
+    content_hash_column_available, disable_content_hash_column, is_missing_content_hash, logger, run_supabase,
+)
+
+# campaigns.source 체크 제약(docs/supabase-add-new-sites.sql)에 있는 전체 source
+ALL_SOURCES = (
+    "reviewnote", "revu", "dinnerqueen", "gangnam", "reviewplace", "seoulouba", "modooexperience",
+    "pavlovu", "stylec", "modan", "myinfluencer", "chuble", "real_review", "dinodan",
+)
+
+# keyset 페이지 크기 (Supabase 기본 max-rows와 같게)
+PAGE_SIZE = 1000
+
+# source별 병렬 로드 수
+LOAD_WORKERS = 8
+
+_NUMERIC_MAX_DIGITS = 18  # 부호 있는 64비트 정수에 안전하게 들어가는 자릿수
+_HEX_DIGITS = set("0123456789abcdef")
+
+
+def _classify(source_id: str) -> Tuple[str, object]:
+    """source_id를 ("num", int) / ("hash", int) / ("str", str)로 분류."""
+    if source_id.isdigit() and len(source_id) <= _NUMERIC_MAX_DIGITS and not (len(source_id) > 1 and source_id[0] == "0"):
+        return "num", int(source_id)
+    if len(source_id) == 16 and set(source_id) <= _HEX_DIGITS:
+        return "hash", int(source_id, 16)
+    return "str", source_id
+
+
+class BloomFilter:
+    """고정 크기 블룸 필터 (오탐 가능, 미탐 없음)."""
+
+    def __init__(self, capacity: int, bits_per_item: int = 10) -> None:
+        self.size = max(64, capacity * bits_per_item)
+        self.hashes = max(1, round(bits_per_item * 0.693))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class _SourceIds:
+    """source 하나의 ID 모음. add()로 모은 뒤 freeze()해야 조회할 수 있다."""
+
+    def __init__(self) -> None:
+        self.nums = array("q")
+        self.hashes = array("Q")
+        self.strings: object = set()
+        self.string_count = 0
+        self._pending_strings: List[str] = []
+
+    def add(self, source_id: str) -> None:
+        kind, value = _classify(source_id)
+        if kind == "num":
+            self.nums.append(value)
+        elif kind == "hash":
+            self.hashes.append(value)
+        else:
+            self._pending_strings.append(value)
+
+    def freeze(self, bloom_bits: Optional[int]) -> None:
+        self.nums = array("q", sorted(set(self.nums)))
+        self.hashes = array("Q", sorted(set(self.hashes)))
+        self.string_count = len(set(self._pending_strings))
+        if bloom_bits and self._pending_strings:
+            bloom = BloomFilter(len(self._pending_strings), bloom_bits)
+            for s in self._pending_strings:
+                bloom.add(s)
+            self.strings = bloom
+        else:
+            self.strings = set(self._pending_strings)
+        self._pending_strings = []
+
+    @staticmethod
+    def _in_sorted(values: array, value: int) -> bool:
+        i = bisect_left(values, value)
+        return i < len(values) and values[i] == value
+
+    def __contains__(self, source_id: str) -> bool:
+        kind, value = _classify(source_id)
+        if kind == "num":
+            return self._in_sorted(self.nums, value)
+        if kind == "hash":
+            return self._in_sorted(self.hashes, value)
+        return value in self.strings
+
+    def __len__(self) -> int:
+        return len(self.nums) + len(self.hashes) + self.string_count + len(self._pending_strings)
+
+    def memory_bytes(self) -> int:
+        size = self.nums.buffer_info()[1] * self.nums.itemsize + self.hashes.buffer_info()[1] * self.hashes.itemsize
+        if isinstance(self.strings, BloomFilter):
+            size += len(self.strings.bits)
+        else:
+            size += sys.getsizeof(self.strings) + sum(sys.getsizeof(s) for s in self.strings)
+        return size
+
+
+class SourceIdIndex:
+    """(source, source_id) 멤버십 인덱스. `(source, source_id) in index` 형태로 조회한다."""
+
+    def __init__(self, bloom_bits: Optional[int] = None) -> None:
+        self.bloom_bits = bloom_bits
+        self._sources: Dict[str, _SourceIds] = {}
+
+    def add(self, source: str, source_id: str) -> None:
+        ids = self._sources.get(source)
+        if ids is None:
+            ids = self._sources[source] = _SourceIds()
+        ids.add(source_id)
+
+    def freeze(self) -> "SourceIdIndex":
+        for ids in self._sources.values():
+            ids.freeze(self.bloom_bits)
+        return self
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            source, source_id = key  # type: ignore[misc]
+        except (TypeError, ValueError):
+            return False
+        ids = self._sources.get(source)
+        return ids is not None and str(source_id) in ids
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._sources.values())
+
+    def counts(self) -> Dict[str, int]:
+        return {source: len(ids) for source, ids in sorted(self._sources.items())}
+
+    def memory_bytes(self) -> int:
+        return sum(ids.memory_bytes() for ids in self._sources.values())
+
+
+def _fetch_page(client, source: str, columns: str, last: Optional[str], page_size: int, active_only: bool = False) -> List[dict]:
+    query = client.table("campaigns").select(columns).eq("source", source)
+    if active_only:
+        query = query.eq("is_active", True)
+    if last is not None:
+        query = query.gt("source_id", last)
+    return query.order("source_id").limit(page_size).execute().data or []
+
+
+# DB 함수 campaign_content_hashes(crawler/scripts/db_migrations.py 005)가 있는지 (없으면 select로 대신)
+_hash_rpc_available = True
+
+
+def _fetch_hash_page(client, source: str, columns: str, last: Optional[str], page_size: int) -> List[dict]:
+    """활성 캠페인의 source_id, content_hash 한 페이지 (부분 인덱스만 읽는 DB 함수 사용)."""
+    global _hash_rpc_available
+    if _hash_rpc_available:
+        try:
+            return client.rpc("campaign_content_hashes", {
+                "p_source": source, "p_after": last, "p_limit": page_size,
+            }).execute().data or []
+        except APIError as e:
+            if e.code != "PGRST202":  # 함수 없음 이외의 오류
+                raise
+            _hash_rpc_available = False
+            logger.info("campaign_content_hashes 함수가 없어 select로 읽습니다 (crawler/scripts/db_migrations.py)")
+    try:
+        return _fetch_page(client, source, columns, last, page_size, active_only=True)
+    except APIError as e:
+        if not is_missing_content_hash(e):
+            raise
+        disable_content_hash_column()
+        return []
+
+
+def _load_source(source: str, columns: str, page_size: int, fetch: Callable = _fetch_page) -> List[dict]:
+    """source 하나의 행(columns, source_id 포함)을 keyset 페이지네이션으로 모두 읽는다."""
+    rows: List[dict] = []
+    last: Optional[str] = None
+    while True:
+        page = run_supabase(lambda client: fetch(client, source, columns, last, page_size)) or []
+        if not page:
+            break
+        rows.extend(page)
+        last = page[-1]["source_id"]
+        # 서버 max-rows가 page_size보다 작을 수도 있으므로 빈 페이지가 나올 때까지 읽는다
+    return rows
+
+
+def _load_sources(
+    sources: Sequence[str], columns: str, page_size: int, fetch: Callable = _fetch_page,
+) -> Iterator[Tuple[str, List[dict]]]:
+    """source별로 병렬로 읽어 (source, 행 리스트)를 sources 순서대로 반환.
+
+    source 하나를 읽다 실패하면 그 source는 비어 있는 것으로 둔다
+    (기존 캠페인을 다시 upsert할 뿐 새 캠페인을 놓치지는 않는 방향).
+    """
+
+    def load(source: str) -> Tuple[str, List[dict]]:
+        try:
+            return source, _load_source(source, columns, page_size, fetch)
+        except Exception as e:
+            logger.error("기존 캠페인 로드 실패 (%s, %s): %s", source, columns, e)
+            return source, []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(LOAD_WORKERS, len(sources))), thread_name_prefix="ids") as executor:
+        yield from executor.map(load, sources)
+
+
+def load_source_id_index(
+    sources: Sequence[str] = ALL_SOURCES,
+    page_size: int = PAGE_SIZE,
+    bloom_bits: Optional[int] = None,
+) -> SourceIdIndex:
+    """campaigns 테이블의 (source, source_id)를 source별로 병렬 로드해 인덱스로 만든다."""
+    start = time.monotonic()
+    index = SourceIdIndex(bloom_bits=bloom_bits)
+    for source, rows in _load_sources(sources, "source_id", page_size):
+        for row in rows:
+            index.add(source, row["source_id"])
+    index.freeze()
+
+    counts = {source: n for source, n in index.counts().items() if n}
+    logger.info(
+        "기존 캠페인 ID 로드: %d개, %.2f초, 약 %.1fKB %s",
+        len(index), time.monotonic() - start, index.memory_bytes() / 1024, counts,
+    )
+    return index
+
+
+def load_content_hashes(sources: Sequence[str] = ALL_SOURCES, page_size: int = PAGE_SIZE) -> Dict[Tuple[str, str], str]:
+    """활성 캠페인의 (source, source_id) → content_hash.
+
+    비활성(마감 처리된) 캠페인은 다시 수집되면 is_active를 되돌려야 하므로 포함하지 않는다.
+    content_hash 컬럼이 없으면 (마이그레이션 전) 빈 dict (모든 행을 저장한다).
+    """
+    if not content_hash_column_available():
+        return {}
+    start = time.monotonic()
+    hashes: Dict[Tuple[str, str], str] = {}
+    for source, rows in _load_sources(sources, "source_id,content_hash", page_size, _fetch_hash_page):
+        for row in rows:
+            if row.get("content_hash"):
+                hashes[(source, row["source_id"])] = row["content_hash"]
+    logger.info("기존 캠페인 content_hash 로드: %d개, %.2f초", len(hashes), time.monotonic() - start)
+    return hashes
@@ -0,0 +1,205 @@
+"""저장 실패 대비 로컬 write-ahead spool (JSONL).
+
+저장소가 잠깐 끊기면 그 실행에서 수집·보강한 캠페인이 저장되지 못하고 사라진다.
+BatchWriter는 chunk를 보내기 전에 이 spool에 먼저 기록하고, chunk가 끝까지 처리되면 ack를 남긴다.
+
+- 파일은 추가 전용이다: `{"op": "batch", "id", "ts", "rows"}` / `{"op": "ack", "id"}` 한 줄씩.
+  batch는 fsync까지 하고, ack는 하지 않는다 (ack가 사라지면 같은 행을 한 번 더 upsert할 뿐이다).
+- 다음 실행 시작 시 (또는 `python -m crawler.spool replay`) ack가 없는 batch를 모아 한꺼번에 다시 보낸다.
+  같은 (source, source_id)는 가장 나중에 기록된 행만 남기고, 그 행이 이후에 ack된 batch에 있으면
+  (더 새 데이터가 이미 저장됨) 보내지 않는다. 저장소의 content_hash와 같은 행도 보내지 않는다.
+- 다시 보낸 batch에는 ack를 남기고, 남은 batch만 새 파일로 옮겨 쓴다 (다 처리되면 파일 삭제).
+
+저장소별로 파일이 따로 있다 (`cache_dir/spool/<저장소 이름>.jsonl`).
+CRAWLER_SPOOL=0이면 사용하지 않는다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from crawler.utils import cache_dir, logger
+from crawler.writer import BatchWriter, WriteStats
+
+if TYPE_CHECKING:
+    from crawler.sinks import CampaignSink
+
+SPOOL_DIR = os.path.join(cache_dir, "spool")
+ENABLED = os.environ.get("CRAWLER_SPOOL", "1") != "0"
+
+
+def _read(path: str) -> Tuple[Dict[str, dict], set]:
+    """spool 파일을 읽어 (batch id → batch 기록, ack된 id 집합)을 반환."""
+    batches: Dict[str, dict] = {}
+    acked = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # 기록 도중 종료돼 잘린 마지막 줄
+            if record.get("op") == "batch":
+                batches[record["id"]] = record
+            elif record.get("op") == "ack":
+                acked.add(record["id"])
+    return batches, acked
+
+
+def _live_rows(batches: Dict[str, dict], acked: set) -> Dict[str, List[dict]]:
+    """ack되지 않은 batch별로 아직 다시 보내야 하는 행.
+
+    같은 (source, source_id)는 가장 나중에 기록된 행만 남고, 그 행의 batch가 ack됐으면 보낼 것이 없다.
+    """
+    latest: Dict[Tuple[str, str], Tuple[str, dict]] = {}
+    for batch_id, record in batches.items():
+        for row in record.get("rows") or []:
+            latest[(row.get("source"), row.get("source_id"))] = (batch_id, row)
+    live: Dict[str, List[dict]] = {}
+    for batch_id, row in latest.values():
+        if batch_id not in acked:
+            live.setdefault(batch_id, []).append(row)
+    return live
+
+
+class Spool:
+    """chunk 단위 write-ahead 기록 (스레드 안전)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write(self, record: dict, sync: bool) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def append(self, rows: Sequence[dict]) -> str:
+        """보내기 전의 chunk를 기록하고 batch id를 반환."""
+        batch_id = uuid.uuid4().hex
+        self._write({"op": "batch", "id": batch_id, "ts": time.time(), "rows": list(rows)}, sync=True)
+        return batch_id
+
+    def ack(self, batch_id: str) -> None:
+        """batch가 저장소에 반영됐음을 기록."""
+        self._write({"op": "ack", "id": batch_id}, sync=False)
+
+    def _scan(self) -> Tuple[Dict[str, dict], set]:
+        with self._lock:
+            self._file.flush()
+        return _read(self.path)
+
+    def pending(self) -> Tuple[List[str], List[dict]]:
+        """ack되지 않은 batch id들과, 다시 보낼 행 (같은 캠페인은 가장 나중 것, 이후에 저장된 것은 제외)."""
+        batches, acked = self._scan()
+        live = _live_rows(batches, acked)
+        pending_ids = [batch_id for batch_id in batches if batch_id not in acked]
+        return pending_ids, [row for rows in live.values() for row in rows]
+
+    def compact(self) -> int:
+        """ack되지 않은 batch만 남기고 파일을 다시 쓴다. 남은 batch 수를 반환 (0이면 파일 삭제)."""
+        with self._lock:
+            self._file.close()
+            try:
+                batches, acked = _read(self.path)
+                # 이후에 저장된 행은 빼고 옮겨 쓴다 (그 ack 기록은 새 파일에 남지 않으므로)
+                remaining = [
+                    {**batches[batch_id], "rows": rows} for batch_id, rows in _live_rows(batches, acked).items()
+                ]
+                if remaining:
+                    tmp = f"{self.path}.tmp"
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        for record in remaining:
+                            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.path)
+                else:
+                    os.remove(self.path)
+            finally:
+                self._file = open(self.path, "a", encoding="utf-8")
+        return len(remaining)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        if os.path.exists(self.path) and os.path.getsize(self.path) == 0:
+            os.remove(self.path)
+
+
+def open_spool(sink: Optional["CampaignSink"]) -> Optional[Spool]:
+    """저장소의 spool 열기. 저장소가 없거나 CRAWLER_SPOOL=0이면 None."""
+    if sink is None or not ENABLED:
+        return None
+    return Spool(os.path.join(SPOOL_DIR, f"{sink.name}.jsonl"))
+
+
+def replay_spool(sink: "CampaignSink", spool: Spool) -> Optional[WriteStats]:
+    """ack되지 않은 batch를 모아 한꺼번에 다시 저장. 다시 보낼 것이 없으면 None.
+
+    다시 보내는 행도 새 batch로 spool에 기록되므로, 이번에도 실패한 행은 다음 실행에서 다시 시도된다.
+    """
+    pending_ids, rows = spool.pending()
+    if not pending_ids:
+        spool.compact()
+        return None
+
+    sources = sorted({row["source"] for row in rows})
+    known_hashes = sink.load_content_hashes(sources) if rows else {}
+    logger.info("spool 재전송: 미완료 batch %d개, 캠페인 %d개", len(pending_ids), len(rows))
+    writer = BatchWriter(
+        upsert=sink.upsert_rows, known_hashes=known_hashes, rejected_errors=sink.rejected_errors, spool=spool,
+    )
+    writer.submit(rows)
+    stats = writer.close()
+    for batch_id in pending_ids:
+        spool.ack(batch_id)
+    remaining = spool.compact()
+    if remaining:
+        logger.warning("spool 재전송 후에도 미완료 batch %d개가 남아 다음 실행에서 다시 시도합니다.", remaining)
+    return stats
+
+
+def main() -> None:
+    from crawler.sinks import open_sink
+
+    parser = argparse.ArgumentParser(description="Inspect or replay the local write-ahead spool")
+    parser.add_argument("command", choices=["status", "replay", "clear"])
+    parser.add_argument("--sink", default=None, help="storage backend (same as crawler.main --sink)")
+    args = parser.parse_args()
+
+    sink = open_sink(args.sink)
+    if sink is None:
+        print("저장소가 없습니다 (환경 변수 또는 --sink 확인).")
+        return
+    spool = Spool(os.path.join(SPOOL_DIR, f"{sink.name}.jsonl"))
+    try:
+        if args.command == "status":
+            pending_ids, rows = spool.pending()
+            print(f"{spool.path}: 미완료 batch {len(pending_ids)}개, 다시 보낼 캠페인 {len(rows)}개")
+        elif args.command == "replay":
+            stats = replay_spool(sink, spool)
+            print(stats.summary() if stats else "다시 보낼 batch가 없습니다.")
+        else:
+            pending_ids, _ = spool.pending()
+            for batch_id in pending_ids:
+                spool.ack(batch_id)
+            spool.compact()
+            print(f"미완료 batch {len(pending_ids)}개를 버렸습니다.")
+    finally:
+        spool.close()
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
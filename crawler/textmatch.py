@@ -0,0 +1,150 @@
+"""여러 키워드 그룹을 한 번에 찾는 문자열 매처 (Aho-Corasick).
+
+카테고리 분류처럼 "제목에 이 그룹의 키워드가 하나라도 있는가"를 그룹 수십 개에 대해 묻는 경우,
+그룹마다 `any(k in text for k in keywords)`를 돌리면 키워드 수 × 제목 길이만큼 비교한다.
+KeywordMatcher는 전체 키워드를 모듈 import 시 한 번 오토마톤으로 만들어 두고,
+제목을 한 번 훑어 등장한 키워드가 속한 그룹을 비트마스크로 돌려준다.
+
+    matcher = KeywordMatcher({"beauty": ["헤어", "네일"], "life": ["네일", "요가"]})
+    hits = matcher.scan("강남 네일샵")
+    if hits & matcher.bit("beauty"):
+        ...
+
+키워드 하나가 여러 그룹에 속해도 되고, 다른 키워드에 포함되거나 겹쳐 등장해도 모두 찾는다
+(`k in text`와 같은 부분 문자열 기준).
+
+PhraseIndex는 문자열 → 값 사전에서 텍스트에 등장한 가장 긴 등록 문자열을 찾는다 (지명 사전 등).
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+class KeywordMatcher:
+    """그룹 이름 → 키워드 목록으로 만든 Aho-Corasick 오토마톤."""
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]) -> None:
+        self._bits: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+
+        for name, keywords in groups.items():
+            bit = 1 << len(self._bits)
+            self._bits[name] = bit
+            for keyword in keywords:
+                if not keyword:
+                    raise ValueError(f"빈 키워드: {name}")
+                self._out[self._insert(keyword)] |= bit
+
+        # 실패 링크 (BFS). 각 노드의 출력에 실패 링크 쪽 출력을 미리 합쳐 두면 탐색 중 따라갈 필요가 없다
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                state = self._fail[node]
+                while state and ch not in self._goto[state]:
+                    state = self._fail[state]
+                target = self._goto[state].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] |= self._out[self._fail[child]]
+
+    def _insert(self, keyword: str) -> int:
+        node = 0
+        for ch in keyword:
+            child = self._goto[node].get(ch)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][ch] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+            node = child
+        return node
+
+    def bit(self, name: str) -> int:
+        """그룹의 비트 (scan 결과와 & 해서 확인)."""
+        return self._bits[name]
+
+    def scan(self, text: str) -> int:
+        """text에 키워드가 하나라도 등장한 그룹들의 비트를 OR한 값."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        hits = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hits |= out[node]
+        return hits
+
+    def groups(self, text: str) -> Set[str]:
+        """text에 등장한 그룹 이름 (디버깅용)."""
+        hits = self.scan(text)
+        return {name for name, bit in self._bits.items() if hits & bit}
+
+
+class PhraseIndex:
+    """문자열 → 값 사전을 트라이 모양 정규식으로 만들어 두고, 텍스트에서 가장 긴 등록 문자열을 찾는다.
+
+    지명처럼 "수원"과 "수원시", "강남"과 "강남역"이 함께 등록된 경우 긴 쪽을 고른다.
+    트라이를 중첩 그룹 정규식("강(?:남(?:역)?|서구)" 꼴)으로 바꿔 두면 탐색이 re의 C 구현 안에서 끝난다.
+
+        index = PhraseIndex({"강남": "서울 강남구", "강남역": "서울 강남구"})
+        index.get("강남역")                 # 정확히 일치할 때만
+        index.find_all("강남역 근처 맛집")  # [(0, 3, "서울 강남구")]
+    """
+
+    def __init__(self, phrases: Mapping[str, Any]) -> None:
+        self._exact: Dict[str, Any] = dict(phrases)
+        trie: Dict[str, Any] = {}
+        for phrase in self._exact:
+            if not phrase:
+                raise ValueError("빈 문자열은 등록할 수 없습니다")
+            node = trie
+            for ch in phrase:
+                node = node.setdefault(ch, {})
+            node[""] = True  # 여기서 끝나는 등록 문자열이 있음
+        # 등록 문자열이 없으면 아무것도 맞지 않는 패턴
+        self._pattern = re.compile(self._trie_pattern(trie) if trie else r"(?!)")
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + cls._trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 여기서 끝날 수도 있으면 더 긴 쪽을 먼저 시도 (greedy ?)
+        return f"(?:{body})?" if "" in node else body
+
+    def __contains__(self, phrase: object) -> bool:
+        return phrase in self._exact
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def get(self, phrase: str, default: Any = None) -> Any:
+        """정확히 일치하는 문자열의 값."""
+        return self._exact.get(phrase, default)
+
+    def items(self) -> Iterable[Tuple[str, Any]]:
+        return self._exact.items()
+
+    def longest_at(self, text: str, start: int) -> Optional[Tuple[int, Any]]:
+        """text[start:]로 시작하는 가장 긴 등록 문자열의 (끝 위치, 값). 없으면 None."""
+        m = self._pattern.match(text, start)
+        return (m.end(), self._exact[m.group()]) if m else None
+
+    def search(self, text: str) -> Optional[Tuple[int, int, Any]]:
+        """가장 왼쪽에 등장한 등록 문자열 (그 위치에서 가장 긴 것). 없으면 None."""
+        m = self._pattern.search(text)
+        return (m.start(), m.end(), self._exact[m.group()]) if m else None
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Any]]:
+        """왼쪽부터 가장 긴 등록 문자열을 겹치지 않게 찾는다. [(시작, 끝, 값), ...]"""
+        exact = self._exact
+        return [(m.start(), m.end(), exact[m.group()]) for m in self._pattern.finditer(text)]
@@ -0,0 +1,175 @@
+"""캠페인 제목의 대괄호 태그 처리 (사이트 공통).
+
+"[서울 강남] [인스타 릴스] 맛집 체험 [OO 강남점]"처럼 제목에 붙은 대괄호를 한 번만 잘라 각각을
+다음 중 하나로 분류하고, 지정한 종류의 대괄호를 뺀 제목과 지역, 채널을 함께 돌려준다.
+
+- channel:  채널 키워드가 있는 대괄호 ("인스타 릴스", "블로그", "클립", "인스타 릴스 강남점")
+- platform: 플랫폼/이벤트 태그 ("쿠팡 구매평", "스마트스토어", "현금페이백")
+- store:    점포명 ("OO 강남점", "2호점", "OO매장") — 지명이 있어도 상호로 보고 남긴다.
+            채널/플랫폼/유형(방문, 배송, 기자단 ...) 키워드가 있으면 점포명으로 보지 않는다
+- location: 지명이 있는 대괄호 ("서울 강남", "전국")
+- other:    그 외 (브랜드명 등)
+
+채널 키워드는 사이트마다 다를 수 있다 (channels=REWARD_CHANNELS: "[리워드]"도 채널로 보는 사이트).
+
+지명은 crawler.location 규칙(대괄호 안 > 구체적 > 긴 것)으로 제목 본문까지 함께 찾는다.
+
+    parts = parse_title("[서울 강남] [릴스] 파스타 맛집", drop=(LOCATION, CHANNEL))
+    parts.title                  # "파스타 맛집"
+    parts.location.keyword       # "강남"
+    parts.location_text()        # "서울 강남" (대괄호 안 전체)
+    parts.channel                # "릴스"
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Collection, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from crawler.location import LocationMatch, best_location, bracket_spans, scan_locations
+
+STORE = "store"
+LOCATION = "location"
+CHANNEL = "channel"
+PLATFORM = "platform"
+OTHER = "other"
+ALL_KINDS = (STORE, LOCATION, CHANNEL, PLATFORM, OTHER)
+
+# 대괄호 안 채널 키워드 → 표준 채널 이름 (한 대괄호 안에서는 이 순서)
+CHANNEL_KEYWORDS: Dict[str, str] = {
+    "블로그": "블로그", "blog": "블로그",
+    "인스타": "인스타",
+    "릴스": "릴스",
+    "유튜브": "유튜브",
+    "쇼츠": "쇼츠",
+    "틱톡": "틱톡",
+    "클립": "클립", "clip": "클립",
+}
+
+
+class ChannelVocabulary(NamedTuple):
+    keywords: Dict[str, str]  # 키워드(소문자) → 표준 채널 이름
+    pattern: Pattern[str]
+    order: Dict[str, int]  # 표준 채널 이름 → 대괄호 안 순서
+
+
+def channel_vocabulary(keywords: Dict[str, str]) -> ChannelVocabulary:
+    """채널 키워드 사전으로 parse_title용 어휘를 만든다 (모듈 로드 시 한 번)."""
+    return ChannelVocabulary(
+        keywords,
+        re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE),
+        {name: i for i, name in enumerate(dict.fromkeys(keywords.values()))},
+    )
+
+
+DEFAULT_CHANNELS = channel_vocabulary(CHANNEL_KEYWORDS)
+# dinnerqueen, modan, real_review는 "[리워드]"도 채널 대괄호로 쓴다 (다른 사이트에서는 상품/이벤트 이름이라 남긴다)
+REWARD_CHANNELS = channel_vocabulary({**CHANNEL_KEYWORDS, "리워드": "리워드"})
+
+# 대괄호 안 내용이 이것으로 시작하면 플랫폼/이벤트 태그
+PLATFORM_TAGS = (
+    r"쿠팡", r"스마트스토어", r"스스", r"미션형\s*체험단", r"현금캐시백", r"현금페이백", r"푸드앳홈",
+    r"방문\s*포장", r"1만캐시\s*지급",
+)
+_PLATFORM_RE = re.compile("|".join(PLATFORM_TAGS), re.IGNORECASE)
+
+# 점포명 ("OO강남점", "2호점", "OO지점", "본점", "OO매장")
+_STORE_NAME_RE = re.compile(r"(?:점|매장)$")
+# 캠페인 유형 키워드: 이것이 있는 대괄호는 "점"으로 끝나도 점포명이 아니다 ("[방문 강남점]" 등 태그)
+_TYPE_RE = re.compile(r"방문|배송|기자단|구매평|재택|체험단")
+
+
+class Segment(NamedTuple):
+    text: str  # 대괄호 안 내용
+    start: int  # "[" 위치
+    end: int  # "]" 다음 위치
+    kind: str  # STORE / LOCATION / CHANNEL / PLATFORM / OTHER
+    location: Optional[LocationMatch]  # 이 대괄호 안의 가장 우선하는 지명
+    channels: Tuple[str, ...]  # 이 대괄호 안의 표준 채널 이름
+
+
+class TitleParts(NamedTuple):
+    raw: str
+    title: str  # drop한 종류의 대괄호를 뺀 제목 (비면 원래 제목)
+    location: Optional[LocationMatch]  # 제목 전체에서 가장 우선하는 지명 (대괄호 안이면 .segment가 있음)
+    channels: Tuple[str, ...]  # 모든 대괄호에서 찾은 표준 채널 이름 (중복 없이, 대괄호 순)
+    segments: Tuple[Segment, ...]
+
+    @property
+    def channel(self) -> Optional[str]:
+        """채널 이름들을 "/"로 이은 값 ("인스타/릴스"). 없으면 None."""
+        return "/".join(self.channels) or None
+
+    def location_text(self, fallback: bool = False) -> Optional[str]:
+        """지명이 있는 대괄호의 내용 전체 ("서울 강남"). 점포명 대괄호("OO 강남역점")면 지명만 ("강남역").
+
+        fallback=True면 지역을 채널과 다른 대괄호에 쓰는 사이트용: 채널/플랫폼 대괄호 안의 지명은 지역으로 보지 않고,
+        지명 사전에 없어도 첫 번째 대괄호가 채널/플랫폼 태그가 아닐 때 그 내용을 지역으로 본다.
+        """
+        if self.location is not None and self.location.segment is not None:
+            for segment in self.segments:
+                if segment.start < self.location.start < segment.end:
+                    if segment.kind == STORE:
+                        return self.location.keyword
+                    if not (fallback and segment.kind in (CHANNEL, PLATFORM)):
+                        return segment.text
+        if fallback and self.segments and self.segments[0].kind not in (CHANNEL, PLATFORM):
+            return self.segments[0].text
+        return None
+
+    def last(self, kind: str) -> Optional[Segment]:
+        """해당 종류의 마지막 대괄호."""
+        for segment in reversed(self.segments):
+            if segment.kind == kind:
+                return segment
+        return None
+
+
+def _classify(text: str, location: Optional[LocationMatch], channels: List[str]) -> str:
+    if channels:
+        return CHANNEL
+    if _PLATFORM_RE.match(text.lstrip()):
+        return PLATFORM
+    if _STORE_NAME_RE.search(text) and not _TYPE_RE.search(text):
+        return STORE
+    if location is not None:
+        return LOCATION
+    return OTHER
+
+
+def parse_title(
+    raw_title: Optional[str],
+    drop: Collection[str] = ALL_KINDS,
+    channels: ChannelVocabulary = DEFAULT_CHANNELS,
+) -> TitleParts:
+    """제목의 대괄호를 한 번 잘라 분류하고, drop에 든 종류의 대괄호를 뺀 제목과 지역, 채널을 함께 돌려준다."""
+    raw = raw_title or ""
+    brackets = bracket_spans(raw)
+    matches = scan_locations(raw, brackets)
+    if not brackets:
+        return TitleParts(raw, raw.strip(), best_location(matches), (), ())
+
+    segments = []
+    found_channels: Dict[str, None] = {}
+    pieces = []
+    pos = 0
+    i = 0
+    for start, end, text in brackets:
+        inside = []
+        while i < len(matches) and matches[i].start < end:
+            if matches[i].start >= start:
+                inside.append(matches[i])
+            i += 1
+        seg_location = best_location(inside)
+        hits = channels.pattern.findall(text)
+        seg_channels = tuple(sorted({channels.keywords[k.lower()] for k in hits}, key=channels.order.__getitem__))
+        found_channels.update(dict.fromkeys(seg_channels))
+        segment = Segment(text, start - 1, end + 1, _classify(text, seg_location, hits), seg_location, seg_channels)
+        segments.append(segment)
+        if segment.kind in drop:
+            pieces.append(raw[pos:segment.start])
+            pos = segment.end
+    pieces.append(raw[pos:])
+
+    title = " ".join("".join(pieces).split()) if pos else raw.strip()
+    return TitleParts(raw, title or raw.strip(), best_location(matches), tuple(found_channels), tuple(segments))
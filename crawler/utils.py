@@ -1,9 +1,14 @@
+import hashlib
+import json
 import os
 import logging
-from datetime import datetime
-from typing import Optional, Sequence
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional, Sequence, TypeVar
 
+import httpx
 from dotenv import load_dotenv
+from postgrest.exceptions import APIError
 from supabase import Client, create_client
 
 from crawler.models import Campaign
@@ -33,6 +38,9 @@ log_dir = os.path.join(os.path.dirname(__file__), "..", "crawler", "logs")
 os.makedirs(log_dir, exist_ok=True)
 log_file = os.path.join(log_dir, f"crawler_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
 
+# 실행 간에 유지되는 로컬 캐시 디렉토리 (학습된 페이지 수 등)
+cache_dir = os.environ.get("CRAWLER_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".cache"))
+
 # 기존 핸들러가 있으면 제거 (중복 방지)
 root_logger = logging.getLogger()
 if root_logger.handlers:
@@ -50,11 +58,12 @@ logging.basicConfig(
 logger = logging.getLogger("Crawler")
 logger.info("크롤러 로그 파일: %s", log_file)
 
+T = TypeVar("T")
 
-def get_supabase_client() -> Optional[Client]:
-    """Supabase 클라이언트 생성.
 
-    Phase 2에서는 필수는 아니지만, 나중을 위해 헬퍼를 유지한다.
+def _create_supabase_client() -> Optional[Client]:
+    """환경 변수로 Supabase 클라이언트 생성 (연결 확인은 하지 않음).
+
     환경 변수가 없으면 None을 반환하고 호출 측에서 처리하도록 한다.
     """
 
@@ -92,21 +101,75 @@ def get_supabase_client() -> Optional[Client]:
         return None
         
     try:
-        client = create_client(url, key)
-        # 연결 테스트 (간단한 쿼리)
-        try:
-            client.table("campaigns").select("id").limit(1).execute()
-            logger.debug("Supabase 연결 성공")
-        except Exception as test_e:
-            logger.warning("Supabase 연결 테스트 실패: %s", test_e)
-            logger.warning("API 키가 올바른지 확인하세요.")
-        return client
+        return create_client(url, key)
     except Exception as e:  # pragma: no cover - 외부 의존성 예외
         logger.error(f"Supabase 연결 실패: {e}")
         logger.error("URL과 API 키를 확인하세요.")
         return None
 
 
+# 프로세스 전역 Supabase 클라이언트 (크롤러 파이프라인과 crawler/scripts 도구가 공유)
+_client_lock = threading.Lock()
+_client: Optional[Client] = None
+_client_created = False
+_client_verified = False
+
+
+def get_supabase_client() -> Optional[Client]:
+    """프로세스 전역 Supabase 클라이언트 반환 (처음 호출할 때 한 번만 생성).
+
+    별도의 연결 테스트 쿼리는 보내지 않는다. 연결은 첫 실제 요청에서 확인되며
+    (`run_supabase` 참고), 연결 오류가 나면 `reset_supabase_client()`로 다시 만든다.
+    환경 변수가 없으면 None을 반환하고 호출 측에서 처리하도록 한다.
+    """
+    global _client, _client_created
+    with _client_lock:
+        if not _client_created:
+            _client = _create_supabase_client()
+            _client_created = True
+        return _client
+
+
+def reset_supabase_client() -> None:
+    """공유 클라이언트를 버린다. 다음 get_supabase_client() 호출 때 새로 만든다."""
+    global _client, _client_created, _client_verified
+    with _client_lock:
+        _client = None
+        _client_created = False
+        _client_verified = False
+
+
+def run_supabase(operation: Callable[[Client], T], retries: int = 1) -> Optional[T]:
+    """공유 클라이언트로 operation(client)를 실행.
+
+    연결 오류(httpx.TransportError)가 나면 클라이언트를 새로 만들어 retries번까지 다시 시도한다.
+    첫 요청이 성공하면 연결이 확인된 것으로 기록하고, 인증 오류면 API 키 확인 안내를 남긴다.
+    클라이언트가 없으면 (환경 변수 미설정) None을 반환한다.
+    """
+    global _client_verified
+    for attempt in range(retries + 1):
+        client = get_supabase_client()
+        if client is None:
+            return None
+        try:
+            result = operation(client)
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            logger.warning("Supabase 연결 오류, 클라이언트를 다시 만들어 재시도: %s", e)
+            reset_supabase_client()
+            continue
+        except Exception as e:
+            if not _client_verified and getattr(e, "code", None) in ("401", "403", 401, 403):
+                logger.warning("Supabase 인증 실패: API 키가 올바른지 확인하세요.")
+            raise
+        if not _client_verified:
+            _client_verified = True
+            logger.debug("Supabase 연결 성공")
+        return result
+    return None
+
+
 def clean_text(text: Optional[str]) -> str:
     """텍스트 공백 제거 및 정리."""
     if not text:
@@ -135,64 +198,129 @@ def iso_date(date: datetime) -> str:
     return date.strftime("%Y-%m-%d")
 
 
-def _campaign_to_supabase_dict(campaign: Campaign) -> dict:
-    """Campaign 모델을 Supabase campaigns 테이블 스키마에 맞게 변환."""
-    # source_id는 URL에서 ID 추출 시도, 없으면 해시 사용
+def extract_source_id(site_name: str, url: str) -> str:
+    """캠페인 URL에서 사이트 내 고유 ID 추출 (없으면 URL 해시)."""
     import hashlib
     import re
-    
+
     source_id = None
     # 사이트별 URL 패턴으로 ID 추출
-    if campaign.site_name == "reviewnote":
+    if site_name == "reviewnote":
         # https://www.reviewnote.co.kr/campaigns/985180
-        match = re.search(r'/campaigns?/(\d+)', campaign.url)
+        match = re.search(r'/campaigns?/(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "dinnerqueen":
+    elif site_name == "dinnerqueen":
         # https://dinnerqueen.net/taste/1108661
-        match = re.search(r'/taste/(\d+)', campaign.url)
+        match = re.search(r'/taste/(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "gangnam":
+    elif site_name == "gangnam":
         # https://xn--939au0g4vj8sq.net/cp/?id=1985492
-        match = re.search(r'[?&]id=(\d+)', campaign.url)
+        match = re.search(r'[?&]id=(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "reviewplace":
+    elif site_name == "reviewplace":
         # https://www.reviewplace.co.kr/pr/?id=256150
-        match = re.search(r'[?&]id=(\d+)', campaign.url)
+        match = re.search(r'[?&]id=(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "chuble":
+    elif site_name == "chuble":
         # https://chuble.net/detail.php?number=4839
-        match = re.search(r'[?&]number=(\d+)', campaign.url)
+        match = re.search(r'[?&]number=(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "dinodan":
+    elif site_name == "dinodan":
         # https://dinodan.co.kr/detail.php?number=xxx&category=xxx
-        match = re.search(r'[?&]number=(\d+)', campaign.url)
+        match = re.search(r'[?&]number=(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "stylec":
+    elif site_name == "stylec":
         # https://www.stylec.co.kr/campaign/12345 또는 ?seq=12345
-        match = re.search(r'/campaign/(\d+)', campaign.url) or re.search(r'[?&]seq=(\d+)', campaign.url)
+        match = re.search(r'/campaign/(\d+)', url) or re.search(r'[?&]seq=(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "modan":
+    elif site_name == "modan":
         # https://www.modan.kr/lodging/?idx=2167
-        match = re.search(r'[?&]idx=(\d+)', campaign.url)
+        match = re.search(r'[?&]idx=(\d+)', url)
         if match:
             source_id = match.group(1)
-    elif campaign.site_name == "real_review":
+    elif site_name == "real_review":
         # https://www.real-review.kr/campaign/12345
-        match = re.search(r'/campaign/(\d+)', campaign.url) or re.search(r'[?&]id=(\d+)', campaign.url)
+        match = re.search(r'/campaign/(\d+)', url) or re.search(r'[?&]id=(\d+)', url)
         if match:
             source_id = match.group(1)
 
     # ID를 찾을 수 없으면 URL 해시 사용
     if not source_id:
-        source_id = hashlib.md5(campaign.url.encode()).hexdigest()[:16]
-    
+        source_id = hashlib.md5(url.encode()).hexdigest()[:16]
+    return source_id
+
+
+# content_hash에서 제외하는 컬럼 (항상 같은 값이거나 해시 자체)
+_HASH_EXCLUDED_FIELDS = {"description", "is_active", "content_hash"}
+
+# 사이트가 마감일을 주지 않아 수집일 기준으로 추정하는 source (modan: +30일, real_review: 모집 상태별 +7/+2/0일).
+# 추정 마감일은 날마다 하루씩 밀리므로 해시에는 7일 단위로만 반영한다
+# (마감 정리 유예 7일(main.DEADLINE_GRACE_DAYS) 안에 저장된 마감일이 한 번은 갱신되도록).
+ESTIMATED_DEADLINE_SOURCES = frozenset({"modan", "real_review"})
+_ESTIMATED_DEADLINE_BUCKET_DAYS = 7
+
+# campaigns.content_hash 컬럼이 있는지 (crawler/scripts/db_migrations.py 001 적용 전이면 없음).
+# 없으면 해시 없이 저장하고 변경 없는 캠페인 생략도 하지 않는다.
+_content_hash_column = True
+
+
+def content_hash(row: dict) -> str:
+    """campaigns 행의 내용 해시 (바뀐 캠페인만 저장하기 위함).
+
+    application_deadline은 "D-5"처럼 실행 시각 기준으로 계산되는 경우가 있어 날짜 부분만 사용하고,
+    추정 마감일(ESTIMATED_DEADLINE_SOURCES)은 7일 단위로 묶는다.
+    """
+    fields = {k: v for k, v in row.items() if k not in _HASH_EXCLUDED_FIELDS}
+    if fields.get("application_deadline"):
+        deadline = str(fields["application_deadline"])[:10]
+        if row.get("source") in ESTIMATED_DEADLINE_SOURCES:
+            try:
+                day = date.fromisoformat(deadline)
+                deadline = (day - timedelta(days=day.toordinal() % _ESTIMATED_DEADLINE_BUCKET_DAYS)).isoformat()
+            except ValueError:
+                pass
+        fields["application_deadline"] = deadline
+    payload = json.dumps(fields, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def is_missing_content_hash(error: BaseException) -> bool:
+    """campaigns.content_hash 컬럼이 없어서 난 오류인가 (PGRST204: upsert, 42703: select)."""
+    return (
+        isinstance(error, APIError)
+        and error.code in ("PGRST204", "42703")
+        and "content_hash" in (error.message or "")
+    )
+
+
+def content_hash_column_available() -> bool:
+    """campaigns.content_hash 컬럼을 쓸 수 있는가 (없다고 확인되면 False)."""
+    return _content_hash_column
+
+
+def disable_content_hash_column() -> None:
+    """content_hash 컬럼이 없다고 기록 (이후 저장에서 컬럼을 빼고, 해시 비교를 하지 않는다)."""
+    global _content_hash_column
+    if _content_hash_column:
+        _content_hash_column = False
+        logger.warning(
+            "campaigns.content_hash 컬럼이 없어 해시 없이 저장합니다 - 변경 없는 캠페인 생략 꺼짐 "
+            "(crawler/scripts/db_migrations.py 001 적용 필요)"
+        )
+
+
+def _campaign_to_supabase_dict(campaign: Campaign) -> dict:
+    """Campaign 모델을 Supabase campaigns 테이블 스키마에 맞게 변환."""
+    # source_id는 URL에서 ID 추출 시도, 없으면 해시 사용
+    source_id = extract_source_id(campaign.site_name, campaign.url)
+
     # deadline 문자열을 application_deadline으로 파싱 시도
     application_deadline = None
     if campaign.deadline:
@@ -252,7 +380,7 @@ def _campaign_to_supabase_dict(campaign: Campaign) -> dict:
         rate = (campaign.recruit_count / campaign.applicant_count) * 100
         selection_rate = round(min(rate, 100), 2)  # 최대 100%로 제한
 
-    return {
+    row = {
         "source": campaign.site_name,
         "source_id": source_id,
         "title": campaign.title,
@@ -273,6 +401,8 @@ def _campaign_to_supabase_dict(campaign: Campaign) -> dict:
         "selection_rate": selection_rate,  # 선택률 (%)
         "is_active": True,
     }
+    row["content_hash"] = content_hash(row)
+    return row
 
 
 def save_campaigns_to_supabase(campaigns: Sequence[Campaign]) -> None:
@@ -307,33 +437,72 @@ def save_campaigns_to_supabase(campaigns: Sequence[Campaign]) -> None:
         
         logger.info("중복 제거: %d개 -> %d개", len(supabase_campaigns), len(unique_campaigns))
         
-        # upsert 수행 (source + source_id가 unique이므로 중복 자동 처리)
-        result = client.table("campaigns").upsert(
-            unique_campaigns,
-            on_conflict="source,source_id"
-        ).execute()
-        
-        logger.info(
-            "Supabase 저장 완료: %d개 캠페인 upsert됨",
-            len(unique_campaigns)
+        # chunk 단위 병렬 upsert (chunk별 재시도, 거부된 행만 제외)
+        from crawler.sinks import SupabaseSink
+        from crawler.spool import open_spool
+        from crawler.writer import BatchWriter
+
+        # 저장된 content_hash와 같은 (변경 없는) 캠페인은 보내지 않음
+        # 실패한 chunk는 로컬 spool에 남아 다음 크롤러 실행 때 다시 보낸다
+        sink = SupabaseSink()
+        spool = open_spool(sink)
+        sources = sorted({camp["source"] for camp in unique_campaigns})
+        writer = BatchWriter(
+            upsert=sink.upsert_rows,
+            known_hashes=sink.load_content_hashes(sources),
+            rejected_errors=sink.rejected_errors,
+            spool=spool,
         )
+        writer.submit(unique_campaigns)
+        stats = writer.close()
+        if spool is not None:
+            spool.compact()
+            spool.close()
+        if stats.rows_failed:
+            logger.error("Supabase 저장 실패: %d개 캠페인", stats.rows_failed)
     except Exception as e:
         logger.error("Supabase 저장 중 오류 발생: %s", e)
         raise
 
 
+def upsert_campaign_rows(rows: Sequence[dict]) -> None:
+    """Supabase 스키마로 변환·중복 제거된 행들을 공유 클라이언트로 campaigns 테이블에 upsert."""
 
-def get_existing_source_ids() -> set:
-    """Return a set of (source, source_id) tuples already stored in Supabase.
-    Used for incremental crawling to skip duplicates.
-    """
-    client = get_supabase_client()
-    if client is None:
-        return set()
+    if not rows:
+        return
+
+    if not _content_hash_column:
+        rows = [{k: v for k, v in row.items() if k != "content_hash"} for row in rows]
+
+    # upsert 수행 (source + source_id가 unique이므로 중복 자동 처리)
     try:
-        res = client.table("campaigns").select("source,source_id").execute()
-        data = res.data or []
-        return {(item["source"], item["source_id"]) for item in data}
-    except Exception as e:
-        logger.error(f"Failed to fetch existing source IDs: {e}")
-        return set()
+        run_supabase(lambda client: client.table("campaigns").upsert(
+            list(rows),
+            on_conflict="source,source_id"
+        ).execute())
+    except APIError as e:
+        if not (_content_hash_column and is_missing_content_hash(e)):
+            raise
+        # 마이그레이션 전 DB: 컬럼을 빼고 다시 보낸다
+        disable_content_hash_column()
+        return upsert_campaign_rows(rows)
+
+    logger.info(
+        "Supabase 저장 완료: %d개 캠페인 upsert됨",
+        len(rows)
+    )
+
+
+
+def get_existing_source_ids(sources: Optional[Sequence[str]] = None):
+    """Supabase에 이미 저장된 (source, source_id) 쌍을 SourceIdIndex로 반환.
+    incremental 크롤링에서 중복을 건너뛸 때 사용 (`(source, source_id) in index`).
+
+    source별로 키셋 페이지네이션으로 읽으므로 테이블이 PostgREST 행 제한보다 커도 빠짐없이 가져온다.
+    sources를 주지 않으면 campaigns.source 체크 제약이 허용하는 모든 source.
+    """
+    from crawler.source_index import ALL_SOURCES, SourceIdIndex, load_source_id_index
+
+    if get_supabase_client() is None:
+        return SourceIdIndex().freeze()
+    return load_source_id_index(sources or ALL_SOURCES)
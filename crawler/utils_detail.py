@@ -1,12 +1,17 @@
 """상세 페이지에서 추가 정보를 추출하는 유틸리티 함수들."""
 
 import re
-from typing import Optional, Dict, Any
+from dataclasses import replace
+from typing import Optional, Dict, Any, Tuple
 
 import requests
 from bs4 import BeautifulSoup
 
-from crawler.utils import clean_text, logger
+from crawler import sessions
+from crawler.enrichment import EnrichmentStore
+from crawler.http_cache import DETAIL_TTL
+from crawler.models import Campaign
+from crawler.utils import clean_text, extract_source_id, logger
 
 
 def _validate_review_deadline_days(days: int) -> bool:
@@ -91,21 +96,23 @@ def extract_detail_info(url: str, site_name: str, max_retries: int = 2) -> Dict[
     Returns:
         Dict: {"review_deadline_days": int | None, "category": str | None}
     """
+    return fetch_detail_info(url, site_name, max_retries) or {"review_deadline_days": None, "category": None}
+
+
+def fetch_detail_info(url: str, site_name: str, max_retries: int = 2) -> Optional[Dict[str, Any]]:
+    """extract_detail_info와 같지만, 페이지를 받아오지 못하면 None을 반환.
+
+    "페이지에 정보가 없음"과 "요청 실패"를 구분해야 하는 경우(보강 캐시 저장)에 사용한다.
+    """
     result = {"review_deadline_days": None, "category": None}
     
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-    }
-    
     # 재시도 로직
     for attempt in range(max_retries + 1):
         try:
             # 타임아웃 45초로 증가 (느린 사이트 대비)
-            res = requests.get(url, headers=headers, timeout=45)
+            # 호스트별 keep-alive 세션 재사용 (TLS 핸드셰이크 절약)
+            # 게시 후 거의 바뀌지 않는 페이지이므로 디스크 캐시 재사용 (TTL 이후에는 304 재검증)
+            res = sessions.get(url, timeout=45, cache_ttl=DETAIL_TTL)
             res.raise_for_status()
             
             soup = BeautifulSoup(res.text, "html.parser")
@@ -143,9 +150,7 @@ def extract_detail_info(url: str, site_name: str, max_retries: int = 2) -> Dict[
             if attempt < max_retries:
                 logger.debug("[%s] 상세 페이지 타임아웃 (재시도 %d/%d): %s (URL: %s)", 
                            site_name, attempt + 1, max_retries, e, url)
-                # 타임아웃 시 대기 시간 추가
-                import time
-                time.sleep(2)
+                # 재시도 전 대기는 호스트별 속도 제한기(crawler.ratelimit)의 쿨다운이 담당
                 continue
             else:
                 logger.warning("[%s] 상세 페이지 타임아웃 최종 실패: %s (URL: %s)", site_name, e, url)
@@ -153,8 +158,6 @@ def extract_detail_info(url: str, site_name: str, max_retries: int = 2) -> Dict[
             if attempt < max_retries:
                 logger.debug("[%s] 상세 페이지 요청 실패 (재시도 %d/%d): %s (URL: %s)", 
                            site_name, attempt + 1, max_retries, e, url)
-                import time
-                time.sleep(1)  # 재시도 전 대기
                 continue
             else:
                 logger.warning("[%s] 상세 페이지 요청 최종 실패: %s (URL: %s)", site_name, e, url)
@@ -163,7 +166,42 @@ def extract_detail_info(url: str, site_name: str, max_retries: int = 2) -> Dict[
             # 파싱 오류는 재시도하지 않음
             break
     
-    return result
+    return None
+
+
+def enrich_campaign(
+    campaign: Campaign,
+    store: Optional[EnrichmentStore] = None,
+    use_cached: bool = True,
+) -> Tuple[Campaign, bool]:
+    """상세 페이지에서 리뷰 기간을 가져와 캠페인에 채운다.
+
+    store가 주어지면 새로 추출한 값을 store에 기록하고, use_cached=True면
+    저장된 값이 유효할 때는 상세 페이지를 요청하지 않는다.
+
+    Returns:
+        (리뷰 기간이 채워진 새 Campaign 또는 원본, 성공 여부)
+    """
+    try:
+        source_id = extract_source_id(campaign.site_name, campaign.url)
+        record = store.get(campaign.site_name, source_id) if store is not None and use_cached else None
+        if record is not None:
+            info = record.as_info()
+        else:
+            info = fetch_detail_info(campaign.url, campaign.site_name)
+            if info is None:
+                return campaign, False
+            if store is not None:
+                store.put(campaign.site_name, source_id, info)
+
+        review_deadline_days = info.get("review_deadline_days")
+        if review_deadline_days:
+            # Campaign 객체는 불변(immutable)으로 다루므로 새 객체 생성
+            return replace(campaign, review_deadline_days=review_deadline_days), True
+        return campaign, False
+    except Exception as e:
+        logger.warning("[%s] 리뷰 기간 정보 추가 실패: %s (URL: %s)", campaign.site_name, e, campaign.url)
+        return campaign, False
 
 
 def _extract_seoulouba_detail(soup: BeautifulSoup) -> Dict[str, Any]:
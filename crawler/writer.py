@@ -0,0 +1,223 @@
+"""campaigns 배치 저장기.
+
+캠페인 전체를 upsert 요청 하나로 보내면 요청 크기 제한이나 statement timeout에 걸리기 쉽고,
+잘못된 행 하나 때문에 저장 전체가 실패한다. 이 모듈은 행들을 chunk_size개씩 나눠
+
+- 최대 max_in_flight개 chunk를 동시에 upsert하고 (그 이상 쌓이면 submit이 대기),
+- 네트워크 오류 등으로 실패한 chunk는 지수 백오프로 retries번까지 다시 시도하고
+  (그래도 실패하면 나눠도 소용없으므로 chunk 전체를 실패로 기록),
+- 저장소가 거부하면 (Supabase APIError: 제약 위반, statement timeout 등) chunk를 반으로 나눠 가며
+  문제 행만 골라내고 나머지는 저장한다.
+- known_hashes(저장된 content_hash)를 넘기면 내용이 그대로인 행은 보내지 않는다.
+- spool(crawler.spool.Spool)을 넘기면 chunk를 보내기 전에 로컬 spool에 먼저 기록하고, 끝까지 처리되면
+  (저장됐거나 거부된 행만 남으면) ack를 남긴다. ack가 없는 chunk는 다음 실행 때 다시 보낸다.
+
+종료 시 초당 저장 행 수와 chunk 응답 시간(p50 / p95 / 최대)을 로그로 남긴다.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from postgrest.exceptions import APIError
+
+from crawler.utils import logger, upsert_campaign_rows
+
+if TYPE_CHECKING:
+    from crawler.spool import Spool
+
+# chunk 하나의 행 수와 동시에 보내는 chunk 수
+CHUNK_SIZE = int(os.environ.get("CRAWLER_UPSERT_CHUNK", "200"))
+MAX_IN_FLIGHT = int(os.environ.get("CRAWLER_UPSERT_WORKERS", "3"))
+
+# chunk 재시도 횟수와 백오프 (초)
+RETRIES = 3
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 10.0
+
+
+@dataclass
+class WriteStats:
+    """배치 저장 결과 요약."""
+
+    rows_written: int = 0
+    rows_failed: int = 0
+    rows_unchanged: int = 0  # content_hash가 같아 건너뛴 행
+    chunks: int = 0
+    failed_chunks: int = 0
+    retries: int = 0
+    poison_rows: List[Tuple[str, str]] = field(default_factory=list)  # 서버가 거부한 (source, source_id)
+    latencies: List[float] = field(default_factory=list)  # upsert 요청별 응답 시간
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def summary(self) -> str:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        rate = self.rows_written / elapsed if elapsed > 0 else 0.0
+        latencies = sorted(self.latencies)
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            latency = f"응답 p50 {p50:.2f}초 / p95 {p95:.2f}초 / 최대 {latencies[-1]:.2f}초"
+        else:
+            latency = "응답 -"
+        return (
+            f"{self.rows_written}개 저장, {self.rows_failed}개 실패, 변경 없음 {self.rows_unchanged}개 생략 "
+            f"(chunk {self.chunks}개, 실패 {self.failed_chunks}개, 재시도 {self.retries}회), "
+            f"{rate:.1f}행/초, {latency}"
+        )
+
+
+class BatchWriter:
+    """행들을 chunk 단위로 병렬 upsert하는 저장기.
+
+    사용 예:
+        writer = BatchWriter()
+        writer.submit(rows)  # 여러 번 호출 가능
+        stats = writer.close()
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        retries: int = RETRIES,
+        upsert: Callable[[Sequence[dict]], None] = upsert_campaign_rows,
+        on_chunk: Optional[Callable[[float, int, int], None]] = None,
+        known_hashes: Optional[Mapping[Tuple[str, str], str]] = None,
+        rejected_errors: Tuple[Type[BaseException], ...] = (APIError,),
+        spool: Optional["Spool"] = None,
+    ) -> None:
+        """
+        Args:
+            chunk_size: upsert 요청 하나의 최대 행 수
+            max_in_flight: 동시에 보내는 chunk 수
+            retries: chunk별 재시도 횟수
+            upsert: 행 리스트를 저장하는 함수 (실패 시 예외)
+            on_chunk: chunk 하나가 끝날 때마다 (소요 시간, 입력 행 수, 저장 행 수)로 호출
+            known_hashes: 저장된 (source, source_id) → content_hash. 같은 해시의 행은 건너뛴다
+            rejected_errors: 저장소가 행을 거부했다는 뜻의 예외 (이 경우 chunk를 나눠 문제 행을 골라낸다)
+            spool: chunk를 보내기 전에 기록해 둘 로컬 spool (실패한 chunk는 다음 실행 때 다시 보낸다)
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.retries = retries
+        self.stats = WriteStats()
+        self._upsert = upsert
+        self._on_chunk = on_chunk
+        self._known_hashes = known_hashes
+        self._rejected_errors = rejected_errors
+        self._spool = spool
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="upsert")
+        # 대기 중인 chunk가 너무 많이 쌓이지 않도록 (실행 중 + 대기 각각 max_in_flight개까지)
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight) * 2)
+
+    def submit(self, rows: Sequence[dict]) -> None:
+        """행들을 chunk로 나눠 저장 대기열에 넣는다. 대기열이 차 있으면 자리가 날 때까지 기다린다."""
+        if self._known_hashes:
+            changed = [
+                row for row in rows
+                if self._known_hashes.get((row["source"], row["source_id"])) != row.get("content_hash")
+            ]
+            self.stats.add(rows_unchanged=len(rows) - len(changed))
+            rows = changed
+        for i in range(0, len(rows), self.chunk_size):
+            chunk = list(rows[i:i + self.chunk_size])
+            self._slots.acquire()
+            future = self._executor.submit(self._run_chunk, chunk)
+            future.add_done_callback(lambda _: self._slots.release())
+
+    def close(self) -> WriteStats:
+        """남은 chunk를 모두 저장하고 결과를 반환."""
+        self._executor.shutdown(wait=True)
+        self.stats.finished_at = time.monotonic()
+        if self.stats.chunks or self.stats.rows_unchanged:
+            logger.info("배치 저장: %s", self.stats.summary())
+        if self.stats.poison_rows:
+            logger.error("저장이 거부된 캠페인 %d개: %s", len(self.stats.poison_rows), self.stats.poison_rows[:20])
+        return self.stats
+
+    def _run_chunk(self, rows: List[dict]) -> None:
+        start = time.monotonic()
+        batch_id = self._spool_append(rows)
+        written = rejected = 0
+        try:
+            written, rejected = self._write(rows, self.retries)
+        except Exception as e:
+            self.stats.add(failed_chunks=1, rows_failed=len(rows))
+            logger.error("chunk 저장 실패 (%d개): %s", len(rows), e)
+        if batch_id is not None and written + rejected == len(rows):
+            # 거부된 행은 다시 보내도 거부되므로 spool에서는 처리된 것으로 본다
+            self._spool.ack(batch_id)
+        self.stats.add(chunks=1)
+        if self._on_chunk is not None:
+            self._on_chunk(time.monotonic() - start, len(rows), written)
+
+    def _spool_append(self, rows: List[dict]) -> Optional[str]:
+        if self._spool is None:
+            return None
+        try:
+            return self._spool.append(rows)
+        except OSError as e:
+            logger.warning("spool 기록 실패 (저장은 계속): %s", e)
+            return None
+
+    def _attempt(self, rows: List[dict]) -> None:
+        start = time.monotonic()
+        try:
+            self._upsert(rows)
+        finally:
+            with self.stats._lock:
+                self.stats.latencies.append(time.monotonic() - start)
+
+    def _write(self, rows: List[dict], retries: int) -> Tuple[int, int]:
+        """rows를 저장하고 (저장된 행 수, 거부된 행 수)를 반환.
+
+        네트워크 오류 등은 백오프 후 재시도하고, 저장소가 거부하면 (rejected_errors) 반으로 나눠 문제 행을 골라낸다.
+        """
+        error: Optional[BaseException] = None
+        for attempt in range(retries + 1):
+            try:
+                self._attempt(rows)
+                self.stats.add(rows_written=len(rows))
+                return len(rows), 0
+            except self._rejected_errors as e:
+                error = e
+                break
+            except Exception:
+                if attempt >= retries:
+                    raise
+                self.stats.add(retries=1)
+                time.sleep(min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt) * (0.5 + random.random() / 2))
+
+        if len(rows) == 1:
+            row = rows[0]
+            key = (row.get("source"), row.get("source_id"))
+            logger.error("저장 거부된 캠페인 %s: %s (제목: %s)", key, error, row.get("title"))
+            with self.stats._lock:
+                self.stats.poison_rows.append(key)
+                self.stats.rows_failed += 1
+            return 0, 1
+        mid = len(rows) // 2
+        left, right = self._write_part(rows[:mid]), self._write_part(rows[mid:])
+        return left[0] + right[0], left[1] + right[1]
+
+    def _write_part(self, rows: List[dict]) -> Tuple[int, int]:
+        """나눈 조각 저장 (chunk 단위로 이미 재시도했으므로 조각은 재시도 1회만)."""
+        try:
+            return self._write(rows, 1)
+        except Exception as e:
+            self.stats.add(rows_failed=len(rows))
+            logger.error("chunk 조각 저장 실패 (%d개): %s", len(rows), e)
+            return 0, 0
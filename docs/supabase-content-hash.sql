@@ -0,0 +1,16 @@
+-- 변경 감지용 content_hash 컬럼 추가
+-- 실행 위치: Supabase SQL Editor
+-- (crawler/scripts/db_migrations.py의 001 마이그레이션과 같은 내용. 새 인덱스·함수는 그 모듈에 추가한다)
+-- 크롤러는 저장된 content_hash와 같은 (내용이 바뀌지 않은) 캠페인은 upsert하지 않는다.
+-- 이 마이그레이션을 실행한 뒤에 content_hash를 보내는 크롤러를 배포해야 한다.
+
+-- 1. campaigns 테이블에 컬럼 추가
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN campaigns.content_hash IS '크롤러가 계산한 캠페인 내용 해시 (변경 없는 캠페인 저장 생략용)';
+
+-- 2. 확인 쿼리
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'campaigns'
+AND column_name = 'content_hash';
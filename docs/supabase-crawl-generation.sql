@@ -0,0 +1,68 @@
+-- 목록에서 사라진 캠페인 정리 (mark-and-sweep)
+-- 실행 위치: Supabase SQL Editor
+-- (crawler/scripts/db_migrations.py의 003 마이그레이션 + 006(sweep_campaigns 재정의)과 같은 내용. 새 인덱스·함수는 그 모듈에 추가한다)
+-- 크롤러를 --sweep (또는 CRAWLER_SWEEP=1)으로 실행하면, 목록을 끝까지 정상 수집한 사이트마다
+-- sweep_campaigns를 한 번 호출해 이번 목록에 없는 활성 캠페인을 비활성화한다.
+-- 이번 목록에 있던 캠페인은 다시 활성화한다 (이전에 잘못 정리·마감된 캠페인이 목록에 돌아온 경우.
+-- incremental 모드는 이미 저장된 캠페인을 다시 저장하지 않으므로 여기서 되살리지 않으면 계속 비활성으로 남는다).
+
+-- 1. 실행 세대 컬럼 추가 (크롤러 실행 시작 시각, epoch 초)
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS crawl_generation BIGINT;
+
+COMMENT ON COLUMN campaigns.crawl_generation IS '이 캠페인을 마지막으로 목록에서 본 크롤러 실행 세대';
+
+-- 2. 정리 함수
+-- p_source: 사이트 (campaigns.source)
+-- p_generation: 이번 실행 세대
+-- p_seen_ids: 이번 실행에서 목록에 있던 source_id 전체
+-- p_max_ratio: 활성 캠페인 중 이 비율을 넘게 비활성화하게 되면 아무것도 바꾸지 않고 오류 (사이트 개편 등 대비)
+CREATE OR REPLACE FUNCTION sweep_campaigns(
+  p_source TEXT,
+  p_generation BIGINT,
+  p_seen_ids TEXT[],
+  p_max_ratio REAL DEFAULT 0.5
+)
+RETURNS INTEGER AS $$
+DECLARE
+  active_count INTEGER;
+  stale_count INTEGER;
+  affected INTEGER;
+BEGIN
+  -- mark: 이번 목록에 있던 캠페인에 세대 표시 (비활성이었으면 다시 활성화)
+  UPDATE campaigns
+  SET crawl_generation = p_generation,
+      is_active = true,
+      updated_at = CASE WHEN is_active THEN updated_at ELSE NOW() END
+  WHERE source = p_source
+    AND source_id = ANY(p_seen_ids);
+
+  SELECT COUNT(*), COUNT(*) FILTER (WHERE crawl_generation IS DISTINCT FROM p_generation)
+  INTO active_count, stale_count
+  FROM campaigns
+  WHERE source = p_source AND is_active = true;
+
+  IF active_count > 0 AND stale_count > active_count * p_max_ratio THEN
+    RAISE EXCEPTION 'sweep_campaigns(%): 활성 캠페인 %개 중 %개를 비활성화하게 되어 중단 (한도 %)',
+      p_source, active_count, stale_count, p_max_ratio;
+  END IF;
+
+  -- sweep: 이번 목록에 없던 활성 캠페인 비활성화
+  UPDATE campaigns
+  SET is_active = false,
+      updated_at = NOW()
+  WHERE source = p_source
+    AND is_active = true
+    AND crawl_generation IS DISTINCT FROM p_generation;
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- service_role(크롤러)만 호출 가능
+REVOKE EXECUTE ON FUNCTION sweep_campaigns(TEXT, BIGINT, TEXT[], REAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION sweep_campaigns(TEXT, BIGINT, TEXT[], REAL) TO service_role;
+
+-- 3. 확인 쿼리 (사이트별 마지막 세대)
+SELECT source, MAX(crawl_generation) AS last_generation, COUNT(*) FILTER (WHERE is_active) AS active
+FROM campaigns
+GROUP BY source;
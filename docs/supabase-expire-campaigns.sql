@@ -0,0 +1,40 @@
+-- 마감 캠페인 일괄 비활성화 함수
+-- 실행 위치: Supabase SQL Editor
+-- (crawler/scripts/db_migrations.py의 002 마이그레이션과 같은 내용. 새 인덱스·함수는 그 모듈에 추가한다)
+-- 크롤러는 실행 전에 이 함수를 한 번 호출해 전체 source의 마감 캠페인을 비활성화하고
+-- 비활성화된 개수를 받는다. (함수가 없으면 source 그룹별 필터 update로 대신한다)
+
+-- 1. 부분 인덱스: 활성 캠페인 중 마감일 기준 조회용
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_deadline
+ON campaigns(application_deadline)
+WHERE is_active = true;
+
+-- 2. 비활성화 함수
+-- p_today: 기준 날짜 (이 날짜 이전 마감은 만료)
+-- p_grace_days: 마감일을 추정하는 source별 유예 일수 (예: {"modan": 7, "real_review": 7})
+CREATE OR REPLACE FUNCTION expire_campaigns(p_today DATE, p_grace_days JSONB DEFAULT '{}'::jsonb)
+RETURNS INTEGER AS $$
+DECLARE
+  affected INTEGER;
+BEGIN
+  UPDATE campaigns
+  SET is_active = false,
+      updated_at = NOW()
+  WHERE is_active = true
+    AND application_deadline IS NOT NULL
+    AND application_deadline < p_today - COALESCE((p_grace_days ->> source)::INTEGER, 0);
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- service_role(크롤러)만 호출 가능
+REVOKE EXECUTE ON FUNCTION expire_campaigns(DATE, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION expire_campaigns(DATE, JSONB) TO service_role;
+
+-- 3. 확인 쿼리 (비활성화 대상 개수 미리 보기)
+SELECT source, COUNT(*)
+FROM campaigns
+WHERE is_active = true
+  AND application_deadline < CURRENT_DATE
+GROUP BY source;
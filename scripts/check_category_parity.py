@@ -0,0 +1,157 @@
+"""normalize_category 분류 결과 회귀 확인
+
+1. scripts/category_parity_cases.json의 (site, category, title) → expected를 현재 crawler/category.py로 분류해
+   모두 같은지 확인한다. 저장소 디버그 스크립트에 나온 실제 캠페인과 사이트별 제목 형식을 담은 고정 사례로,
+   expected는 분류기 재작성(Aho-Corasick) 전 규칙의 결과다.
+2. --rev를 지정하면 그 git 버전의 crawler/category.py와 작업 트리의 crawler/category.py로
+   같은 입력을 분류해 결과가 다른 경우를 보여준다 (예: 분류 규칙을 바꾸기 전 커밋).
+   기본 확인은 1번 고정 사례뿐이다 (커밋 해시는 rebase/squash 후 달라지므로 기본값으로 두지 않는다).
+   - 크롤러가 저장한 결과 JSON (crawler/output/campaigns_*.json 또는 --input으로 지정)의 (site_name, category, title)
+   - TITLE_KEYWORDS의 키워드 단독 / 그룹끼리 조합한 가짜 제목 × 대표 원본 카테고리 × (modan, 그 외 사이트)
+
+하나라도 다르면 종료 코드 1. 분류 규칙을 일부러 바꿨다면 --write-cases로 고정 사례의 expected를 현재 결과로
+갱신한다 (diff를 확인한 뒤 커밋).
+
+실행 방법:
+    python scripts/check_category_parity.py
+    python scripts/check_category_parity.py --rev main --input crawler/output/campaigns_20250113_120000.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from crawler import category
+
+# 고정 사례 (site, category, title, expected)
+CASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "category_parity_cases.json")
+
+RAW_CATEGORIES = [None, "", "기타", "방문", "제품", "배송형", "기자단", "식품", "맛집", "여가"]
+SITES = ["reviewnote", "modan"]
+
+
+def load_legacy(rev: str):
+    source = subprocess.run(
+        ["git", "show", f"{rev}:crawler/category.py"], cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    module = types.ModuleType("legacy_category")
+    exec(compile(source, f"{rev}:crawler/category.py", "exec"), module.__dict__)
+    return module
+
+
+def load_cases():
+    with open(CASES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_cases(cases):
+    for case in cases:
+        case["expected"] = category.normalize_category(case["site"], case["category"], case["title"])
+    with open(CASES_PATH, "w", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join("  " + json.dumps(case, ensure_ascii=False) for case in cases) + "\n]\n")
+
+
+def check_cases(cases) -> bool:
+    failures = [
+        (case, actual)
+        for case in cases
+        for actual in [category.normalize_category(case["site"], case["category"], case["title"])]
+        if actual != case["expected"]
+    ]
+    if not failures:
+        print(f"✅ 고정 사례 {len(cases)}개 모두 expected와 같음")
+        return True
+    print(f"❌ 고정 사례 중 expected와 다른 경우 {len(failures)}개:")
+    for case, actual in failures:
+        print(f"  [{case['site']}] {case['category']!r} {case['title']!r}: 기대 {case['expected']} -> {actual}")
+    return False
+
+
+def recorded_cases(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for item in json.load(f):
+                if item.get("title"):
+                    yield item.get("site_name") or "", item.get("category"), item["title"]
+
+
+def synthetic_cases():
+    groups = [list(keywords) for keywords in category.TITLE_KEYWORDS.values()]
+    titles = set()
+    for keywords in groups:
+        for keyword in keywords:
+            titles.add(keyword)
+            titles.add(f"[지역] {keyword.upper()} 체험")
+            for other in groups:
+                titles.add(f"{other[0]} {keyword}")
+                titles.add(f"{keyword}{other[-1]}")
+    titles.update(["정원식당", "정원 가든", "마라공방", "마라공방 전시", "뽀송하개", "댕이네", "아무 키워드 없음"])
+    for title in sorted(titles):
+        for site in SITES:
+            for raw in RAW_CATEGORIES:
+                yield site, raw, title
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare normalize_category against a previous git revision")
+    parser.add_argument("--rev", default=None, help="결과를 비교할 기준 버전 (git revision). 없으면 고정 사례만 확인")
+    parser.add_argument("--input", action="append", default=None, help="크롤러 결과 JSON (여러 번 지정 가능)")
+    parser.add_argument("--no-synthetic", action="store_true", help="키워드 조합 가짜 제목은 빼고 비교")
+    parser.add_argument("--write-cases", action="store_true", help="고정 사례의 expected를 현재 분류 결과로 갱신")
+    args = parser.parse_args()
+
+    fixed = load_cases()
+    if args.write_cases:
+        write_cases(fixed)
+        print(f"고정 사례 {len(fixed)}개 expected 갱신: {CASES_PATH}")
+        return
+    ok = check_cases(fixed)
+    if args.rev is None:
+        if not ok:
+            sys.exit(1)
+        return
+
+    legacy = load_legacy(args.rev)
+    paths = args.input or sorted(glob.glob(os.path.join(ROOT, "crawler", "output", "campaigns_*.json")))
+    cases = [(case["site"], case["category"], case["title"]) for case in fixed]
+    recorded = list(recorded_cases(paths))
+    print(f"기록된 캠페인: {len(recorded)}개 ({len(paths)}개 파일)")
+    cases += recorded
+    if not args.no_synthetic:
+        synthetic = list(synthetic_cases())
+        print(f"키워드 조합: {len(synthetic)}개")
+        cases += synthetic
+
+    timings = {}
+    results = {}
+    for name, fn in (("legacy", legacy.normalize_category), ("current", category.normalize_category)):
+        start = time.perf_counter()
+        results[name] = [fn(site, raw, title) for site, raw, title in cases]
+        timings[name] = (time.perf_counter() - start) / max(len(cases), 1) * 1e6
+
+    diffs = [
+        (case, old, new)
+        for case, old, new in zip(cases, results["legacy"], results["current"])
+        if old != new
+    ]
+    print(f"호출당 평균: {args.rev} {timings['legacy']:.1f}µs, 현재 {timings['current']:.1f}µs")
+    if not diffs:
+        print(f"✅ {len(cases)}개 모두 {args.rev}와 같은 결과")
+    else:
+        print(f"❌ {args.rev}와 결과가 다른 경우 {len(diffs)}개:")
+        for (site, raw, title), old, new in diffs[:50]:
+            print(f"  [{site}] {raw!r} {title!r}: {old} -> {new}")
+    if diffs or not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""사이트 파서의 제목 처리(제목 정리, 지역, 채널) 전후 비교 - stylec, gangnam
+
+scripts/title_parity_cases.json의 제목마다 현재 사이트 파서 결과가 expected와 같은지 확인한다.
+각 사례에는 공통 제목 엔진(crawler.title) 도입 전 파서의 결과(legacy)도 함께 적어 두었고,
+legacy와 expected가 다른 사례는 note에 일부러 바뀐 이유를 적는다. note 없이 결과가 바뀌면 실패로 본다.
+
+--rev를 지정하면 그 git 버전의 사이트 파서를 불러와 legacy 값이 실제 이전 결과와 같은지도 확인한다.
+
+실행 방법:
+    python scripts/check_title_parity.py
+    python scripts/check_title_parity.py --rev d5fd878
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from bs4 import BeautifulSoup
+
+CASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "title_parity_cases.json")
+FIELDS = ("title", "location", "channel")
+
+
+def load_site(site: str, rev=None):
+    """사이트 모듈 (rev를 주면 그 git 버전의 소스)."""
+    if rev is None:
+        return importlib.import_module(f"crawler.sites.{site}")
+    path = f"crawler/sites/{site}.py"
+    source = subprocess.run(
+        ["git", "show", f"{rev}:{path}"], cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    module = types.ModuleType(f"legacy_{site}")
+    module.__file__ = os.path.join(ROOT, path)
+    exec(compile(source, f"{rev}:{path}", "exec"), module.__dict__)
+    return module
+
+
+def parse(module, case):
+    """사례 하나를 사이트 파서로 처리해 (title, location, channel)을 dict로."""
+    if case["site"] == "stylec":
+        campaign = module._parse_campaign({"link": "/trial/1", "wr_subject": case["raw_title"], "wr_type": "방문"})
+    else:
+        html = (
+            '<li><div class="imgArea"><a href="/cp/?id=1"></a></div>'
+            f'<dl><dt class="tit"><a>{case["raw_title"]}</a></dt></dl></li>'
+        )
+        card = BeautifulSoup(html, "html.parser").li
+        campaign = module._parse_card(card, case.get("type", "visit"), "맛집")
+    if campaign is None:
+        return None
+    return {field: getattr(campaign, field) for field in FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare site title parsing against recorded cases")
+    parser.add_argument("--rev", default=None, help="legacy 값을 확인할 이전 버전 (git revision)")
+    args = parser.parse_args()
+
+    with open(CASES_PATH, encoding="utf-8") as f:
+        cases = json.load(f)
+
+    failures = []
+    changed = 0
+    legacy_modules = {}
+    for case in cases:
+        site = case["site"]
+        current = parse(load_site(site), case)
+        if current != case["expected"]:
+            failures.append(f"[{site}] {case['raw_title']!r}: 기대 {case['expected']} -> 현재 {current}")
+        if case["expected"] != case["legacy"]:
+            changed += 1
+            if not case.get("note"):
+                failures.append(f"[{site}] {case['raw_title']!r}: legacy와 다른데 note 없음")
+        if args.rev:
+            if site not in legacy_modules:
+                legacy_modules[site] = load_site(site, args.rev)
+            legacy = parse(legacy_modules[site], case)
+            if legacy != case["legacy"]:
+                failures.append(f"[{site}] {case['raw_title']!r}: {args.rev} 결과 {legacy} != 기록된 legacy {case['legacy']}")
+
+    print(f"사례 {len(cases)}개 중 이전 파서와 결과가 다른 사례 {changed}개 (note 참고)")
+    for case in cases:
+        if case["expected"] != case["legacy"]:
+            diff = {f: (case["legacy"][f], case["expected"][f]) for f in FIELDS if case["legacy"][f] != case["expected"][f]}
+            print(f"  [{case['site']}] {case['raw_title']!r}: {diff} - {case.get('note')}")
+    if failures:
+        print(f"❌ {len(failures)}개 실패:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("✅ 모두 기대값과 같음")
+
+
+if __name__ == "__main__":
+    main()
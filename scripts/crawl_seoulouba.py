@@ -5,13 +5,12 @@ import os
 # Add project root to path
 sys.path.append(os.getcwd())
 
-from crawler.main import run_crawler
+from crawler.sites.seoulouba import crawl
 from crawler.utils import save_campaigns_to_supabase
 
 def main():
     print("Crawling seoulouba...")
-    # site_name matches the module name in crawler/sites/
-    campaigns = run_crawler("seoulouba") 
+    campaigns = crawl()
     print(f"Crawled {len(campaigns)} campaigns.")
     
     if campaigns:
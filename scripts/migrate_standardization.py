@@ -1,129 +1,237 @@
+"""campaigns 테이블의 category / region / type 재정규화 마이그레이션
+
+normalize_category, normalize_region 규칙이 바뀔 때마다 전체 테이블에 다시 적용한다.
+
+- id keyset 페이지네이션(`id > 마지막 값 ORDER BY id LIMIT n`)으로 필요한 컬럼
+  (id, source, category, title, region, type)만 스트리밍해서 읽는다.
+- 페이지 단위로 프로세스 풀에서 병렬 정규화하고, 실제로 바뀐 컬럼만
+  같은 변경 내용끼리 묶어 `update(...).in_("id", ids)` 한 번으로 쓴다.
+- 바뀐 행은 같은 update에서 content_hash를 비운다 (NULL). 저장된 해시는 바뀌기 전 값으로 계산된 것이라,
+  해시를 비교하는 다음 full 크롤링이 그 행을 한 번 다시 저장해 크롤러 규칙으로 계산한 해시를 채운다.
+- 페이지를 다 쓸 때마다 체크포인트(마지막 id)를 저장하므로 중단돼도 이어서 실행할 수 있다.
+- --dry-run이면 쓰지 않고 변경 내역(컬럼별 old -> new 집계)만 보여준다.
+
+실행 방법:
+    python scripts/migrate_standardization.py --dry-run
+    python scripts/migrate_standardization.py --dry-run --report /tmp/diff.jsonl
+    python scripts/migrate_standardization.py                 # 체크포인트가 있으면 이어서
+    python scripts/migrate_standardization.py --restart       # 처음부터
+    python scripts/migrate_standardization.py --source seoulouba --source pavlovu
+"""
+
+import argparse
+import json
 import os
 import sys
-from dotenv import load_dotenv
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from supabase import create_client
 from crawler.category import normalize_category
+from crawler.memo import load_memos
 from crawler.region import normalize_region
 
+COLUMNS = "id, source, category, title, region, type"
+
+# 서울오빠, 모두의체험단, 파블로는 원본 카테고리가 없고 모두 추론된 값임.
+# 따라서 이들 사이트는 저장된 category를 무시하고(이미 오염되었을 수 있음) 다시 Title 기반으로 추론해야 함.
+INFERRED_CATEGORY_SOURCES = {"seoulouba", "modooexperience", "pavlovu"}
+
+# 카테고리가 명확한 제품군이면 무조건 delivery
+DELIVERY_CATEGORIES = {"디지털", "식품", "도서", "유아동", "패션", "반려동물", "배송", "재택"}
+VISIT_CATEGORIES = {"맛집", "뷰티", "여행", "문화"}
+
+CHECKPOINT_FILE = "migrate_standardization.json"
+
+
+def standardize(row: dict) -> dict:
+    """행 하나의 표준 category / region / type 계산."""
+    source = row.get("source")
+    title = row.get("title") or ""
+    raw_cat = None if source in INFERRED_CATEGORY_SOURCES else row.get("category")
+
+    std_cat = normalize_category(source, raw_cat, title)
+    std_region = normalize_region(row.get("region"))
+    std_type = row.get("type")
+
+    if std_cat in DELIVERY_CATEGORIES:
+        # 기존 오류 수정
+        std_type = "delivery"
+    elif not std_type:
+        if std_region == "배송":
+            std_type = "delivery"
+        elif std_cat in VISIT_CATEGORIES:
+            std_type = "visit"
+        elif std_cat == "생활":
+            # 생활 카테고리는 방문(헬스장 등)과 배송(생활용품)이 섞여있음
+            # 지역정보가 없거나 "배송"이면 배송형, 지역 정보가 있으면 방문형으로 간주
+            std_type = "delivery" if not std_region or std_region == "배송" else "visit"
+        elif "기자단" in title or "기자단" in (row.get("category") or ""):
+            std_type = "reporter"
+
+    return {"category": std_cat, "region": std_region, "type": std_type}
+
+
+def plan_rows(rows: List[dict]) -> List[Tuple[str, dict, dict]]:
+    """행 묶음의 변경 계획: (id, 바뀌는 컬럼의 새 값, 같은 컬럼의 기존 값) 리스트.
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수여야 한다.
+    """
+    plan = []
+    for row in rows:
+        std = standardize(row)
+        changes = {col: value for col, value in std.items() if value != row.get(col)}
+        if changes:
+            plan.append((row["id"], changes, {col: row.get(col) for col in changes}))
+    return plan
+
+
+def group_updates(
+    plan: List[Tuple[str, dict, dict]], clear_hash: bool = True,
+) -> Dict[Tuple[Tuple[str, object], ...], List[str]]:
+    """같은 변경 내용(컬럼과 새 값이 모두 같은)끼리 id를 묶는다. clear_hash면 content_hash = NULL도 함께 쓴다."""
+    groups: Dict[Tuple[Tuple[str, object], ...], List[str]] = defaultdict(list)
+    for row_id, changes, _ in plan:
+        values = {**changes, "content_hash": None} if clear_hash else changes
+        groups[tuple(sorted(values.items()))].append(row_id)
+    return groups
+
+
+def has_content_hash_column(client) -> bool:
+    """campaigns.content_hash 컬럼이 있는가 (crawler/scripts/db_migrations.py 001)."""
+    from postgrest.exceptions import APIError
+
+    from crawler.utils import is_missing_content_hash
+
+    try:
+        client.table("campaigns").select("content_hash").limit(1).execute()
+        return True
+    except APIError as e:
+        if is_missing_content_hash(e):
+            return False
+        raise
+
+
+def fetch_page(client, last_id: Optional[str], page_size: int, sources: Optional[List[str]]) -> List[dict]:
+    query = client.table("campaigns").select(COLUMNS)
+    if sources:
+        query = query.in_("source", sources)
+    if last_id is not None:
+        query = query.gt("id", last_id)
+    return query.order("id").limit(page_size).execute().data or []
+
+
+def load_checkpoint(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
 def main():
-    load_dotenv(".env.local")
-    
-    url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    if not url or not key:
+    parser = argparse.ArgumentParser(description="Re-normalize category/region/type of stored campaigns")
+    parser.add_argument("--dry-run", action="store_true", help="변경 내역만 집계하고 쓰지 않음")
+    parser.add_argument("--report", default=None, help="변경 내역을 행 단위 JSONL로 저장할 경로")
+    parser.add_argument("--source", action="append", default=None, help="이 source만 처리 (여러 번 지정 가능)")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--update-batch", type=int, default=200, help="update 한 번에 묶을 최대 id 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="정규화 프로세스 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    args = parser.parse_args()
+
+    from crawler.utils import cache_dir, get_supabase_client, run_supabase
+
+    if get_supabase_client() is None:
         print("Error: Supabase credentials not found")
         return
 
-    supabase = create_client(url, key)
-    
-    print("Fetching all campaigns...")
-    try:
-        # Fetch all rows (pagination might be needed for large datasets, but assuming < 10000 for now)
-        res = supabase.table("campaigns").select("*").execute()
-        campaigns = res.data
-        print(f"Total campaigns: {len(campaigns)}")
-        
-        updates = []
-        for c in campaigns:
-            source = c.get("source")
-            raw_cat = c.get("category")
-            title = c.get("title")
-            raw_region = c.get("region")
-            c_id = c.get("id")
-            
-            # Normalize
-            std_cat = normalize_category(source, raw_cat, title)
-            std_region = normalize_region(raw_region)
-            
-            # Check if update is needed
-            if std_cat != raw_cat or std_region != raw_region:
-                updates.append({
-                    "id": c_id,
-                    "category": std_cat,
-                    "region": std_region
-                })
-        
-        print(f" Campaigns to update: {len(updates)}")
-        
-        if updates:
-            # Upsert requires all non-nullable fields if we are effectively replacing the row for some DBs, 
-            # OR we can iterate and update. Given 600 rows, iteration is fine.
-            # However, to be faster, let's reuse the 'campaigns' objects we fetched, modify them, and upsert them back.
-            # This ensures all fields are present.
-            
-            modified_campaigns = []
-            for c in campaigns:
-                 c_id = c.get("id")
-                 modified = False
-                 
-                 # Logic repeated for clarity/safety inside loop
-                 source = c.get("source")
-                 raw_cat = c.get("category")
-                 title = c.get("title")
-                 raw_region = c.get("region")
-                 
-                 raw_type = c.get("type")
-
-                 # 강남맛집, 디너의여왕, 리뷰노트, 리뷰플레이스는 원본 카테고리가 있음.
-                 # 서울오빠, 모두의체험단, 파블로는 원본 카테고리가 없고 모두 추론된 값임.
-                 # 따라서 이들 사이트는 raw_cat을 무시하고(이미 오염되었을 수 있음) 다시 Title 기반으로 추론해야 함.
-                 if source in ["seoulouba", "modooexperience", "pavlovu"]:
-                     raw_cat = None
-
-                 std_cat = normalize_category(source, raw_cat, title)
-                 std_region = normalize_region(raw_region)
-                 
-                 # 1. Type Repair Logic implementation
-                 # Initialize std_type with raw_type first
-                 std_type = raw_type
-                 
-                 # 카테고리가 명확한 제품군이면 무조건 delivery로 강제 (기존 오류 수정)
-                 if std_cat in ["디지털", "식품", "도서", "유아동", "패션", "반려동물", "배송", "재택"]:
-                      std_type = "delivery"
-                 
-                 # 타입이 없거나 수정이 필요한 경우
-                 elif not std_type:
-                     if std_region == "배송":
-                         std_type = "delivery"
-                     elif std_cat in ["맛집", "뷰티", "여행", "문화"]:
-                         std_type = "visit"
-                     
-                     elif std_cat == "생활":
-                         # 생활 카테고리는 방문(헬스장 등)과 배송(생활용품)이 섞여있음
-                         # 지역정보가 없거나 "배송"이면 배송형으로 간주
-                         if not std_region or std_region == "배송":
-                             std_type = "delivery"
-                         else:
-                             # 지역 정보가 있으면 방문형으로 간주
-                             std_type = "visit"
-                     elif "기자단" in title or "기자단" in (raw_cat or ""):
-                         std_type = "reporter"
-
-                 if std_cat != raw_cat or std_region != raw_region or std_type != raw_type:
-                     c["category"] = std_cat
-                     c["region"] = std_region
-                     c["type"] = std_type
-                     modified_campaigns.append(c) # 'c' is the full object
-            
-            print(f"Total rows to upsert: {len(modified_campaigns)}")
-            
-            chunk_size = 100
-            for i in range(0, len(modified_campaigns), chunk_size):
-                chunk = modified_campaigns[i:i+chunk_size]
-                print(f"Upserting chunk {i} to {i+len(chunk)}...")
-                # Must specify on_conflict to merge. ID is PK.
-                supabase.table("campaigns").upsert(chunk, on_conflict="id").execute()
-                
-            print("Migration completed.")
-        else:
-            print("No updates needed.")
-            
-    except Exception as e:
-        print(f"Error: {e}")
+    checkpoint_path = os.path.join(cache_dir, CHECKPOINT_FILE)
+    state = {"last_id": None, "scanned": 0, "updated": 0, "sources": args.source}
+    if not args.dry_run and not args.restart:
+        saved = load_checkpoint(checkpoint_path)
+        if saved.get("last_id") and saved.get("sources") == args.source:
+            state = saved
+            print(f"체크포인트에서 이어서 실행: id > {state['last_id']} (이미 {state['scanned']}행 확인)")
+
+    clear_hash = run_supabase(has_content_hash_column)
+    if not clear_hash:
+        print("⚠️  campaigns.content_hash 컬럼이 없어 content_hash는 건드리지 않습니다 (db_migrations 001 미적용)")
+
+    report = open(args.report, "w", encoding="utf-8") if args.report else None
+    transitions: Counter = Counter()
+    requests = 0
+    start = time.monotonic()
+
+    def apply(rows: List[dict], plan: List[Tuple[str, dict, dict]]) -> None:
+        nonlocal requests
+        for row_id, changes, before in plan:
+            for col, value in changes.items():
+                transitions[(col, before[col], value)] += 1
+            if report:
+                report.write(json.dumps({"id": row_id, "before": before, "after": changes}, ensure_ascii=False) + "\n")
+
+        if not args.dry_run:
+            for key, ids in group_updates(plan, clear_hash).items():
+                changes = dict(key)
+                for i in range(0, len(ids), args.update_batch):
+                    batch = ids[i:i + args.update_batch]
+                    run_supabase(lambda client: client.table("campaigns").update(changes).in_("id", batch).execute())
+                    requests += 1
+
+        state["last_id"] = rows[-1]["id"]
+        state["scanned"] += len(rows)
+        state["updated"] += len(plan)
+        if not args.dry_run:
+            save_checkpoint(checkpoint_path, state)
+        elapsed = time.monotonic() - start
+        print(f"  {state['scanned']}행 확인, {state['updated']}행 변경 ({state['scanned'] / max(elapsed, 1e-9):.0f}행/초)")
+
+    # 다음 페이지를 읽는 동안 앞 페이지들을 정규화한다. 쓰기와 체크포인트는 페이지 순서대로.
+    pending: deque = deque()
+    last_id = state["last_id"]
+    # 정규화 워커는 지난 실행에서 저장해 둔 정규화 결과 캐시로 시작한다 (crawler.memo)
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=load_memos) as pool:
+        while True:
+            page = run_supabase(lambda client: fetch_page(client, last_id, args.page_size, args.source)) or []
+            if not page:
+                break
+            last_id = page[-1]["id"]
+            pending.append((page, pool.submit(plan_rows, page)))
+            while len(pending) > args.workers or (pending and pending[0][1].done()):
+                rows, future = pending.popleft()
+                apply(rows, future.result())
+        while pending:
+            rows, future = pending.popleft()
+            apply(rows, future.result())
+
+    if report:
+        report.close()
+
+    print("=" * 60)
+    print(f"{'[dry-run] ' if args.dry_run else ''}확인 {state['scanned']}행, 변경 {state['updated']}행"
+          f"{'' if args.dry_run else f', update 요청 {requests}회'}, {time.monotonic() - start:.1f}초")
+    for (col, before, after), count in transitions.most_common(30):
+        print(f"  {col}: {before!r} -> {after!r}  {count}")
+    if len(transitions) > 30:
+        print(f"  ... 외 {len(transitions) - 30}종")
+
+    if not args.dry_run:
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        print("Migration completed.")
+
 
 if __name__ == "__main__":
     main()